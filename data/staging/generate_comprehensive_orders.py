@@ -8,11 +8,34 @@
 3. 休眠顧客分析【顧客】画面: 90日以上購入がない顧客の発見
 """
 
-import csv
+import argparse
+import os
 import random
+import sys
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple
 
+# 出力ディレクトリ（このスクリプトと同じ data/staging）
+DEFAULT_OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+ORDERS_FILENAME = "anonymized-orders_store2_comprehensive.csv"
+SUMMARY_FILENAME = "summary_store2_comprehensive.json"
+# 分析DBでのストアID（SQLite ミラーへの投入時の既定値）
+STORE_ID = 2
+
+# 共通部品（scripts/demo_datagen）を読み込む
+sys.path.insert(0, os.path.join(DEFAULT_OUTPUT_DIR, '..', '..', 'scripts'))
+from demo_datagen import append, extsort, sharding, vectorized
+from demo_datagen.calendar_table import next_weekday
+from demo_datagen.cache import GenerationCache, cache_key, manifest_rows
+from demo_datagen.columnar import column_files, columns_dir, write_order_columns
+from demo_datagen.csvout import COMPRESSION_SUFFIXES, append_orders_csv, compressed_name, write_orders_csv
+from demo_datagen.identity import IdentityGenerator
+from demo_datagen.schema import ORDER_EXPORT_DEFAULTS, ORDER_EXPORT_SCHEMA
+from demo_datagen.sqlite_mirror import load_store_output
+from demo_datagen.sqlserver_seed import FORMATS as SQLSERVER_FORMATS, write_seed_files
+from demo_datagen.stats import StatsCollector
+from demo_datagen.timestamps import format_shifted, format_timestamp
+
 # 顧客データ（20人）
 CUSTOMERS = [
     {"id": "CUST-2001", "name": "田中太郎", "email": "loyal-customer-2001@example.com", "phone": "090-1111-0001", "prefecture": "東京都", "purchase_pattern": "loyal", "target_orders": 24},
@@ -68,301 +91,247 @@ PRODUCTS = [
     {"sku": "PRD-2011-MO", "name": "職人クラフト モダン", "price": 10000, "vendor": "職人工房", "category": "craft"},
 ]
 
-def generate_order_dates(customer: Dict, start_date: datetime, end_date: datetime) -> List[datetime]:
-    """顧客の購買パターンに応じた注文日を生成"""
+# 注文行のテンプレート（注文ごとに変わらない列）
+ORDER_TEMPLATE = ORDER_EXPORT_SCHEMA.template({
+    **ORDER_EXPORT_DEFAULTS,
+    "Payment Method": "Shopify Payments",
+})
+
+# 注文期間（2020年1月〜2025年7月）
+ORDER_START_DATE = datetime(2020, 1, 1)
+ORDER_END_DATE = datetime(2025, 7, 31)
+
+# 購買パターン定義（注文日のルール・商品の候補・購入数量）
+# dates:
+#   interval: days の範囲の間隔で target_orders 回購入（anchor 指定時はその日から、weekdays 指定時はその曜日に合わせる）
+#   burst:    days の間隔で最大 orders 回購入し、以降は休眠（until 以降は購入しない）
+#   once:     date に1回だけ購入（jitter_hours 内の時刻）
+#   yearly:   first_year 以降の毎年、days の (月, 日) に購入（日が範囲なら抽選）
+#   fixed:    決まった日付に購入
+# products: 商品の選び方（("category", ...) は候補から抽選、("sku", ...)・("name", ...) は固定）。
+#   by_month で月ごとに切り替え、該当しない月は default を使う
+# quantity: 購入数量の範囲（省略時は1個）
+PURCHASE_PATTERNS = {
+    # 月2回程度、安定的に購入。プレミアム商品を好み、複数購入
+    "loyal": {"dates": {"rule": "interval", "days": (12, 20)},
+              "products": ("category", "premium", "luxury"), "quantity": (1, 3)},
+    # 月1.5回程度、やや安定。季節商品とギフト商品
+    "regular": {"dates": {"rule": "interval", "days": (18, 25)},
+                "products": ("category", "seasonal", "holiday")},
+    # 月1回程度、定期的。その季節の季節商品
+    "frequent": {"dates": {"rule": "interval", "days": (25, 35)},
+                 "products": {"by_month": [((3, 4, 5), ("name", "春")), ((6, 7, 8), ("name", "夏")),
+                                           ((9, 10, 11), ("name", "秋"))],
+                              "default": ("name", "冬")}},
+    # 2-3ヶ月に1回。日用品中心
+    "moderate": {"dates": {"rule": "interval", "days": (60, 90)},
+                 "products": ("category", "daily")},
+    # 4-6ヶ月に1回。日用品中心
+    "occasional": {"dates": {"rule": "interval", "days": (120, 180)},
+                   "products": ("category", "daily")},
+    # 最初の3回の後、長期休眠（2023年末以降は購入なし）。ヘルス＆ウェルネス商品
+    "dormant": {"dates": {"rule": "burst", "orders": 3, "days": (30, 60), "until": datetime(2023, 12, 31)},
+                "products": ("category", "health")},
+    # 一回だけ購入。高価格ギフト商品
+    "one_time": {"dates": {"rule": "once", "date": datetime(2021, 1, 20), "jitter_hours": 23},
+                 "products": ("sku", "PRD-2001-L")},
+    # 年末年始のみ購入（12月）。クリスマス商品
+    "seasonal": {"dates": {"rule": "yearly", "first_year": 2020, "days": [(12, (1, 25))]},
+                 "products": ("name", "クリスマス")},
+    # イベント時に購入（バレンタイン、母の日、クリスマス）。イベント商品
+    "gift": {"dates": {"rule": "yearly", "first_year": 2021, "days": [(2, 14), (5, 10), (12, 20)]},
+             "products": {"by_month": [((2,), ("name", "バレンタイン")), ((5,), ("name", "母の日"))],
+                          "default": ("name", "クリスマス")}},
+    # 2024年以降の新規顧客。手頃な日用品
+    "recent": {"dates": {"rule": "interval", "days": (30, 60), "anchor": datetime(2024, 1, 15)},
+               "products": ("sku", "PRD-2003-BA")},
+    # まとめ買い（3ヶ月おき、大量購入）
+    "bulk": {"dates": {"rule": "interval", "days": (80, 100)},
+             "products": ("sku", "PRD-2003-BA"), "quantity": (3, 8)},
+    # 春に集中購入。春商品
+    "spring": {"dates": {"rule": "yearly", "first_year": 2021, "days": [(3, (1, 28)), (4, (1, 28)), (5, (1, 28))]},
+               "products": ("name", "春")},
+    # 2020年後半に数回、その後2025年初頭に復帰。季節商品
+    "comeback": {"dates": {"rule": "fixed", "dates": [
+                     datetime(2020, 8, 30), datetime(2020, 11, 15), datetime(2021, 2, 10),
+                     datetime(2025, 1, 25), datetime(2025, 4, 15), datetime(2025, 7, 10)]},
+                 "products": {"by_month": [((8, 9), ("name", "夏"))], "default": ("category", "seasonal")}},
+    # 高価格商品を定期的に購入。高級商品を複数購入
+    "premium": {"dates": {"rule": "interval", "days": (45, 65)},
+                "products": ("category", "luxury"), "quantity": (1, 3)},
+    # 2022年以降の若年層、SNS経由。キッズ・若年層向け
+    "young": {"dates": {"rule": "interval", "days": (60, 90), "anchor": datetime(2022, 6, 10)},
+              "products": ("category", "kids", "eco")},
+    # 祝日・連休に購入（勤労感謝の日付近、GW、お盆）。ホリデー商品
+    "holiday": {"dates": {"rule": "yearly", "first_year": 2020, "days": [(11, 25), (4, 29), (8, 15)]},
+                "products": ("name", "クリスマス")},
+    # 試しに少し購入。安価な商品
+    "trial": {"dates": {"rule": "fixed", "dates": [datetime(2023, 9, 15), datetime(2024, 2, 10)]},
+              "products": ("sku", "PRD-2003-BA")},
+    # 月1回、非常に安定。安定した日用品
+    "consistent": {"dates": {"rule": "interval", "days": (28, 32)},
+                   "products": ("category", "daily")},
+    # 週末（土日）に購入。エコ商品
+    "weekend": {"dates": {"rule": "interval", "days": (45, 75), "weekdays": (5, 6)},
+                "products": ("category", "eco")},
+    # イベント・記念日購入（記念日、父の日、ホワイトデー）。工芸品
+    "event": {"dates": {"rule": "yearly", "first_year": 2020, "days": [(10, 12), (6, 20), (3, 15)]},
+              "products": ("category", "craft")},
+}
+
+def _interval_dates(rule: Dict, target_orders: int, start_date: datetime, end_date: datetime, rng) -> List[datetime]:
+    dates = []
+    current_date = rule.get("anchor", start_date)
+    weekdays = rule.get("weekdays")
+    for _ in range(target_orders):
+        if current_date >= end_date:
+            break
+        if weekdays:
+            current_date = next_weekday(current_date, weekdays)
+        dates.append(current_date)
+        current_date += timedelta(days=rng.randint(*rule["days"]))
+    return dates
+
+def _burst_dates(rule: Dict, target_orders: int, start_date: datetime, end_date: datetime, rng) -> List[datetime]:
     dates = []
     current_date = start_date
-    
-    pattern = customer["purchase_pattern"]
-    target_orders = customer["target_orders"]
-    
-    if pattern == "loyal":
-        # 月2回程度、安定的に購入
-        for _ in range(target_orders):
-            if current_date >= end_date:
-                break
-            dates.append(current_date)
-            current_date += timedelta(days=random.randint(12, 20))
-            
-    elif pattern == "regular":
-        # 月1.5回程度、やや安定
-        for _ in range(target_orders):
-            if current_date >= end_date:
-                break
-            dates.append(current_date)
-            current_date += timedelta(days=random.randint(18, 25))
-            
-    elif pattern == "frequent":
-        # 月1回程度、定期的
-        for _ in range(target_orders):
-            if current_date >= end_date:
-                break
-            dates.append(current_date)
-            current_date += timedelta(days=random.randint(25, 35))
-            
-    elif pattern == "moderate":
-        # 2-3ヶ月に1回
-        for _ in range(target_orders):
-            if current_date >= end_date:
-                break
-            dates.append(current_date)
-            current_date += timedelta(days=random.randint(60, 90))
-            
-    elif pattern == "occasional":
-        # 4-6ヶ月に1回
-        for _ in range(target_orders):
-            if current_date >= end_date:
-                break
-            dates.append(current_date)
-            current_date += timedelta(days=random.randint(120, 180))
-            
-    elif pattern == "dormant":
-        # 最初の3回の後、長期休眠
-        for i in range(min(3, target_orders)):
-            if current_date >= datetime(2023, 12, 31):
-                break
-            dates.append(current_date)
-            if i < 2:
-                current_date += timedelta(days=random.randint(30, 60))
-            else:
-                # 2023年8月以降は購入なし（休眠）
-                current_date = datetime(2023, 8, 15)
-                
-    elif pattern == "one_time":
-        # 一回だけ購入
-        dates.append(datetime(2021, 1, 20) + timedelta(hours=random.randint(0, 23)))
-        
-    elif pattern == "seasonal":
-        # 年末年始のみ購入
-        for year in range(2020, 2026):
+    for i in range(min(rule["orders"], target_orders)):
+        if current_date >= rule["until"]:
+            break
+        dates.append(current_date)
+        if i < rule["orders"] - 1:
+            current_date += timedelta(days=rng.randint(*rule["days"]))
+    return dates
+
+def _once_dates(rule: Dict, target_orders: int, start_date: datetime, end_date: datetime, rng) -> List[datetime]:
+    return [rule["date"] + timedelta(hours=rng.randint(0, rule["jitter_hours"]))]
+
+def _yearly_dates(rule: Dict, target_orders: int, start_date: datetime, end_date: datetime, rng) -> List[datetime]:
+    dates = []
+    for year in range(max(rule["first_year"], start_date.year), end_date.year + 1):
+        for month, day in rule["days"]:
             if len(dates) >= target_orders:
                 break
-            # 12月購入
-            dec_date = datetime(year, 12, random.randint(1, 25))
-            if dec_date <= end_date:
-                dates.append(dec_date)
-                
-    elif pattern == "gift":
-        # イベント時に購入（母の日、バレンタイン等）
-        events = [
-            (2, 14),  # バレンタイン
-            (5, 10),  # 母の日
-            (12, 20), # クリスマス
-        ]
-        for year in range(2021, 2026):
-            for month, day in events:
-                if len(dates) >= target_orders:
-                    break
-                event_date = datetime(year, month, day)
-                if event_date <= end_date:
-                    dates.append(event_date)
-                    
-    elif pattern == "recent":
-        # 2024年以降の新規顧客
-        start_recent = datetime(2024, 1, 15)
-        for _ in range(target_orders):
-            if start_recent >= end_date:
-                break
-            dates.append(start_recent)
-            start_recent += timedelta(days=random.randint(30, 60))
-            
-    elif pattern == "bulk":
-        # まとめ買い（3ヶ月おき、大量購入）
-        for _ in range(target_orders):
-            if current_date >= end_date:
-                break
-            dates.append(current_date)
-            current_date += timedelta(days=random.randint(80, 100))
-            
-    elif pattern == "spring":
-        # 春に集中購入
-        for year in range(2021, 2026):
-            for month in [3, 4, 5]:
-                if len(dates) >= target_orders:
-                    break
-                spring_date = datetime(year, month, random.randint(1, 28))
-                if spring_date <= end_date:
-                    dates.append(spring_date)
-                    
-    elif pattern == "comeback":
-        # 長期間空いた後に復帰
-        # 2020年後半に数回、その後2025年初頭に復帰
-        dates.append(datetime(2020, 8, 30))
-        dates.append(datetime(2020, 11, 15))
-        dates.append(datetime(2021, 2, 10))
-        dates.append(datetime(2025, 1, 25))
-        dates.append(datetime(2025, 4, 15))
-        dates.append(datetime(2025, 7, 10))
-        
-    elif pattern == "premium":
-        # 高価格商品を定期的に購入
-        for _ in range(target_orders):
-            if current_date >= end_date:
-                break
-            dates.append(current_date)
-            current_date += timedelta(days=random.randint(45, 65))
-            
-    elif pattern == "young":
-        # 2022年以降の若年層、SNS経由
-        start_young = datetime(2022, 6, 10)
-        for _ in range(target_orders):
-            if start_young >= end_date:
-                break
-            dates.append(start_young)
-            start_young += timedelta(days=random.randint(60, 90))
-            
-    elif pattern == "holiday":
-        # 祝日・連休に購入
-        holidays = [
-            (11, 25),  # 勤労感謝の日付近
-            (4, 29),   # GW
-            (8, 15),   # お盆
-        ]
-        for year in range(2020, 2026):
-            for month, day in holidays:
-                if len(dates) >= target_orders:
-                    break
-                holiday_date = datetime(year, month, day)
-                if holiday_date <= end_date:
-                    dates.append(holiday_date)
-                    
-    elif pattern == "trial":
-        # 試しに少し購入
-        dates.append(datetime(2023, 9, 15))
-        dates.append(datetime(2024, 2, 10))
-        
-    elif pattern == "consistent":
-        # 月1回、非常に安定
-        for _ in range(target_orders):
-            if current_date >= end_date:
-                break
-            dates.append(current_date)
-            current_date += timedelta(days=random.randint(28, 32))
-            
-    elif pattern == "weekend":
-        # 週末に購入
-        for _ in range(target_orders):
-            if current_date >= end_date:
-                break
-            # 週末に調整
-            while current_date.weekday() not in [5, 6]:  # 土日
-                current_date += timedelta(days=1)
-            dates.append(current_date)
-            current_date += timedelta(days=random.randint(45, 75))
-            
-    elif pattern == "event":
-        # イベント・記念日購入
-        for year in range(2020, 2026):
-            events = [
-                datetime(year, 10, 12),  # 記念日
-                datetime(year, 6, 20),   # 父の日
-                datetime(year, 3, 15),   # ホワイトデー
-            ]
-            for event_date in events:
-                if len(dates) >= target_orders:
-                    break
-                if event_date <= end_date:
-                    dates.append(event_date)
-    
-    return sorted([d for d in dates if d <= end_date])
+            if isinstance(day, tuple):
+                day = rng.randint(*day)
+            event_date = datetime(year, month, day)
+            if event_date <= end_date:
+                dates.append(event_date)
+    return dates
 
-def select_product_for_customer(customer: Dict, order_date: datetime) -> Dict:
-    """顧客と注文日に応じて商品を選択"""
-    pattern = customer["purchase_pattern"]
-    
-    if pattern == "loyal":
-        # プレミアム商品を好む
-        return random.choice([p for p in PRODUCTS if p["category"] in ["premium", "luxury"]])
-    elif pattern == "regular":
-        # 季節商品とギフト商品
-        return random.choice([p for p in PRODUCTS if p["category"] in ["seasonal", "holiday"]])
-    elif pattern == "frequent":
-        # 季節商品を定期購入
-        season_products = [p for p in PRODUCTS if p["category"] == "seasonal"]
-        if order_date.month in [3, 4, 5]:
-            return [p for p in season_products if "春" in p["name"]][0]
-        elif order_date.month in [6, 7, 8]:
-            return [p for p in season_products if "夏" in p["name"]][0]
-        elif order_date.month in [9, 10, 11]:
-            return [p for p in season_products if "秋" in p["name"]][0]
-        else:
-            return [p for p in season_products if "冬" in p["name"]][0]
-    elif pattern in ["moderate", "occasional"]:
-        # 日用品中心
-        return random.choice([p for p in PRODUCTS if p["category"] == "daily"])
-    elif pattern == "dormant":
-        # ヘルス＆ウェルネス商品
-        return random.choice([p for p in PRODUCTS if p["category"] == "health"])
-    elif pattern == "one_time":
-        # 高価格ギフト商品
-        return [p for p in PRODUCTS if p["sku"] == "PRD-2001-L"][0]
-    elif pattern == "seasonal":
-        # クリスマス商品
-        return [p for p in PRODUCTS if "クリスマス" in p["name"]][0]
-    elif pattern == "gift":
-        # イベント商品
-        if order_date.month == 2:
-            return [p for p in PRODUCTS if "バレンタイン" in p["name"]][0]
-        elif order_date.month == 5:
-            return [p for p in PRODUCTS if "母の日" in p["name"]][0]
-        else:
-            return [p for p in PRODUCTS if "クリスマス" in p["name"]][0]
-    elif pattern == "recent":
-        # 手頃な日用品
-        return [p for p in PRODUCTS if p["sku"] == "PRD-2003-BA"][0]
-    elif pattern == "bulk":
-        # まとめ買い用の日用品
-        return [p for p in PRODUCTS if p["sku"] == "PRD-2003-BA"][0]
-    elif pattern == "spring":
-        # 春商品
-        return [p for p in PRODUCTS if "春" in p["name"]][0]
-    elif pattern == "comeback":
-        # 季節商品
-        if order_date.month in [8, 9]:
-            return [p for p in PRODUCTS if "夏" in p["name"]][0]
+def _fixed_dates(rule: Dict, target_orders: int, start_date: datetime, end_date: datetime, rng) -> List[datetime]:
+    return list(rule["dates"])
+
+DATE_RULES = {
+    "interval": _interval_dates,
+    "burst": _burst_dates,
+    "once": _once_dates,
+    "yearly": _yearly_dates,
+    "fixed": _fixed_dates,
+}
+
+def _compile_selector(selector: Tuple) -> Tuple[Dict, List[Dict]]:
+    """商品の選び方を (固定商品, 抽選候補) に変換（どちらか一方だけが入る）"""
+    kind, *values = selector
+    if kind == "category":
+        return None, [p for p in PRODUCTS if p["category"] in values]
+    if kind == "sku":
+        return next(p for p in PRODUCTS if p["sku"] == values[0]), None
+    if kind == "name":
+        return next(p for p in PRODUCTS if values[0] in p["name"]), None
+    raise ValueError(f"未知の商品指定です: {selector}")
+
+def compile_patterns(patterns: Dict) -> Dict:
+    """購買パターン定義を、注文ごとに表を引くだけで済む形に変換"""
+    compiled = {}
+    for name, spec in patterns.items():
+        products = spec["products"]
+        if isinstance(products, dict):
+            # 月（1〜12）→ 商品の選び方
+            by_month = [_compile_selector(products["default"])] * 13
+            for months, selector in products["by_month"]:
+                for month in months:
+                    by_month[month] = _compile_selector(selector)
         else:
-            return random.choice([p for p in PRODUCTS if p["category"] == "seasonal"])
-    elif pattern == "premium":
-        # 高級商品
-        return random.choice([p for p in PRODUCTS if p["category"] == "luxury"])
-    elif pattern == "young":
-        # キッズ・若年層向け
-        return random.choice([p for p in PRODUCTS if p["category"] in ["kids", "eco"]])
-    elif pattern == "holiday":
-        # ホリデー商品
-        return [p for p in PRODUCTS if "クリスマス" in p["name"]][0]
-    elif pattern == "trial":
-        # 安価な商品
-        return [p for p in PRODUCTS if p["sku"] == "PRD-2003-BA"][0]
-    elif pattern == "consistent":
-        # 安定した日用品
-        return random.choice([p for p in PRODUCTS if p["category"] == "daily"])
-    elif pattern == "weekend":
-        # エコ商品
-        return random.choice([p for p in PRODUCTS if p["category"] == "eco"])
-    elif pattern == "event":
-        # 工芸品
-        return random.choice([p for p in PRODUCTS if p["category"] == "craft"])
-    
-    # デフォルト
-    return random.choice(PRODUCTS)
+            by_month = [_compile_selector(products)] * 13
+        compiled[name] = {
+            "date_rule": DATE_RULES[spec["dates"]["rule"]],
+            "dates": spec["dates"],
+            "products": by_month,
+            "quantity": spec.get("quantity"),
+        }
+    return compiled
 
-def calculate_quantity(customer: Dict, product: Dict) -> int:
+COMPILED_PATTERNS = compile_patterns(PURCHASE_PATTERNS)
+
+def generate_order_dates(customer: Dict, start_date: datetime, end_date: datetime, rng=random) -> List[datetime]:
+    """顧客の購買パターンに応じた注文日を生成"""
+    pattern = COMPILED_PATTERNS[customer["purchase_pattern"]]
+    dates = pattern["date_rule"](pattern["dates"], customer["target_orders"], start_date, end_date, rng)
+    return sorted([d for d in dates if start_date <= d <= end_date])
+
+def select_product_for_customer(customer: Dict, order_date: datetime, rng=random) -> Dict:
+    """顧客と注文日に応じて商品を選択"""
+    product, pool = COMPILED_PATTERNS[customer["purchase_pattern"]]["products"][order_date.month]
+    return product if pool is None else rng.choice(pool)
+
+def calculate_quantity(customer: Dict, product: Dict, rng=random) -> int:
     """顧客パターンに応じた購入数量"""
-    if customer["purchase_pattern"] == "bulk":
-        return random.randint(3, 8)  # まとめ買い
-    elif customer["purchase_pattern"] in ["loyal", "premium"]:
-        return random.randint(1, 3)  # 高価値顧客は複数購入
-    else:
-        return 1  # 通常は1個
+    quantity = COMPILED_PATTERNS[customer["purchase_pattern"]]["quantity"]
+    return 1 if quantity is None else rng.randint(*quantity)
 
-def generate_order_csv():
-    """注文データCSVを生成"""
-    orders = []
-    order_id_counter = 2021
+def build_order_row(order_id: int, customer: Dict, order_date: datetime, product: Dict, quantity: int) -> List:
+    """1注文分の行を生成（1注文1明細）"""
+    subtotal = product["price"] * quantity
+    shipping = 300 if subtotal < 5000 else (500 if subtotal < 10000 else 800)
+    taxes = int(subtotal * 0.1)
+    total = subtotal + shipping + taxes
     
-    start_date = datetime(2020, 1, 1)
-    end_date = datetime(2025, 7, 31)
+    # 注文データ作成（注文ごとに変わる列だけを埋める）
+    payment_reference = f"pay-{customer['id'][-4:]}-{order_id:03d}"
+    created_at = format_timestamp(order_date)
+    order = ORDER_EXPORT_SCHEMA.fill(ORDER_TEMPLATE, {
+        "Name": customer["name"],
+        "Email": customer["email"],
+        "Paid at": created_at,
+        "Fulfilled at": format_shifted(order_date, 1),
+        "Subtotal": subtotal,
+        "Shipping": shipping,
+        "Taxes": taxes,
+        "Total": total,
+        "Created at": created_at,
+        "Lineitem quantity": quantity,
+        "Lineitem name": product["name"],
+        "Lineitem price": product["price"],
+        "Lineitem compare at price": product["price"],
+        "Lineitem sku": product["sku"],
+        "Billing Name": customer["name"],
+        "Billing City": customer["prefecture"],
+        "Billing Province": customer["prefecture"],
+        "Billing Phone": customer["phone"],
+        "Shipping Name": customer["name"],
+        "Shipping City": customer["prefecture"],
+        "Shipping Province": customer["prefecture"],
+        "Shipping Phone": customer["phone"],
+        "Notes": f"{customer['purchase_pattern']}パターン",
+        "Payment Reference": payment_reference,
+        "Vendor": product["vendor"],
+        "Id": f"ORD-{order_id}",
+        "Tags": f"{customer['purchase_pattern']},テスト顧客",
+        "Tax 1 Value": taxes,
+        "Billing Province Name": customer["prefecture"],
+        "Shipping Province Name": customer["prefecture"],
+        "Payment ID": f"pay-id-{customer['id'][-4:]}-{order_id:03d}",
+        "Payment References": payment_reference,
+        "Customer ID": customer["id"]
+    })
+    return order
+
+def generate_order_csv(start_date: datetime = ORDER_START_DATE, end_date: datetime = ORDER_END_DATE,
+                       first_order_id: int = 2021):
+    """注文データCSVを生成（期間・注文番号の開始値は追記時に指定）"""
+    orders = []
+    order_id_counter = first_order_id
     
     # 各顧客の注文を生成
     for customer in CUSTOMERS:
@@ -372,135 +341,315 @@ def generate_order_csv():
             product = select_product_for_customer(customer, order_date)
             quantity = calculate_quantity(customer, product)
             
-            subtotal = product["price"] * quantity
-            shipping = 300 if subtotal < 5000 else (500 if subtotal < 10000 else 800)
-            taxes = int(subtotal * 0.1)
-            total = subtotal + shipping + taxes
-            
-            # 注文データ作成
-            order = {
-                "Name": customer["name"],
-                "Email": customer["email"],
-                "Financial Status": "paid",
-                "Paid at": order_date.strftime("%Y-%m-%d %H:%M:%S +0900"),
-                "Fulfillment Status": "fulfilled",
-                "Fulfilled at": (order_date + timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S +0900"),
-                "Currency": "JPY",
-                "Subtotal": subtotal,
-                "Shipping": shipping,
-                "Taxes": taxes,
-                "Total": total,
-                "Discount Code": "",
-                "Discount Amount": 0,
-                "Shipping Method": "宅配便",
-                "Created at": order_date.strftime("%Y-%m-%d %H:%M:%S +0900"),
-                "Lineitem quantity": quantity,
-                "Lineitem name": product["name"],
-                "Lineitem price": product["price"],
-                "Lineitem compare at price": product["price"],
-                "Lineitem sku": product["sku"],
-                "Lineitem requires shipping": "true",
-                "Lineitem taxable": "true",
-                "Lineitem fulfillment status": "fulfilled",
-                "Billing Name": customer["name"],
-                "Billing Street": "",
-                "Billing Address1": "",
-                "Billing Address2": "",
-                "Billing Company": "",
-                "Billing City": customer["prefecture"],
-                "Billing Zip": "",
-                "Billing Province": customer["prefecture"],
-                "Billing Country": "日本",
-                "Billing Phone": customer["phone"],
-                "Shipping Name": customer["name"],
-                "Shipping Street": "",
-                "Shipping Address1": "",
-                "Shipping Address2": "",
-                "Shipping Company": "",
-                "Shipping City": customer["prefecture"],
-                "Shipping Zip": "",
-                "Shipping Province": customer["prefecture"],
-                "Shipping Country": "日本",
-                "Shipping Phone": customer["phone"],
-                "Notes": f"{customer['purchase_pattern']}パターン",
-                "Cancelled at": "",
-                "Payment Method": "Shopify Payments",
-                "Payment Reference": f"pay-{customer['id'][-4:]}-{order_id_counter:03d}",
-                "Refunded Amount": 0,
-                "Vendor": product["vendor"],
-                "Outstanding Balance": 0,
-                "Employee": "",
-                "Location": "",
-                "Device ID": "",
-                "Id": f"ORD-{order_id_counter}",
-                "Tags": f"{customer['purchase_pattern']},テスト顧客",
-                "Risk Level": "Low",
-                "Source": "web",
-                "Lineitem discount": 0,
-                "Tax 1 Name": "消費税 10%",
-                "Tax 1 Value": taxes,
-                "Tax 2 Name": "",
-                "Tax 2 Value": "",
-                "Tax 3 Name": "",
-                "Tax 3 Value": "",
-                "Tax 4 Name": "",
-                "Tax 4 Value": "",
-                "Tax 5 Name": "",
-                "Tax 5 Value": "",
-                "Phone": "",
-                "Receipt Number": "",
-                "Duties": "",
-                "Billing Province Name": customer["prefecture"],
-                "Shipping Province Name": customer["prefecture"],
-                "Payment ID": f"pay-id-{customer['id'][-4:]}-{order_id_counter:03d}",
-                "Payment Terms Name": "",
-                "Next Payment Due At": "",
-                "Payment References": f"pay-{customer['id'][-4:]}-{order_id_counter:03d}",
-                "Customer ID": customer["id"]
-            }
-            
-            orders.append(order)
+            orders.append(build_order_row(order_id_counter, customer, order_date, product, quantity))
             order_id_counter += 1
     
     return orders
 
-def main():
-    """メイン関数"""
-    print("2020年1月〜2025年7月の包括的注文データを生成中...")
+# ペルソナ複製モード（scale・customers 指定時）
+# 20ペルソナを指定人数に複製し、購入開始日・目標注文数・都道府県をずらして大量の顧客を作る
+PREFECTURES = [
+    "北海道", "宮城県", "茨城県", "栃木県", "群馬県", "埼玉県", "千葉県", "東京都", "神奈川県", "新潟県",
+    "静岡県", "愛知県", "京都府", "大阪府", "兵庫県", "奈良県", "広島県", "福岡県", "熊本県", "沖縄県",
+]
+CLONE_ORDER_BLOCK = 100           # 複製顧客1人に割り当てる注文番号の幅（目標注文数の上限を兼ねる）
+CLONE_TARGET_JITTER = (0.7, 1.3)  # 目標注文数に掛ける倍率の範囲
+CLONE_START_JITTER_DAYS = 180     # 購入開始日をずらす最大日数
+CLONE_BATCH_SIZE = 10_000         # 一度に複製・生成する顧客数
+
+# 注文期間の日付表（日数オフセット→日付）
+ORDER_DAYS = [ORDER_START_DATE + timedelta(days=d) for d in range((ORDER_END_DATE - ORDER_START_DATE).days + 1)]
+
+def clone_customers(start: int, count: int, np_rng, identities: IdentityGenerator) -> List[Dict]:
+    """複製顧客 [start, start + count) を作成（i 番目はペルソナ i % 20 の複製）
+
+    氏名・電話番号は identities で顧客番号から決めるため、全複製顧客で電話番号が重複しない。
+    """
+    np = vectorized.np
+    index = np.arange(start, start + count)
+    persona = index % len(CUSTOMERS)
+    base_target = np.array([c["target_orders"] for c in CUSTOMERS])[persona]
+    target = np.clip(np.rint(base_target * np_rng.uniform(*CLONE_TARGET_JITTER, size=count)),
+                     1, CLONE_ORDER_BLOCK - 1).astype(np.int64)
+    offset = vectorized.randint(np_rng, 0, CLONE_START_JITTER_DAYS, count)
+    prefecture = np_rng.integers(0, len(PREFECTURES), size=count)
+    
+    customers = []
+    for i, p, t, o, pref in zip(index.tolist(), persona.tolist(), target.tolist(), offset.tolist(), prefecture.tolist()):
+        source = CUSTOMERS[p]
+        number = 2001 + i
+        customers.append({
+            "id": f"CUST-{number}",
+            "name": "".join(identities.name(i)),
+            "email": f"{source['email'].rsplit('-', 1)[0]}-{number}@example.com",
+            "phone": identities.phone(i),
+            "prefecture": PREFECTURES[pref],
+            "purchase_pattern": source["purchase_pattern"],
+            "target_orders": t,
+            "offset_days": o,
+            "index": i,
+        })
+    return customers
+
+def _clone_dates_one(customer: Dict, rng) -> List[datetime]:
+    """複製顧客1人分の注文日（購入開始日のずれを反映）"""
+    rule = COMPILED_PATTERNS[customer["purchase_pattern"]]["dates"]
+    date_rule = DATE_RULES[rule["rule"]]
+    shift = timedelta(days=customer["offset_days"])
+    target_orders = customer["target_orders"]
+    if rule["rule"] == "yearly":
+        # 暦に結びついた購入日はずらさない
+        dates = date_rule(rule, target_orders, ORDER_START_DATE, ORDER_END_DATE, rng)
+    elif rule["rule"] in ("once", "fixed"):
+        dates = [d + shift for d in date_rule(rule, target_orders, ORDER_START_DATE, ORDER_END_DATE, rng)]
+    else:
+        if "anchor" in rule:
+            rule = dict(rule, anchor=rule["anchor"] + shift)
+        dates = date_rule(rule, target_orders, ORDER_START_DATE + shift, ORDER_END_DATE, rng)
+    return sorted([d for d in dates if ORDER_START_DATE <= d <= ORDER_END_DATE])
+
+def clone_order_dates(customers: List[Dict], np_rng, rng) -> List[List[datetime]]:
+    """複製顧客ごとの注文日のリスト
+
+    一定間隔で購入するパターン（interval）はパターン単位で間隔を一括抽選し、
+    累積和で注文日を求める。それ以外は顧客ごとにルールを適用する。
+    """
+    np = vectorized.np
+    last_day = len(ORDER_DAYS) - 1
+    by_pattern = {}
+    for position, customer in enumerate(customers):
+        by_pattern.setdefault(customer["purchase_pattern"], []).append(position)
+    
+    dates = [None] * len(customers)
+    for name, positions in by_pattern.items():
+        rule = COMPILED_PATTERNS[name]["dates"]
+        if rule["rule"] != "interval" or "weekdays" in rule:
+            for position in positions:
+                dates[position] = _clone_dates_one(customers[position], rng)
+            continue
+        first_day = (rule.get("anchor", ORDER_START_DATE) - ORDER_START_DATE).days
+        offsets = np.array([customers[p]["offset_days"] for p in positions])
+        targets = np.array([customers[p]["target_orders"] for p in positions])
+        steps = vectorized.randint(np_rng, *rule["days"], (len(positions), int(targets.max())))
+        days = first_day + offsets[:, None] + np.cumsum(steps, axis=1) - steps
+        valid = (np.arange(steps.shape[1]) < targets[:, None]) & (days < last_day)
+        for position, row_days, row_valid in zip(positions, days.tolist(), valid.tolist()):
+            dates[position] = [ORDER_DAYS[d] for d, ok in zip(row_days, row_valid) if ok]
+    return dates
+
+def iter_clone_orders(num_customers: int, start: int = 0, stop: int = None, seed: int = None,
+                      batch_size: int = CLONE_BATCH_SIZE, identity_seed: int = None):
+    """複製顧客 [start, stop) の注文行を顧客バッチ単位で生成
+
+    注文番号は顧客ごとに CLONE_ORDER_BLOCK 件ずつの範囲を割り当てるため、
+    バッチ・シャードをまたいでも重複しない。氏名・電話番号は identity_seed
+    （未指定なら seed）から決める。シャードごとに seed が変わっても重複しないよう、
+    シャード生成では全体で共通の identity_seed を渡す。
+    """
+    vectorized.require_numpy()
+    np_rng = vectorized.make_rng(seed)
+    rng = random.Random(seed)
+    identities = IdentityGenerator(seed if identity_seed is None else identity_seed, "store2")
+    stop = num_customers if stop is None else stop
+    for offset, count in vectorized.iter_batches(stop - start, batch_size):
+        customers = clone_customers(start + offset, count, np_rng, identities)
+        for customer, order_dates in zip(customers, clone_order_dates(customers, np_rng, rng)):
+            order_id = 2021 + customer["index"] * CLONE_ORDER_BLOCK
+            for order_date in order_dates:
+                product = select_product_for_customer(customer, order_date, rng)
+                quantity = calculate_quantity(customer, product, rng)
+                yield build_order_row(order_id, customer, order_date, product, quantity)
+                order_id += 1
+
+def make_clone_shard_rows(context: Dict, start: int, stop: int, seed: int):
+    """シャード1つ分（複製顧客 [start, stop)）の注文行を生成（sharding から呼ばれる）"""
+    return iter_clone_orders(context["num_customers"], start, stop, seed=seed, batch_size=context["batch_size"],
+                             identity_seed=context["identity_seed"])
+
+def order_pattern(tags: str) -> str:
+    """注文タグ（購入パターン,テスト顧客）から購入パターンを取り出す"""
+    return tags.split(",")[0]
+
+def order_stats() -> StatsCollector:
+    """購入パターン・商品カテゴリ別に集計する統計コレクタ"""
+    return StatsCollector(
+        order_keys={"pattern": ("Tags", order_pattern)},
+        item_keys={"category": ("Lineitem sku", {p["sku"]: p["category"] for p in PRODUCTS})})
+
+def append_orders(output_dir: str, until: datetime, since: datetime = None, seed: int = None,
+                  compression: str = None, log=print) -> Dict:
+    """既存の注文CSVに until までの注文を追記し、ファイル別の行数（追記分）を返す
+
+    顧客は20ペルソナのまま、各パターンの購入周期を追記期間に当てはめる。
+    注文番号は既存の最大値から続ける。compression 指定時は圧縮済みの注文CSVに追記する。
+    集計JSONは追記後の注文CSV全体から作り直す。
+    """
+    if seed is not None:
+        random.seed(seed)
+    orders_name = compressed_name(ORDERS_FILENAME, compression)
+    filename = os.path.join(output_dir, orders_name)
+    state = append.read_order_state(filename)
+    start_date, end_date = append.append_window(state, until, since)
+    
+    log(f"包括的注文データを追記中...（{start_date:%Y-%m-%d} 〜 {end_date:%Y-%m-%d}）")
+    orders = generate_order_csv(start_date, end_date, state["last_order_number"] + 1)
+    counts = append_orders_csv(filename, orders)
+    if os.path.isdir(columns_dir(filename)):
+        # 列ファイルがあれば追記後の注文CSVから作り直す
+        write_order_columns(filename)
+    order_stats().observe_csv(filename).write_json(os.path.join(output_dir, SUMMARY_FILENAME))
+    log(f"✅ {counts['orders']}件の注文データを追記: {filename}")
+    return {'output_dir': output_dir, 'files': {orders_name: counts['rows']}}
+
+def run(output_dir=DEFAULT_OUTPUT_DIR, scale=1.0, customers=None, seed=None,
+        batch_size=CLONE_BATCH_SIZE, workers=None, shard_size=sharding.DEFAULT_SHARD_SIZE,
+        sort_by_date=False, sort_buffer_rows=extsort.DEFAULT_BUFFER_ROWS, compression=None, columnar=False,
+        cache=False, cache_dir=None, append_until=None, append_since=None, quiet=False):
+    """注文データCSVを生成し、ファイル別の行数を返す
+
+    既定（scale=1.0）は手書きの20ペルソナの注文を生成する。customers または
+    scale≠1.0 を指定すると、ペルソナを 20×scale 人（または customers 人）に複製して生成する。
+    sort_by_date=True なら顧客ごとではなく Created at 順に並べて出力する（メモリ上には
+    最大 sort_buffer_rows 行、超えた分は一時ファイルで外部マージソート）。
+    compression（"gzip" / "zstd"）指定時は注文CSVを圧縮して書き出す（書き込みは別スレッド）。
+    columnar=True なら注文CSVの主要列を .npy の列ファイルにも書き出す（columnar.write_order_columns() を参照）。
+    append_until 指定時は既存CSVへの追記のみを行う（append_orders() を参照）。
+    """
+    log = (lambda *args, **kwargs: None) if quiet else print
+    if append_until is not None:
+        return append_orders(output_dir, append_until, append_since, seed, compression, log)
+    num_customers = customers if customers is not None else (
+        max(1, round(len(CUSTOMERS) * scale)) if scale != 1.0 else None)
+    
+    # キャッシュ済みなら生成せずに復元（シード未指定の出力は再現できないため対象外）
+    store_cache = key = None
+    if cache and seed is None:
+        log("乱数シードが未指定のため、キャッシュは使用しません。")
+    elif cache:
+        store_cache = GenerationCache(cache_dir)
+        key = cache_key(__file__, {
+            "constants": {"CUSTOMERS": CUSTOMERS, "PRODUCTS": PRODUCTS},
+            "seed": seed, "customers": num_customers, "batch_size": batch_size, "sort_by_date": sort_by_date,
+            "compression": compression, "columnar": columnar,
+            "shard_size": shard_size if workers else None,
+        })
+        manifest = store_cache.restore(key, output_dir)
+        if manifest:
+            log(f"キャッシュから復元しました（{key[:12]}）: {output_dir}")
+            return {'output_dir': output_dir, 'files': manifest_rows(manifest)}
+    
+    if seed is not None:
+        random.seed(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    files = {}
+    
+    log("2020年1月〜2025年7月の包括的注文データを生成中...")
+    orders_name = compressed_name(ORDERS_FILENAME, compression)
+    filename = os.path.join(output_dir, orders_name)
+    stats = order_stats()
+    extra_files = [SUMMARY_FILENAME]
+    
+    if num_customers is not None:
+        # ペルソナ複製モード（行を保持せずストリーミングで書き出す）
+        log(f"ペルソナ{len(CUSTOMERS)}人を{num_customers:,}人に複製して生成します")
+        if workers:
+            # 氏名・電話番号の鍵はシャード間で共通にする（シード未指定でも重複させない）
+            identity_seed = seed if seed is not None else random.getrandbits(64)
+            context = {"num_customers": num_customers, "batch_size": batch_size, "identity_seed": identity_seed}
+            counts = sharding.write_sharded_orders_csv(
+                filename, make_clone_shard_rows, context, num_customers,
+                seed=seed, workers=workers, shard_size=shard_size, encoding="utf-8", stats=stats)
+            if sort_by_date:
+                extsort.sort_orders_csv(filename, sort_buffer_rows, encoding="utf-8")
+        else:
+            rows = iter_clone_orders(num_customers, seed=seed, batch_size=batch_size)
+            if sort_by_date:
+                rows = extsort.iter_sorted_orders(rows, sort_buffer_rows)
+            counts = write_orders_csv(filename, rows, encoding="utf-8", stats=stats)
+        files[orders_name] = counts["rows"]
+        log(f"✅ {counts['rows']:,}件の注文データを生成: {filename}")
+        log(f"🏪 顧客数: {num_customers:,}人")
+        log(f"🛒 総注文数: {counts['orders']:,}件")
+        log(f"💴 売上合計: {counts['total']:,}円")
+        stats.write_json(os.path.join(output_dir, SUMMARY_FILENAME))
+        if columnar:
+            write_order_columns(filename)
+            extra_files += column_files(filename)
+            log(f"🗂️ 列ファイル: {columns_dir(filename)}")
+        if store_cache:
+            store_cache.save(key, output_dir, files, extra_files=extra_files)
+        return {'output_dir': output_dir, 'files': files}
     
     orders = generate_order_csv()
     
     # CSVファイルに出力
-    filename = "/mnt/c/source/git-h.fukuda1207/shopify-ai-marketing-suite/data/staging/anonymized-orders_store2_comprehensive.csv"
-    
     if orders:
-        fieldnames = orders[0].keys()
-        
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(orders)
-        
-        print(f"✅ {len(orders)}件の注文データを生成: {filename}")
+        write_orders_csv(filename, extsort.iter_sorted_orders(orders, sort_buffer_rows) if sort_by_date else orders,
+                         encoding='utf-8', stats=stats)
+        files[orders_name] = len(orders)
         
-        # 統計情報を出力
-        customer_order_counts = {}
-        for order in orders:
-            customer_id = order["Customer ID"]
-            customer_order_counts[customer_id] = customer_order_counts.get(customer_id, 0) + 1
+        log(f"✅ {len(orders)}件の注文データを生成: {filename}")
         
-        print("\n📊 顧客別注文数統計:")
+        # 統計情報を出力（顧客別の注文数は書き出しと同時に集計済み）
+        log("\n📊 顧客別注文数統計:")
         for customer in CUSTOMERS:
-            count = customer_order_counts.get(customer["id"], 0)
-            print(f"  {customer['name']} ({customer['purchase_pattern']}): {count}回 (目標: {customer['target_orders']}回)")
+            count = stats.customer_totals(customer["id"])[0]
+            log(f"  {customer['name']} ({customer['purchase_pattern']}): {count}回 (目標: {customer['target_orders']}回)")
         
-        print(f"\n📈 期間: 2020年1月 〜 2025年7月 (5年7ヶ月)")
-        print(f"🏪 顧客数: {len(CUSTOMERS)}人")
-        print(f"📦 商品数: {len(PRODUCTS)}商品")
-        print(f"🛒 総注文数: {len(orders)}件")
+        log(f"\n📈 期間: 2020年1月 〜 2025年7月 (5年7ヶ月)")
+        log(f"🏪 顧客数: {len(CUSTOMERS)}人")
+        log(f"📦 商品数: {len(PRODUCTS)}商品")
+        log(f"🛒 総注文数: {len(orders)}件")
+        stats.write_json(os.path.join(output_dir, SUMMARY_FILENAME))
+        if columnar:
+            write_order_columns(filename)
+            extra_files += column_files(filename)
+            log(f"🗂️ 列ファイル: {columns_dir(filename)}")
+        
+        if store_cache:
+            store_cache.save(key, output_dir, files, extra_files=extra_files)
         
     else:
-        print("❌ 注文データの生成に失敗しました")
+        log("❌ 注文データの生成に失敗しました")
+    
+    return {'output_dir': output_dir, 'files': files}
+
+def parse_args():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="ストアID2の包括的注文データを生成")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="出力先ディレクトリ")
+    parser.add_argument("--seed", type=int, default=None, help="乱数シード（指定時は再現可能な出力）")
+    parser.add_argument("--scale", type=float, default=1.0, help="顧客数の倍率（1.0以外でペルソナ複製モード、20×scale人）")
+    parser.add_argument("--customers", type=int, default=None, help="ペルソナを複製して生成する顧客数（指定時は複製モード）")
+    parser.add_argument("--batch-size", type=int, default=CLONE_BATCH_SIZE, help="複製モードで一度に生成する顧客数")
+    parser.add_argument("--workers", type=int, default=None, help="複製モードでシャード分割して並列生成するプロセス数")
+    parser.add_argument("--shard-size", type=int, default=sharding.DEFAULT_SHARD_SIZE, help="1シャードあたりの顧客数")
+    parser.add_argument("--sort-by-date", action="store_true", help="注文を Created at 順に並べて出力（明細行は注文ごとにまとめたまま）")
+    parser.add_argument("--sort-buffer-rows", type=int, default=extsort.DEFAULT_BUFFER_ROWS, help="並べ替えでメモリに保持する最大行数（超えた分は一時ファイルで外部マージソート）")
+    parser.add_argument("--compression", choices=list(COMPRESSION_SUFFIXES), default=None, help="注文CSVを gzip / zstd で圧縮して出力（.gz / .zst、zstd は zstandard が必要）")
+    parser.add_argument("--columnar", action="store_true", help="注文CSVの主要列を型付きの .npy（*.columns/）にも書き出す（numpy が必要、mmap で高速に読み込める）")
+    parser.add_argument("--cache", action="store_true", help="同じ入力（定数・シード・コード）の生成結果をキャッシュから再利用")
+    parser.add_argument("--cache-dir", default=None, help="キャッシュの保存先（デフォルト: $DEMO_DATAGEN_CACHE または ~/.cache/shopify-demo-datagen）")
+    parser.add_argument("--append-until", type=append.parse_date, default=None, metavar="YYYY-MM-DD", help="既存CSVの最終注文日の翌日からこの日までの注文を追記")
+    parser.add_argument("--append-since", type=append.parse_date, default=None, metavar="YYYY-MM-DD", help="追記する期間の開始日（デフォルト: 既存データの最終注文日の翌日）")
+    parser.add_argument("--sqlite", default=None, metavar="PATH", help="生成後に注文を SQLite の分析DBミラー（Customers / Orders / OrderItems 等）へ投入（顧客は注文から作成）")
+    parser.add_argument("--sqlserver", choices=SQLSERVER_FORMATS, default=None, help="生成後に SQL Server への一括投入ファイルを sqlserver/ に書き出す（insert: 1000行ずつの INSERT スクリプト、bcp: bcp / BULK INSERT 用のデータ・フォーマットファイル）")
+    parser.add_argument("--store-id", type=int, default=STORE_ID, help=f"SQLite・SQL Server へ投入するときの StoreId（デフォルト: {STORE_ID}、同じ StoreId の既存データは入れ替え）")
+    return parser.parse_args()
+
+def main():
+    """メイン関数"""
+    args = vars(parse_args())
+    sqlite_path, sqlserver, store_id = args.pop("sqlite"), args.pop("sqlserver"), args.pop("store_id")
+    result = run(**args)
+    if sqlserver:
+        seed = write_seed_files(result["output_dir"], result["files"], store_id, sqlserver)
+        print(f"SQL Server 用のシード（{sqlserver}）を書き出しました: {os.path.dirname(seed['paths'][0])}/"
+              f"（00〜99 の番号順に実行）")
+    if sqlite_path:
+        counts = load_store_output(sqlite_path, store_id, result["output_dir"], result["files"])
+        print(f"SQLite（{sqlite_path}）へ投入しました: StoreId={store_id}、顧客{counts['customers']:,}件、"
+              f"注文{counts['orders']:,}件（明細{counts['order_items']:,}件）")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+デモデータ生成スクリプト（scripts/generate-*.py）の共通部品
+"""
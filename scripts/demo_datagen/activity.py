@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+裾の重い顧客アクティビティ（Zipf / Pareto 型の注文数の偏り）
+
+顧客ごとの注文数を Pareto 分布の重みで配分し、ごく一部の顧客に数千件の注文が集中し、
+多くの顧客は1回だけ購入する偏りを再現する。一定割合の顧客は休眠顧客として、
+最後の注文が期間末から dormant_days 日以上前になるようにする。
+
+注文番号→顧客の割り当ては NumPy で一括に作る（1000万件規模でも数秒）。
+生成側は注文ごとに割り当てを引き、注文日は windows() の期間から抽選する。
+"""
+
+from datetime import timedelta
+
+from demo_datagen import vectorized
+
+DEFAULT_ALPHA = 1.1
+DEFAULT_ONE_TIMER_FRACTION = 0.5
+DEFAULT_DORMANT_FRACTION = 0.3
+DEFAULT_DORMANT_DAYS = 365
+
+# 注文日の期間（windows() の並び）: 全期間 / 休眠顧客（基準日より前）/ 直近（基準日以降）
+ANY_WINDOW, DORMANT_WINDOW, RECENT_WINDOW = 0, 1, 2
+
+
+class ActivityPlan:
+    """注文番号順の顧客の位置（customer）と注文日の期間（window）"""
+
+    def __init__(self, customer, window, counts, dormant, dormant_days):
+        self.customer = customer
+        self.window = window
+        self.counts = counts
+        self.dormant = dormant
+        self.dormant_days = dormant_days
+
+    def __len__(self):
+        return len(self.customer)
+
+    def windows(self, start_date, end_date):
+        """注文期間を (全期間, 休眠顧客の期間, 直近の期間) の (開始日, 終了日) に分ける"""
+        cutoff = end_date - timedelta(days=self.dormant_days)
+        if cutoff <= start_date:
+            raise ValueError(f'休眠の日数（{self.dormant_days}日）が注文期間より長すぎます')
+        return [(start_date, end_date), (start_date, cutoff - timedelta(days=1)), (cutoff, end_date)]
+
+    def summary(self):
+        """顧客の注文数の分布（ログ表示用）"""
+        counts = self.counts
+        return {
+            'customers': int((counts > 0).sum()),
+            'one_timers': int((counts == 1).sum()),
+            'dormant': int((self.dormant & (counts > 0)).sum()),
+            'max_orders': int(counts.max()) if len(counts) else 0,
+        }
+
+
+class ActivityModel:
+    """顧客ごとの注文数を裾の重い分布で決め、注文→顧客の割り当てを作る
+
+    alpha: 注文数の重みの Pareto 分布の形状（小さいほど一部の顧客に集中、Zipf の指数の逆数に相当）
+    one_timer_fraction: 1回だけ購入する顧客の割合
+    dormant_fraction: 休眠顧客（期間末から dormant_days 日以上注文がない）の割合
+    """
+
+    def __init__(self, alpha=DEFAULT_ALPHA, one_timer_fraction=DEFAULT_ONE_TIMER_FRACTION,
+                 dormant_fraction=DEFAULT_DORMANT_FRACTION, dormant_days=DEFAULT_DORMANT_DAYS):
+        if alpha <= 0:
+            raise ValueError('alpha は正の値である必要があります')
+        for name, value in (('one_timer_fraction', one_timer_fraction), ('dormant_fraction', dormant_fraction)):
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f'{name} は0〜1の範囲で指定してください')
+        self.alpha = alpha
+        self.one_timer_fraction = one_timer_fraction
+        self.dormant_fraction = dormant_fraction
+        self.dormant_days = dormant_days
+
+    def order_counts(self, rng, num_customers, num_orders):
+        """顧客ごとの注文数（合計 num_orders）
+
+        1回購入の顧客は1件、それ以外は2件を最低件数とし、残りを Pareto 分布の重みで
+        多項分布に配分する。注文数が最低件数の合計に満たない場合は、ランダムな順に
+        最低件数を満たせる顧客だけに注文を割り当てる。
+        """
+        np = vectorized.np
+        one_timer = rng.random(num_customers) < self.one_timer_fraction
+        counts = np.where(one_timer, 1, 2).astype(np.int64)
+        weights = np.where(one_timer, 0.0, rng.pareto(self.alpha, num_customers) + 1.0)
+        if counts.sum() > num_orders:
+            order = rng.permutation(num_customers)
+            dropped = order[np.cumsum(counts[order]) > num_orders]
+            counts[dropped] = 0
+            weights[dropped] = 0.0
+        remaining = num_orders - int(counts.sum())
+        if remaining:
+            if weights.sum() <= 0:
+                # 全員が1回購入の設定でも注文数は満たす（残りは注文のある顧客へ均等に）
+                weights = (counts > 0).astype(np.float64)
+            counts += rng.multinomial(remaining, weights / weights.sum())
+        return counts
+
+    def plan(self, num_customers, num_orders, seed=None):
+        """num_orders 件の注文を顧客へ割り当てた ActivityPlan を作る"""
+        np = vectorized.require_numpy()
+        rng = vectorized.make_rng(seed)
+        counts = self.order_counts(rng, num_customers, num_orders)
+        dormant = rng.random(num_customers) < self.dormant_fraction
+
+        customer = np.repeat(np.arange(num_customers, dtype=np.int64), counts)
+        rng.shuffle(customer)
+        window = np.where(dormant[customer], DORMANT_WINDOW, ANY_WINDOW).astype(np.int8)
+        # 休眠でない顧客は最初に現れる注文を直近の期間にし、最終注文日を基準日以降にする
+        _, first = np.unique(customer, return_index=True)
+        window[first[~dormant[customer[first]]]] = RECENT_WINDOW
+        return ActivityPlan(customer, window, counts, dormant, self.dormant_days)
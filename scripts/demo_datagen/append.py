@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+既存CSVへの追記（期間の延長）
+
+生成済みの注文CSVから最後の注文番号・注文日時を、顧客CSVから顧客一覧を読み取り、
+新しい期間の注文だけを生成して末尾に追記する。過去分を再生成せずに
+フィクスチャの期間を月単位などで先へ延ばすために使う。
+"""
+
+import csv
+import json
+import re
+from datetime import datetime, timedelta
+
+from demo_datagen.csvout import open_input
+from demo_datagen.timestamps import parse_timestamp
+
+_TRAILING_NUMBER = re.compile(r'(\d+)$')
+
+
+def parse_date(value):
+    """YYYY-MM-DD 形式の日付を datetime に変換（argparse の type 用）"""
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def read_order_state(path):
+    """注文CSVを1行ずつ読み、注文数・最後の注文番号・最初/最後の注文日時を返す
+
+    同じ注文の追加明細（Id が空の行）は数えない。圧縮CSV（.gz / .zst）もそのまま読める。
+    """
+    state = {'orders': 0, 'last_order_number': None,
+             'first_created_at': None, 'last_created_at': None}
+    with open_input(path) as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        id_index = header.index('Id')
+        created_index = header.index('Created at')
+        for row in reader:
+            if not row or not row[id_index]:
+                continue
+            state['orders'] += 1
+            match = _TRAILING_NUMBER.search(row[id_index])
+            if match:
+                number = int(match.group(1))
+                if state['last_order_number'] is None or number > state['last_order_number']:
+                    state['last_order_number'] = number
+            created_at = parse_timestamp(row[created_index])
+            if state['first_created_at'] is None or created_at < state['first_created_at']:
+                state['first_created_at'] = created_at
+            if state['last_created_at'] is None or created_at > state['last_created_at']:
+                state['last_created_at'] = created_at
+    if not state['orders']:
+        raise ValueError(f'追記元の注文がありません: {path}')
+    return state
+
+
+def read_summary_options(path):
+    """集計JSONに記録された生成時の設定（options）を返す（JSON がない・記録がない場合は空の辞書）"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('options', {})
+    except FileNotFoundError:
+        return {}
+
+
+def read_customers(path):
+    """顧客CSVを読み込み、列名→値の辞書のリストで返す"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+
+def append_window(state, until, since=None):
+    """追記する期間 (開始日, 終了日) を返す（既定は最後の注文日の翌日から until まで）"""
+    last_day = state['last_created_at'].replace(hour=0, minute=0, second=0, microsecond=0)
+    start = since or last_day + timedelta(days=1)
+    if start > until:
+        raise ValueError(f"追記する期間がありません（既存データの最終注文日: {last_day:%Y-%m-%d}）")
+    return start, until
+
+
+def scaled_order_count(state, start, end):
+    """既存データの1日あたり注文数を保ったまま、期間 [start, end] の注文数を見積もる"""
+    span_days = (state['last_created_at'] - state['first_created_at']).days + 1
+    new_days = (end - start).days + 1
+    return max(1, round(state['orders'] * new_days / span_days))
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+生成結果のキャッシュ（内容アドレス方式）
+
+生成に使う定数・シード・データ量・コード自体をハッシュしたキーで出力CSVを保存し、
+同じ入力での再実行時は生成せずにキャッシュからリンク（不可ならコピー）する。
+復元時はマニフェストのサイズと sha256 で内容を確かめ、一致しないエントリは使わない。
+シード未指定の生成は再現性がないためキャッシュしない。
+"""
+
+import datetime
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.environ.get(
+    'DEMO_DATAGEN_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'shopify-demo-datagen'))
+MANIFEST_NAME = 'manifest.json'
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_version(script_path):
+    """生成スクリプトと共通部品（demo_datagen）のソースから求めたハッシュ"""
+    digest = hashlib.sha256()
+    for path in [script_path] + sorted(glob.glob(os.path.join(PACKAGE_DIR, '*.py'))):
+        with open(path, 'rb') as f:
+            digest.update(os.path.basename(path).encode('utf-8'))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def cache_key(script_path, inputs):
+    """入力（定数・シード・データ量など）とコードのバージョンからキャッシュキーを求める"""
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha256()
+    digest.update(code_version(script_path).encode('ascii'))
+    digest.update(payload.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _place(source, target):
+    """キャッシュのファイルを出力先へハードリンク（別ボリュームなどで不可ならコピー）"""
+    if os.path.lexists(target):
+        os.unlink(target)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+class GenerationCache:
+    """キー別ディレクトリに出力ファイルとマニフェストを保存するキャッシュ"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def lookup(self, key):
+        """キャッシュ済みならマニフェストを返す（ファイル欠損・サイズや sha256 の不一致はミス扱い）"""
+        entry = self._entry_dir(key)
+        try:
+            with open(os.path.join(entry, MANIFEST_NAME), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        for name, info in manifest['files'].items():
+            path = os.path.join(entry, name)
+            if not os.path.isfile(path) or os.path.getsize(path) != info['bytes']:
+                return None
+        # サイズが一致したものだけ内容を確かめる（壊れた・手で編集されたエントリを出力しない）
+        for name, info in manifest['files'].items():
+            if _sha256_file(os.path.join(entry, name)) != info['sha256']:
+                return None
+        return manifest
+
+    def restore(self, key, output_dir):
+        """キャッシュ済みの出力を output_dir に配置してマニフェストを返す（ミス時はNone）"""
+        manifest = self.lookup(key)
+        if manifest is None:
+            return None
+        os.makedirs(output_dir, exist_ok=True)
+        entry = self._entry_dir(key)
+        for name in manifest['files']:
+            _place(os.path.join(entry, name), os.path.join(output_dir, name))
+        return manifest
+
+    def save(self, key, output_dir, files, extra_files=()):
+        """output_dir の出力ファイル（ファイル名→行数）をキャッシュへ保存
+
+        extra_files は行数を持たない付随ファイル（集計JSONなど）のファイル名。
+        ファイル名は output_dir からの相対パス（サブディレクトリ内のファイルも可）。
+        """
+        entry = self._entry_dir(key)
+        staging = f'{entry}.tmp-{os.getpid()}'
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        manifest = {
+            'key': key,
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'files': {},
+        }
+        for name, rows in [*files.items(), *((name, None) for name in extra_files)]:
+            source = os.path.join(output_dir, name)
+            target = os.path.join(staging, name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, target)
+            manifest['files'][name] = {
+                'rows': rows,
+                'bytes': os.path.getsize(target),
+                'sha256': _sha256_file(target),
+            }
+        with open(os.path.join(staging, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        # 同時実行でも壊れたエントリを見せないよう、完成してから差し替える
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(staging, entry)
+        return manifest
+
+
+def manifest_rows(manifest):
+    """マニフェストからファイル名→行数を取り出す（付随ファイルは除く）"""
+    return {name: info['rows'] for name, info in manifest['files'].items() if info['rows'] is not None}
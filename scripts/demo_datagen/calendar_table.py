@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+生成期間の日付表（季節・曜日・祝日・イベント・需要の重み）
+
+期間内の日ごとの属性を一度だけ計算しておき、注文日は日付表の位置として抽選する。
+注文ごとの datetime 計算や月→季節の判定を表引きに置き換え、需要の重みを
+指定すれば季節・イベントの売上ピークも抽選速度を落とさずに再現できる。
+"""
+
+import bisect
+import itertools
+import random
+from datetime import timedelta
+
+from demo_datagen import vectorized
+
+# 月→季節
+MONTH_SEASONS = (None, 'winter', 'winter', 'spring', 'spring', 'spring', 'summer',
+                 'summer', 'summer', 'autumn', 'autumn', 'autumn', 'winter')
+
+# 固定日の祝日 (月, 日)（春分・秋分は近似日）
+FIXED_HOLIDAYS = {
+    (1, 1), (2, 11), (2, 23), (3, 20), (4, 29), (5, 3), (5, 4), (5, 5),
+    (8, 11), (9, 23), (11, 3), (11, 23),
+}
+# ハッピーマンデー (月, 第n月曜日)
+MONDAY_HOLIDAYS = {(1, 2), (7, 3), (9, 3), (10, 2)}
+
+# 購買イベント（ギフト需要が高まる日・期間）
+FIXED_EVENTS = {
+    (2, 14): 'バレンタイン',
+    (3, 14): 'ホワイトデー',
+    (12, 24): 'クリスマス',
+    (12, 25): 'クリスマス',
+    **{(7, d): 'お中元' for d in range(1, 16)},
+    **{(8, d): 'お盆' for d in range(13, 17)},
+    **{(12, d): 'お歳暮' for d in range(1, 21)},
+}
+# (月, 曜日, 第n週): イベント名（母の日は5月第2日曜、父の日は6月第3日曜）
+WEEKDAY_EVENTS = {(5, 6, 2): '母の日', (6, 6, 3): '父の日'}
+
+
+def next_weekday(date, weekdays):
+    """date 以降で最初に weekdays（月=0〜日=6）のいずれかに当たる日"""
+    return date + timedelta(days=min((w - date.weekday()) % 7 for w in weekdays))
+
+
+def default_demand_weight(calendar, index):
+    """標準的な需要の重み（週末・祝日・ギフトイベントで増加）"""
+    weight = 1.0
+    if calendar.weekdays[index] >= 5:
+        weight *= 1.2
+    if calendar.holidays[index]:
+        weight *= 1.2
+    if calendar.events[index]:
+        weight *= 1.5
+    return weight
+
+
+class DayCalendar:
+    """[start, end]（両端を含む）の日ごとの属性と需要の重みを持つ日付表
+
+    demand_weight(calendar, index) を指定すると日ごとの重みで抽選する。
+    未指定なら一様で、draw() は rng.randint(0, 日数-1) と同じ乱数の使い方になる。
+    """
+
+    def __init__(self, start, end, demand_weight=None):
+        num_days = (end - start).days + 1
+        if num_days <= 0:
+            raise ValueError('期間の終了日が開始日より前です')
+        self.start = start
+        self.dates = [start + timedelta(days=d) for d in range(num_days)]
+        self.months = [d.month for d in self.dates]
+        self.weekdays = [d.weekday() for d in self.dates]
+        self.seasons = [MONTH_SEASONS[m] for m in self.months]
+        self.holidays = [self._is_holiday(d) for d in self.dates]
+        self.events = [self._event_of(d) for d in self.dates]
+        if demand_weight is None:
+            self.weights = None
+            self.cdf = None
+        else:
+            self.weights = [demand_weight(self, i) for i in range(num_days)]
+            self.cdf = list(itertools.accumulate(self.weights))
+        self._np_cdf = None
+
+    def __len__(self):
+        return len(self.dates)
+
+    @staticmethod
+    def _is_holiday(date):
+        if (date.month, date.day) in FIXED_HOLIDAYS:
+            return True
+        return date.weekday() == 0 and (date.month, (date.day - 1) // 7 + 1) in MONDAY_HOLIDAYS
+
+    @staticmethod
+    def _event_of(date):
+        event = FIXED_EVENTS.get((date.month, date.day))
+        if event is None:
+            event = WEEKDAY_EVENTS.get((date.month, date.weekday(), (date.day - 1) // 7 + 1))
+        return event or ''
+
+    def index_of(self, date):
+        """日付→日付表の位置"""
+        return (date - self.start).days
+
+    def draw(self, rng=random):
+        """日付表の位置を1件抽選"""
+        if self.cdf is None:
+            return rng.randint(0, len(self.dates) - 1)
+        index = bisect.bisect_right(self.cdf, rng.random() * self.cdf[-1])
+        return min(index, len(self.dates) - 1)
+
+    def sample(self, rng, size):
+        """NumPy の乱数ジェネレータで日付表の位置を一括抽選（累積重みの逆関数法）"""
+        np = vectorized.require_numpy()
+        if self.cdf is None:
+            return rng.integers(0, len(self.dates), size=size)
+        if self._np_cdf is None:
+            self._np_cdf = np.array(self.cdf)
+        index = np.searchsorted(self._np_cdf, rng.random(size) * self._np_cdf[-1], side='right')
+        return np.minimum(index, len(self.dates) - 1)
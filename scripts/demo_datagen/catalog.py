@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+大規模な商品カタログ（最大100万SKU規模）のストリーミング生成
+
+商品は通し番号から「産地×品目×容量」の組み合わせで作り、バリアント（サイズ）行を
+PRODUCT_EXPORT_SCHEMA の列順で1行ずつ書き出す。Handle と SKU は通し番号を含むため
+重複せず、行を保持しないので件数に関わらずメモリ使用量は一定。
+ストア固有の商品（注文で参照されるもの）は base_products として先頭にそのまま出力する。
+"""
+
+import csv
+import random
+
+from demo_datagen.csvout import open_output
+from demo_datagen.schema import PRODUCT_EXPORT_SCHEMA
+
+# カテゴリ→品目
+CATEGORY_ITEMS = {
+    '海産物': ['いくら醤油漬け', 'ホタテ貝柱', '毛ガニ', 'たらこ', '鮭フレーク', '数の子', 'ししゃも', '真昆布'],
+    '農産物': ['じゃがいも', 'とうもろこし', '玉ねぎ', 'アスパラガス', 'かぼちゃ', 'メロン', '小豆', '黒豆'],
+    '乳製品': ['バター', 'チーズ', 'ヨーグルト', '牛乳', '生クリーム', 'アイスクリーム'],
+    'スイーツ': ['チーズケーキ', 'バウムクーヘン', 'ロールケーキ', '生チョコレート', 'クッキー', 'どら焼き'],
+    '加工品': ['ジンギスカン', 'スープカレー', 'ラーメン', 'ソーセージ', 'ベーコン', 'ハンバーグ'],
+}
+ORIGINS = ['北海道産', '十勝産', '富良野産', '函館産', '釧路産', '根室産', '網走産', '稚内産', '旭川産', '小樽産']
+AMOUNTS = ['200g', '300g', '500g', '1kg', '2kg', '3個入', '6個入', '12個入']
+
+# バリアント（サイズ）: (名前, SKUの記号, 価格倍率)
+SIZE_VARIANTS = [('小', 'S', 0.7), ('中', 'M', 1.0), ('大', 'L', 1.5)]
+VARIANT_RATE = 0.4  # サイズ違いのバリアントを持つ商品の割合
+
+# 商品ごとに変わらない列
+CATALOG_TEMPLATE = PRODUCT_EXPORT_SCHEMA.template({
+    'Published': 'TRUE',
+    'Variant Inventory Tracker': 'shopify',
+    'Variant Inventory Policy': 'deny',
+    'Variant Fulfillment Service': 'manual',
+    'Variant Requires Shipping': 'TRUE',
+    'Variant Taxable': 'TRUE',
+    'Gift Card': 'FALSE',
+    'Metafield: custom.user_type [single_line_text_field]': '一般',
+    'Status': 'active',
+})
+
+_CATEGORIES = list(CATEGORY_ITEMS)
+
+
+def _describe(product_no):
+    """通し番号→(カテゴリ, 産地, 品目, 容量)（組み合わせを順に巡回）"""
+    category = _CATEGORIES[product_no % len(_CATEGORIES)]
+    items = CATEGORY_ITEMS[category]
+    rest = product_no // len(_CATEGORIES)
+    item = items[rest % len(items)]
+    rest //= len(items)
+    origin = ORIGINS[rest % len(ORIGINS)]
+    amount = AMOUNTS[(rest // len(ORIGINS)) % len(AMOUNTS)]
+    return category, origin, item, amount
+
+
+def iter_catalog_rows(num_rows, rng=random, handle_prefix='cat', sku_prefix='CAT', vendor='デモ物産'):
+    """合成商品のバリアント行を num_rows 行生成（最後の商品はバリアントが途中で切れることがある）"""
+    emitted = 0
+    product_no = 0
+    while emitted < num_rows:
+        category, origin, item, amount = _describe(product_no)
+        product_no += 1
+        handle = f'{handle_prefix}-{product_no:07d}'
+        title = f'{origin} {item} {amount}（{sku_prefix}{product_no:07d}）'
+        base_price = rng.randrange(500, 20000, 100)
+        product = PRODUCT_EXPORT_SCHEMA.fill(CATALOG_TEMPLATE, {
+            'Handle': handle,
+            'Title': title,
+            'Body (HTML)': f'<p>{origin}の{item}をお届けします。</p>',
+            'Vendor': vendor,
+            'Product Category': f'ホーム&ガーデン > 食品 > {category}',
+            'Type': category,
+            'Tags': f'{origin},{category}',
+            'Variant Grams': rng.choice((200, 500, 1000, 2000)),
+            'SEO Title': f'{title} | {vendor}',
+            'SEO Description': f'{origin}の{item}（{amount}）。',
+            'Metafield: custom.food_product_form [single_line_text_field]': category,
+            'Metafield: seo.hidden.product_search_boost_queries [single_line_text_field]': f'{category},{origin}',
+        })
+        if rng.random() < VARIANT_RATE:
+            for size, code, multiplier in SIZE_VARIANTS[:num_rows - emitted]:
+                price = int(base_price * multiplier)
+                yield PRODUCT_EXPORT_SCHEMA.fill(product, {
+                    'Option1 Name': 'サイズ',
+                    'Option1 Value': size,
+                    'Variant SKU': f'{sku_prefix}{product_no:07d}-{code}',
+                    'Variant Price': price,
+                    'Variant Compare At Price': int(price * 1.2),
+                    'Metafield: custom.size [single_line_text_field]': size,
+                })
+                emitted += 1
+        else:
+            yield PRODUCT_EXPORT_SCHEMA.fill(product, {
+                'Variant SKU': f'{sku_prefix}{product_no:07d}',
+                'Variant Price': base_price,
+                'Variant Compare At Price': int(base_price * 1.2),
+            }, copy=False)
+            emitted += 1
+
+
+def write_catalog_csv(path, num_rows, base_products=(), seed=None, encoding='utf-8-sig', **options):
+    """base_products（列名→値の辞書）に続けて合成商品を出力し、合計 num_rows 行のCSVを書き出す
+
+    num_rows は base_products の行数以上であること。
+    options は iter_catalog_rows() の handle_prefix / sku_prefix / vendor。行数を返す。
+    """
+    base_products = list(base_products)
+    if num_rows < len(base_products):
+        raise ValueError(f'カタログの行数（{num_rows}）がストア固有の商品の行数（{len(base_products)}）より少なくなっています')
+    rng = random.Random(seed)
+    rows = 0
+    with open_output(path, encoding=encoding) as f:
+        writer = csv.writer(f)
+        writer.writerow(PRODUCT_EXPORT_SCHEMA.columns)
+        for product in base_products:
+            writer.writerow(PRODUCT_EXPORT_SCHEMA.from_dict(product))
+            rows += 1
+        for row in iter_catalog_rows(num_rows - rows, rng, **options):
+            writer.writerow(row)
+            rows += 1
+    return rows
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+注文CSVの書き出し
+
+行（ORDER_EXPORT_SCHEMA の列順のリスト）を csv.writer でストリーミングに書き出し、
+件数・売上は書き出し時の集計カウンタから求める。
+
+ファイル名が .gz / .zst で終わる場合は gzip / zstd で圧縮して書き出す（zstd は
+zstandard パッケージが必要）。圧縮ファイルへの書き出しでは、行をバッチにまとめて
+上限付きのキューで書き込みスレッドへ渡し、CSVの整形・圧縮・書き込みを生成と並行させる。
+追記やシャードの結合は新しい gzip メンバー / zstd フレームを末尾に足す形で行う
+（どちらも連結したまま1つのファイルとして読める）。
+"""
+
+import csv
+import gzip
+import io
+import os
+import queue
+import shutil
+import threading
+from contextlib import nullcontext
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard未導入環境
+    zstandard = None
+
+from demo_datagen.schema import ORDER_EXPORT_SCHEMA, ORDER_ID_INDEX, ORDER_TOTAL_INDEX
+
+# 圧縮形式→ファイル名の拡張子
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# 書き込みスレッドへ渡すバッチの行数と、キューに溜める最大バッチ数
+WRITER_BATCH_ROWS = 2_000
+WRITER_QUEUE_BATCHES = 8
+
+
+def compressed_name(name, compression=None):
+    """圧縮形式に応じた拡張子を付けたファイル名（compression=None ならそのまま）
+
+    zstd で zstandard が無い場合は、書き出しを始める前にここでエラーにする。
+    """
+    if compression is None:
+        return name
+    if compression == 'zstd':
+        require_zstandard()
+    return name + COMPRESSION_SUFFIXES[compression]
+
+
+def compression_of(path):
+    """ファイル名の拡張子から圧縮形式を判定（非圧縮なら None）"""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return compression
+    return None
+
+
+def require_zstandard():
+    """zstandard が無い場合は分かりやすいエラーにする"""
+    if zstandard is None:
+        raise RuntimeError('zstd 圧縮には zstandard が必要です（pip install zstandard）')
+    return zstandard
+
+
+def _open_compressed(path, mode, compression):
+    """圧縮ファイルをバイナリで開く（mode は 'w' / 'a' / 'r'）"""
+    if compression == 'gzip':
+        return gzip.open(path, mode + 'b', compresslevel=GZIP_LEVEL)
+    zstd = require_zstandard()
+    raw = open(path, mode + 'b')
+    if mode == 'r':
+        return zstd.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+    return zstd.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw)
+
+
+def new_counts():
+    """集計カウンタの初期値"""
+    return {'rows': 0, 'orders': 0, 'total': 0}
+
+
+def merge_counts(counts, other):
+    """集計カウンタを加算"""
+    for key, value in other.items():
+        counts[key] = counts.get(key, 0) + value
+    return counts
+
+
+def open_output(path, mode='w', encoding='utf-8-sig'):
+    """出力ファイルを開く
+
+    既存ファイルは先に削除する（キャッシュからハードリンクされたファイルを
+    上書きしてキャッシュ側まで書き換えないため）。
+    """
+    if os.path.lexists(path):
+        os.unlink(path)
+    compression = compression_of(path)
+    if compression is not None:
+        return io.TextIOWrapper(_open_compressed(path, 'w', compression), encoding=encoding, newline='')
+    return open(path, mode, newline='', encoding=encoding)
+
+
+def open_append(path, encoding='utf-8'):
+    """既存ファイルを追記用に開く（キャッシュとハードリンクされていれば先に複製して切り離す）"""
+    if os.stat(path).st_nlink > 1:
+        detached = f'{path}.detach'
+        shutil.copyfile(path, detached)
+        os.replace(detached, path)
+    compression = compression_of(path)
+    if compression is not None:
+        return io.TextIOWrapper(_open_compressed(path, 'a', compression), encoding=encoding, newline='')
+    return open(path, 'a', newline='', encoding=encoding)
+
+
+def open_input(path, encoding='utf-8-sig'):
+    """CSVを読み込み用に開く（.gz / .zst は展開しながら読む）"""
+    compression = compression_of(path)
+    if compression is not None:
+        return io.TextIOWrapper(_open_compressed(path, 'r', compression), encoding=encoding, newline='')
+    return open(path, newline='', encoding=encoding)
+
+
+class BackgroundCSVWriter:
+    """csv.writer と同じ writerow を持ち、整形・圧縮・書き込みを別スレッドで行う
+
+    行は batch_rows 行ずつ上限 queue_batches 個のキューへ渡すため、書き込みが
+    追いつかないときは生成側が待ち、メモリ使用量は一定に保たれる。
+    書き込みスレッドで起きた例外は writerow() / close() で呼び出し側へ送出する。
+    """
+
+    def __init__(self, f, batch_rows=WRITER_BATCH_ROWS, queue_batches=WRITER_QUEUE_BATCHES):
+        self._queue = queue.Queue(maxsize=queue_batches)
+        self._batch = []
+        self._batch_rows = batch_rows
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(f,), name='csv-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self, f):
+        writer = csv.writer(f)
+        try:
+            for batch in iter(self._queue.get, None):
+                writer.writerows(batch)
+        except BaseException as exc:
+            self._error = exc
+            # 生成側が put で止まらないよう、終了の合図まで読み捨てる
+            for _ in iter(self._queue.get, None):
+                pass
+
+    def _put(self, batch):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(batch)
+
+    def writerow(self, row):
+        self._batch.append(row)
+        if len(self._batch) >= self._batch_rows:
+            self._put(self._batch)
+            self._batch = []
+
+    def close(self):
+        """残りの行を書き出し、書き込みスレッドの終了を待つ"""
+        try:
+            if self._batch:
+                self._put(self._batch)
+                self._batch = []
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # 呼び出し側の例外を優先し、スレッドだけ止める
+            self._queue.put(None)
+            self._thread.join()
+
+
+def write_order_rows(f, rows, header=True, stats=None, background=False):
+    """注文行をファイルへ1行ずつ書き出し、集計カウンタを返す
+
+    stats（StatsCollector）を渡すと、書き出した行をそのまま集計する。
+    background=True なら書き込みを BackgroundCSVWriter のスレッドで行う。
+    """
+    counts = new_counts()
+    with (BackgroundCSVWriter(f) if background else nullcontext(csv.writer(f))) as writer:
+        if header:
+            writer.writerow(ORDER_EXPORT_SCHEMA.columns)
+        for row in rows:
+            writer.writerow(row)
+            if stats is not None:
+                stats.observe(row)
+            counts['rows'] += 1
+            if row[ORDER_ID_INDEX]:
+                counts['orders'] += 1
+                counts['total'] += row[ORDER_TOTAL_INDEX]
+    return counts
+
+
+def write_orders_csv(path, rows, encoding='utf-8-sig', stats=None):
+    """注文行をストリーミングでCSVへ書き出し、件数を集計して返す（圧縮時は書き込みスレッドを使う）"""
+    with open_output(path, encoding=encoding) as f:
+        return write_order_rows(f, rows, stats=stats, background=compression_of(path) is not None)
+
+
+def write_records_csv(path, records, encoding='utf-8-sig', fieldnames=None):
+    """辞書のリスト（顧客・商品）をCSVへ書き出し、件数を返す
+
+    列は fieldnames（未指定なら先頭の辞書のキー順）。records が空でも fieldnames を
+    指定すればヘッダーだけのCSVを書き出す。
+    """
+    if fieldnames is None:
+        if not records:
+            raise ValueError(f'書き出す行がなく、列名を決められません（fieldnames を指定してください）: {path}')
+        fieldnames = list(records[0].keys())
+    with open_output(path, encoding=encoding) as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(records)
+    return len(records)
+
+
+def append_orders_csv(path, rows, stats=None):
+    """注文行を既存CSVの末尾へヘッダーなしで追記し、追記分の件数を返す"""
+    with open_append(path) as f:
+        return write_order_rows(f, rows, header=False, stats=stats, background=compression_of(path) is not None)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+注文行の外部マージソート（Created at 順）
+
+生成順の注文行を注文単位（先頭行＋Id が空の追加明細行）にまとめ、buffer_rows 行ずつ
+メモリ上で並べ替えて一時ファイル（ラン）へ書き出し、最後に全ランを k-way マージする。
+メモリに載るのは buffer_rows 行とマージ中の各ランの先頭1注文だけで、1000万行規模でも
+メモリ使用量はほぼ一定。同じ日時の注文は生成順のまま（安定ソート）。
+
+日時は 'YYYY-MM-DD HH:MM:SS +0900' 固定の書式のため、文字列のまま比較する。
+ランは行の型（Total などの整数）を保つため pickle で保存する。
+"""
+
+import csv
+import heapq
+import os
+import pickle
+import tempfile
+from contextlib import ExitStack, closing, nullcontext
+
+from demo_datagen.csvout import BackgroundCSVWriter, compression_of, open_input, open_output
+from demo_datagen.orders import iter_order_groups
+from demo_datagen.schema import CREATED_AT_INDEX, ORDER_EXPORT_SCHEMA
+
+DEFAULT_BUFFER_ROWS = 100_000  # 注文行1行あたり約0.5KB（10万行で数十〜百数十MB程度）
+MAX_MERGE_FANIN = 64  # 一度に開くランの上限（超える場合は段階的にマージ）
+
+
+def _order_key(order):
+    return order[0][CREATED_AT_INDEX]
+
+
+def _write_run(orders, tmpdir, number):
+    path = os.path.join(tmpdir, f'run-{number:05d}.pickle')
+    with open(path, 'wb') as f:
+        for order in orders:
+            pickle.dump(order, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path):
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def _merge_runs(paths):
+    with ExitStack() as stack:
+        # 途中で止められてもランのファイルを閉じる
+        runs = [stack.enter_context(closing(_read_run(path))) for path in paths]
+        yield from heapq.merge(*runs, key=_order_key)
+
+
+def iter_sorted_orders(rows, buffer_rows=DEFAULT_BUFFER_ROWS, tmpdir=None):
+    """注文行を Created at 順に並べ替えて返す（注文の明細行は連続したまま）
+
+    buffer_rows 行を超えた分は tmpdir（未指定なら既定の一時ディレクトリ）へ
+    ランとして書き出す。全体が buffer_rows 行に収まる場合は一時ファイルを使わない。
+    """
+    if buffer_rows < 1:
+        raise ValueError('buffer_rows は1以上を指定してください')
+    with tempfile.TemporaryDirectory(prefix='demo-sort-', dir=tmpdir) as workdir:
+        runs = []
+        buffer = []
+        buffered_rows = 0
+        for order in iter_order_groups(rows):
+            buffer.append(order)
+            buffered_rows += len(order)
+            if buffered_rows >= buffer_rows:
+                buffer.sort(key=_order_key)
+                runs.append(_write_run(buffer, workdir, len(runs)))
+                buffer = []
+                buffered_rows = 0
+        buffer.sort(key=_order_key)
+        if not runs:
+            for order in buffer:
+                yield from order
+            return
+        if buffer:
+            runs.append(_write_run(buffer, workdir, len(runs)))
+        del buffer
+
+        # ランが多すぎる場合は先頭から MAX_MERGE_FANIN 個ずつまとめる（順序を保つため連続した範囲で）
+        number = len(runs)
+        while len(runs) > MAX_MERGE_FANIN:
+            merged = []
+            for start in range(0, len(runs), MAX_MERGE_FANIN):
+                group = runs[start:start + MAX_MERGE_FANIN]
+                merged.append(_write_run(_merge_runs(group), workdir, number))
+                number += 1
+                for path in group:
+                    os.unlink(path)
+            runs = merged
+        for order in _merge_runs(runs):
+            yield from order
+
+
+def sort_orders_csv(path, buffer_rows=DEFAULT_BUFFER_ROWS, encoding='utf-8-sig', tmpdir=None):
+    """書き出し済みの注文CSVを Created at 順に並べ替えて置き換え、行数を返す
+
+    圧縮CSV（.gz / .zst）は展開しながら読み、同じ形式で圧縮し直す。
+    """
+    directory, name = os.path.split(path)
+    sorted_path = os.path.join(directory, f'.sorting-{name}')
+    rows = 0
+    with open_input(path) as src:
+        reader = csv.reader(src)
+        if tuple(next(reader)) != ORDER_EXPORT_SCHEMA.columns:
+            raise ValueError(f'注文CSVの列が想定と異なります: {path}')
+        with open_output(sorted_path, encoding=encoding) as out, (
+                BackgroundCSVWriter(out) if compression_of(path) else nullcontext(csv.writer(out))) as writer:
+            writer.writerow(ORDER_EXPORT_SCHEMA.columns)
+            for row in iter_sorted_orders(reader, buffer_rows, tmpdir):
+                writer.writerow(row)
+                rows += 1
+    os.replace(sorted_path, path)
+    return rows
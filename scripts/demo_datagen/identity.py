@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+顧客番号から重複しない氏名・電話番号を作る
+
+顧客番号（0始まり）を鍵付きの全単射（Feistel ネットワーク＋サイクルウォーク）で
+電話番号の番号空間へ写すため、生成済みの値を集合で覚えなくても
+重複しない。1件あたり O(1) で、同じシード・名前空間からは常に同じ値になる。
+
+- 電話番号: 090/080/070 の3億通り（顧客3億人まで重複なし）
+- 氏名: 姓×名の組み合わせ（組み合わせ数までの顧客は全員異なる氏名）
+"""
+
+import hashlib
+import random
+
+LAST_NAMES = [
+    '佐藤', '鈴木', '高橋', '田中', '伊藤', '渡辺', '山本', '中村', '小林', '加藤',
+    '吉田', '山田', '佐々木', '山口', '松本', '井上', '木村', '林', '斎藤', '清水',
+    '山崎', '森', '池田', '橋本', '阿部', '石川', '山下', '中島', '石井', '小川',
+    '前田', '岡田', '長谷川', '藤田', '後藤', '近藤', '村上', '遠藤', '青木', '坂本',
+]
+FIRST_NAMES = [
+    '太郎', '次郎', '三郎', '健太', '翔太', '大輝', '拓也', '直樹', '健一', '誠',
+    '隆', '浩', '蓮', '湊', '悠真', '陽翔', '大和', '樹', '颯太', '和也',
+    '花子', '美咲', '愛', '彩', '舞', '優子', '真由美', '恵子', '幸子', '陽子',
+    '陽菜', '結衣', '凛', '葵', '芽依', '紬', 'さくら', '美桜', '莉子', '七海',
+]
+PHONE_PREFIXES = ['090', '080', '070']
+PHONE_NUMBERS_PER_PREFIX = 10 ** 8
+
+_MASK64 = (1 << 64) - 1
+
+
+class FeistelPermutation:
+    """[0, size) 上の鍵付き全単射
+
+    偶数ビット幅の Feistel ネットワークで 2^bits 上を並べ替え、size 以上の値は
+    範囲に入るまで繰り返し写す（サイクルウォーク）。bits は size の4倍未満に収まるため、
+    平均の繰り返し回数は数回で済む。
+    """
+
+    def __init__(self, size, key, rounds=4):
+        if size <= 0:
+            raise ValueError('size は正の値である必要があります')
+        bits = max(2, (size - 1).bit_length())
+        bits += bits % 2
+        self.size = size
+        self.half = bits // 2
+        self.mask = (1 << self.half) - 1
+        self.round_keys = [_derive(key, r) for r in range(rounds)]
+
+    def _encrypt(self, value):
+        half, mask = self.half, self.mask
+        left, right = value >> half, value & mask
+        for round_key in self.round_keys:
+            mixed = ((right ^ round_key) * 0x9E3779B97F4A7C15) & _MASK64
+            left, right = right, left ^ ((mixed ^ (mixed >> 29)) & mask)
+        return (left << half) | right
+
+    def __call__(self, index):
+        if not 0 <= index < self.size:
+            raise ValueError(f'番号 {index} が範囲外です（0〜{self.size - 1}）')
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+def _derive(*parts):
+    """文字列化した parts から64ビットの鍵を導出"""
+    digest = hashlib.sha256(':'.join(map(str, parts)).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+class IdentityGenerator:
+    """顧客番号→氏名・電話番号
+
+    seed と namespace（ストアなど）ごとに別の並べ替えになる。seed 未指定時は
+    random モジュールから鍵を引く（random.seed() 済みなら再現可能）。
+    """
+
+    def __init__(self, seed=None, namespace=''):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self._phones = FeistelPermutation(len(PHONE_PREFIXES) * PHONE_NUMBERS_PER_PREFIX,
+                                          _derive(seed, namespace, 'phone'))
+        self._names = FeistelPermutation(len(LAST_NAMES) * len(FIRST_NAMES), _derive(seed, namespace, 'name'))
+
+    def name(self, index):
+        """(姓, 名)"""
+        last, first = divmod(self._names(index % self._names.size), len(FIRST_NAMES))
+        return LAST_NAMES[last], FIRST_NAMES[first]
+
+    def phone(self, index):
+        """'090-1234-5678' 形式の携帯電話番号"""
+        prefix, number = divmod(self._phones(index), PHONE_NUMBERS_PER_PREFIX)
+        return f'{PHONE_PREFIXES[prefix]}-{number // 10000:04d}-{number % 10000:04d}'
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+注文CSVを注文単位で読む（ストリーミング）
+
+Shopify の orders_export 形式は1行＝1明細で、注文の先頭行にだけ Id が入り、
+2個目以降の明細は Id が空の追加明細行として続く。iter_orders() はこれを
+1注文ずつ Order（注文の列＋明細のリスト）にまとめて返す。保持するのは読み込み中の
+1注文だけなので、数GBのCSV（.gz / .zst も可）でもメモリ使用量は一定。
+
+列は見出しの名前で引くため、生成したCSVでも実データ（orders_export_6.csv）でも読める。
+明細ごとに値が変わる列（Lineitem * と Vendor）は明細に、それ以外は先頭行の値を注文に持つ。
+columns を指定すると、その列だけを取り出す。
+"""
+
+import csv
+from operator import itemgetter
+
+from demo_datagen.csvout import open_input
+from demo_datagen.schema import ORDER_ID_INDEX
+
+
+def is_item_column(name):
+    """明細ごとに値が変わる列か"""
+    return name.startswith('Lineitem ') or name == 'Vendor'
+
+
+def iter_order_groups(rows, id_index=ORDER_ID_INDEX):
+    """注文行を注文単位（行のリスト）にまとめる"""
+    order = None
+    for row in rows:
+        if row[id_index] or order is None:
+            if order is not None:
+                yield order
+            order = [row]
+        else:
+            order.append(row)
+    if order is not None:
+        yield order
+
+
+class Order:
+    """注文1件
+
+    order['Total'] のように注文の列を引き、items は明細（列名→値の辞書）のリスト。
+    値はCSVの文字列のまま。
+    """
+
+    __slots__ = ('fields', 'items')
+
+    def __init__(self, fields, items):
+        self.fields = fields
+        self.items = items
+
+    def __getitem__(self, name):
+        return self.fields[name]
+
+    def get(self, name, default=None):
+        return self.fields.get(name, default)
+
+    def __repr__(self):
+        return f'Order({self.fields!r}, items={len(self.items)})'
+
+
+def _projector(header, names):
+    """行から names の列だけを取り出して列名→値の辞書にする関数"""
+    if not names:
+        return lambda row: {}
+    getter = itemgetter(*(header.index(name) for name in names))
+    if len(names) == 1:
+        name = names[0]
+        return lambda row: {name: getter(row)}
+    return lambda row: dict(zip(names, getter(row)))
+
+
+def iter_orders(path, columns=None, encoding='utf-8-sig'):
+    """注文CSVを1注文ずつ Order にして返す
+
+    columns 未指定なら全列を読む。Id が空の行は直前の注文の追加明細として扱い、
+    Name 列があれば同じ注文番号であることを確かめる（並べ替えや連結の誤りを検出）。
+    """
+    with open_input(path, encoding) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        if 'Id' not in header:
+            raise ValueError(f'注文CSVに Id 列がありません: {path}')
+        if columns is None:
+            columns = header
+        else:
+            missing = [name for name in columns if name not in header]
+            if missing:
+                raise ValueError(f'注文CSVにない列です: {", ".join(missing)}')
+        order_fields = _projector(header, [name for name in columns if not is_item_column(name)])
+        item_fields = _projector(header, [name for name in columns if is_item_column(name)])
+        id_index = header.index('Id')
+        name_index = header.index('Name') if 'Name' in header else None
+
+        order = name = None
+        for row in reader:
+            if not row:
+                continue
+            if row[id_index]:
+                if order is not None:
+                    yield order
+                order = Order(order_fields(row), [item_fields(row)])
+                if name_index is not None:
+                    name = row[name_index]
+            elif order is None:
+                raise ValueError(f'先頭の行に注文の Id がありません: {path}')
+            elif name_index is not None and row[name_index] and row[name_index] != name:
+                raise ValueError(f'{reader.line_num}行目の追加明細の Name（{row[name_index]}）が注文 {name} と異なります: {path}')
+            else:
+                order.items.append(item_fields(row))
+        if order is not None:
+            yield order
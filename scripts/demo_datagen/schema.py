@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Shopify エクスポートCSVの固定列スキーマ
+
+行は列順どおりのリストで扱い、csv.writer でそのまま書き出す。
+注文ごとに変わらない値はテンプレート行に一度だけ埋めておき、
+注文・追加明細では変わる列だけを上書きする。
+"""
+
+
+class RowSchema:
+    """列順が固定されたCSVスキーマ"""
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.index = {name: i for i, name in enumerate(self.columns)}
+        if len(self.index) != len(self.columns):
+            raise ValueError('列名が重複しています')
+
+    def __len__(self):
+        return len(self.columns)
+
+    def template(self, values=None):
+        """指定列だけ値を埋め、残りを空文字にしたテンプレート行を作成"""
+        row = [''] * len(self.columns)
+        return self.fill(row, values or {}, copy=False)
+
+    def fill(self, base, values, copy=True):
+        """base 行をコピーし、values（列名→値）の列だけを上書きした行を返す"""
+        row = base.copy() if copy else base
+        index = self.index
+        for name, value in values.items():
+            row[index[name]] = value
+        return row
+
+    def as_dict(self, row):
+        """行を列名→値の辞書に変換（デバッグ・互換用）"""
+        return dict(zip(self.columns, row))
+
+    def from_dict(self, values):
+        """列名→値の辞書から行を作成（未指定の列は空文字）"""
+        return [values.get(name, '') for name in self.columns]
+
+
+# Shopify 注文エクスポート（orders_export 形式、1行＝1明細）
+ORDER_EXPORT_SCHEMA = RowSchema([
+    'Name', 'Email', 'Financial Status', 'Paid at', 'Fulfillment Status', 'Fulfilled at',
+    'Currency', 'Subtotal', 'Shipping', 'Taxes', 'Total', 'Discount Code', 'Discount Amount',
+    'Shipping Method', 'Created at', 'Lineitem quantity', 'Lineitem name', 'Lineitem price',
+    'Lineitem compare at price', 'Lineitem sku', 'Lineitem requires shipping',
+    'Lineitem taxable', 'Lineitem fulfillment status', 'Billing Name', 'Billing Street',
+    'Billing Address1', 'Billing Address2', 'Billing Company', 'Billing City', 'Billing Zip',
+    'Billing Province', 'Billing Country', 'Billing Phone', 'Shipping Name', 'Shipping Street',
+    'Shipping Address1', 'Shipping Address2', 'Shipping Company', 'Shipping City',
+    'Shipping Zip', 'Shipping Province', 'Shipping Country', 'Shipping Phone', 'Notes',
+    'Cancelled at', 'Payment Method', 'Payment Reference', 'Refunded Amount', 'Vendor',
+    'Outstanding Balance', 'Employee', 'Location', 'Device ID', 'Id', 'Tags', 'Risk Level',
+    'Source', 'Lineitem discount', 'Tax 1 Name', 'Tax 1 Value', 'Tax 2 Name', 'Tax 2 Value',
+    'Tax 3 Name', 'Tax 3 Value', 'Tax 4 Name', 'Tax 4 Value', 'Tax 5 Name', 'Tax 5 Value',
+    'Phone', 'Receipt Number', 'Duties', 'Billing Province Name', 'Shipping Province Name',
+    'Payment ID', 'Payment Terms Name', 'Next Payment Due At', 'Payment References',
+    'Customer ID',
+])
+
+# 3ストア共通の固定値（空文字の列は省略）
+ORDER_EXPORT_DEFAULTS = {
+    'Financial Status': 'paid',
+    'Fulfillment Status': 'fulfilled',
+    'Currency': 'JPY',
+    'Discount Amount': 0,
+    'Shipping Method': '宅配便',
+    'Lineitem requires shipping': 'true',
+    'Lineitem taxable': 'true',
+    'Lineitem fulfillment status': 'fulfilled',
+    'Billing Country': '日本',
+    'Shipping Country': '日本',
+    'Refunded Amount': 0,
+    'Outstanding Balance': 0,
+    'Risk Level': 'Low',
+    'Source': 'web',
+    'Lineitem discount': 0,
+    'Tax 1 Name': '消費税 10%',
+}
+
+# Shopify 商品エクスポート（products_export 形式、1行＝1バリアント）
+PRODUCT_EXPORT_SCHEMA = RowSchema([
+    'Handle', 'Title', 'Body (HTML)', 'Vendor', 'Product Category', 'Type', 'Tags', 'Published',
+    'Option1 Name', 'Option1 Value', 'Option2 Name', 'Option2 Value', 'Option3 Name',
+    'Option3 Value', 'Variant SKU', 'Variant Grams', 'Variant Inventory Tracker',
+    'Variant Inventory Policy', 'Variant Fulfillment Service', 'Variant Price',
+    'Variant Compare At Price', 'Variant Requires Shipping', 'Variant Taxable', 'Variant Barcode',
+    'Image Src', 'Image Position', 'Image Alt Text', 'Gift Card', 'SEO Title', 'SEO Description',
+    'Google Shopping / Google Product Category',
+    'Metafield: custom.function [single_line_text_field]',
+    'Metafield: custom.material [single_line_text_field]',
+    'Metafield: custom.size [single_line_text_field]',
+    'Metafield: custom.color_pattern [single_line_text_field]',
+    'Metafield: custom.food_product_form [single_line_text_field]',
+    'Metafield: custom.user_type [single_line_text_field]',
+    'Metafield: custom.complementary_products [single_line_text_field]',
+    'Metafield: custom.related_products [single_line_text_field]',
+    'Metafield: custom.related_products_display [single_line_text_field]',
+    'Metafield: seo.hidden.product_search_boost_queries [single_line_text_field]',
+    'Status',
+])
+
+# 集計でよく参照する列位置
+ORDER_ID_INDEX = ORDER_EXPORT_SCHEMA.index['Id']
+ORDER_TOTAL_INDEX = ORDER_EXPORT_SCHEMA.index['Total']
+CREATED_AT_INDEX = ORDER_EXPORT_SCHEMA.index['Created at']
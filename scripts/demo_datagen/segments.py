@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+顧客セグメントインデックス
+
+顧客タグ（'VIP,リピーター' 形式）からセグメント別の顧客リストを一度だけ構築し、
+注文ごとの顧客抽選を O(1) で行う。
+"""
+
+import random
+
+
+class SegmentIndex:
+    """タグ別の顧客リストを保持するインデックス"""
+
+    def __init__(self, customers, tag_field='Tags'):
+        self._customers = customers
+        self._tag_field = tag_field
+        self._members = {}
+        for customer in customers:
+            for tag in customer[tag_field].split(','):
+                self._members.setdefault(tag, []).append(customer)
+
+    def __len__(self):
+        return len(self._customers)
+
+    def members(self, *tags):
+        """いずれかのタグを持つ顧客リストを返す（元の顧客順を維持）"""
+        key = tags[0] if len(tags) == 1 else tags
+        if key not in self._members:
+            # 複数タグの和集合は初回のみ構築してキャッシュ
+            wanted = set(tags)
+            self._members[key] = [
+                c for c in self._customers
+                if wanted.intersection(c[self._tag_field].split(','))
+            ]
+        return self._members[key]
+
+    def choice(self, *tags, rng=random):
+        """セグメントから顧客を1人抽選（該当なしの場合はNone）"""
+        members = self.members(*tags)
+        if not members:
+            return None
+        return rng.choice(members)
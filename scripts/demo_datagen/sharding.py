@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+マルチプロセスによるシャード分割生成
+
+注文番号の範囲を固定サイズのシャードに分け、シャードごとにマスターシードから
+導出した乱数系列で生成する。シャード境界とシードはワーカー数に依存しないため、
+出力はワーカー数に関わらずバイト単位で同一になる。
+
+圧縮出力（.gz / .zst）ではシャードごとにワーカーで圧縮し、gzip メンバー / zstd フレームの
+連結として結合する（圧縮も並列に行われる）。
+"""
+
+import hashlib
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+
+from demo_datagen.csvout import (
+    compressed_name, compression_of, merge_counts, new_counts, open_output, write_order_rows,
+)
+
+DEFAULT_SHARD_SIZE = 50_000
+
+# ワーカープロセス内で共有する生成コンテキスト（顧客リストなど）
+_context = None
+
+
+def shard_seed(master_seed, shard_index):
+    """マスターシードとシャード番号からシャード用のシードを導出"""
+    digest = hashlib.sha256(f'{master_seed}:{shard_index}'.encode('ascii')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def plan_shards(total, shard_size=DEFAULT_SHARD_SIZE):
+    """(シャード番号, 開始位置, 終了位置) のリストを返す"""
+    return [
+        (index, start, min(start + shard_size, total))
+        for index, start in enumerate(range(0, total, shard_size))
+    ]
+
+
+def _init_worker(context):
+    global _context
+    _context = context
+
+
+def _write_shard(task):
+    make_rows, index, start, stop, seed, tmpdir, compression, stats = task
+    path = os.path.join(tmpdir, compressed_name(f'shard-{index:05d}.csv', compression))
+    with open_output(path, encoding='utf-8') as f:
+        counts = write_order_rows(f, make_rows(_context, start, stop, seed), header=False, stats=stats,
+                                  background=compression is not None)
+    return index, path, counts, stats
+
+
+def write_sharded_orders_csv(path, make_rows, context, total, seed=None, workers=None,
+                             shard_size=DEFAULT_SHARD_SIZE, encoding='utf-8-sig', stats=None):
+    """注文をシャード分割して並列生成し、1つのCSVへ結合する
+
+    make_rows(context, start, stop, seed) は注文番号 [start, stop) の行を返す
+    モジュールレベルの関数（ワーカーへ渡すためpickle可能であること）。
+    encoding はヘッダー行の書き出しに使う（utf-8-sig ならBOM付き、本文は常にUTF-8）。
+    path が .gz / .zst で終わる場合はシャードごとに圧縮して結合する。
+    stats（StatsCollector）を渡すと、シャードごとの集計を stats に合算する。
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 63)
+    compression = compression_of(path)
+    tasks = []
+    with tempfile.TemporaryDirectory(prefix='demo-shards-') as tmpdir:
+        for index, start, stop in plan_shards(total, shard_size):
+            tasks.append((make_rows, index, start, stop, shard_seed(seed, index), tmpdir, compression,
+                          stats.spawn() if stats is not None else None))
+
+        if workers == 1:
+            _init_worker(context)
+            results = [_write_shard(task) for task in tasks]
+        else:
+            with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(context,)) as pool:
+                results = pool.map(_write_shard, tasks, chunksize=1)
+
+        # シャード番号順に結合
+        results.sort(key=lambda r: r[0])
+        counts = new_counts()
+        with open_output(path, encoding=encoding) as out:
+            write_order_rows(out, [])
+        with open(path, 'ab') as out:
+            for _, shard_path, shard_counts, shard_stats in results:
+                with open(shard_path, 'rb') as f:
+                    shutil.copyfileobj(f, out)
+                merge_counts(counts, shard_counts)
+                if stats is not None:
+                    stats.merge(shard_stats)
+    return counts
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""
+生成データをローカルの SQLite（分析DBのミラー）へ一括投入する
+
+C# のインポート（ShopifyDataAnonymizer の ImportService）を通さずに、生成済みの
+顧客・商品・注文CSVを backend の Customers / Products / ProductVariants / Orders /
+OrderItems と同じ形のテーブルへ直接書き込む。休眠顧客・購入回数分析のクエリや
+インデックスをローカルで試すためのもので、列の対応は ImportService に合わせている。
+
+- 投入は1トランザクションで、BATCH_ROWS 行ずつ executemany する（明細の商品側の列は最後に SKU で一括補完）
+- インデックスは投入前に削除し、最後に作り直す（DatabaseModels.cs と 2026-01-22 の追加分）
+- Id は投入順の連番。同じ StoreId の既存データは削除してから入れ直す
+- 顧客の TotalOrders / TotalSpent / LastOrderDate / CustomerSegment は注文から集計する
+- 日時は 'YYYY-MM-DD HH:MM:SS'（CSVの日本時間のまま、オフセットは除く）
+"""
+
+import csv
+import os
+import sqlite3
+
+from demo_datagen.csvout import COMPRESSION_SUFFIXES, open_input
+
+BATCH_ROWS = 50_000
+
+TABLES = {
+    'Customers': '''
+        Id INTEGER PRIMARY KEY, StoreId INTEGER NOT NULL, ShopifyCustomerId TEXT,
+        FirstName TEXT, LastName TEXT, Email TEXT, Phone TEXT, Company TEXT, City TEXT,
+        ProvinceCode TEXT, CountryCode TEXT, AddressPhone TEXT,
+        AcceptsEmailMarketing INTEGER NOT NULL DEFAULT 0, AcceptsSMSMarketing INTEGER NOT NULL DEFAULT 0,
+        TotalSpent NUMERIC NOT NULL DEFAULT 0, TotalOrders INTEGER NOT NULL DEFAULT 0,
+        TaxExempt INTEGER NOT NULL DEFAULT 0, Tags TEXT, CompanyStoreName TEXT, Industry TEXT,
+        IsActive INTEGER NOT NULL DEFAULT 1, CreatedAt TEXT, UpdatedAt TEXT,
+        ShopifyCreatedAt TEXT, ShopifyUpdatedAt TEXT, SyncedAt TEXT, LastOrderDate TEXT,
+        CustomerSegment TEXT NOT NULL DEFAULT '新規顧客', OrdersCount INTEGER NOT NULL DEFAULT 0''',
+    'Products': '''
+        Id INTEGER PRIMARY KEY, StoreId INTEGER NOT NULL, Title TEXT NOT NULL, Handle TEXT,
+        ShopifyProductId TEXT, Description TEXT, Category TEXT, Vendor TEXT, ProductType TEXT,
+        InventoryQuantity INTEGER NOT NULL DEFAULT 0, CreatedAt TEXT, UpdatedAt TEXT,
+        ShopifyCreatedAt TEXT, ShopifyUpdatedAt TEXT, SyncedAt TEXT, IsActive INTEGER NOT NULL DEFAULT 1''',
+    'ProductVariants': '''
+        Id INTEGER PRIMARY KEY, ProductId INTEGER NOT NULL, ShopifyVariantId TEXT, Title TEXT, Sku TEXT,
+        Price NUMERIC NOT NULL DEFAULT 0, CompareAtPrice NUMERIC, InventoryQuantity INTEGER NOT NULL DEFAULT 0,
+        Option1Name TEXT, Option1Value TEXT, Option2Name TEXT, Option2Value TEXT,
+        Option3Name TEXT, Option3Value TEXT, Barcode TEXT, Weight NUMERIC, WeightUnit TEXT,
+        RequiresShipping INTEGER NOT NULL DEFAULT 1, Taxable INTEGER NOT NULL DEFAULT 1,
+        CreatedAt TEXT, UpdatedAt TEXT''',
+    'Orders': '''
+        Id INTEGER PRIMARY KEY, StoreId INTEGER NOT NULL, OrderNumber TEXT NOT NULL,
+        ShopifyOrderId TEXT, ShopifyCustomerId TEXT, Email TEXT, CustomerId INTEGER,
+        TotalPrice NUMERIC NOT NULL DEFAULT 0, SubtotalPrice NUMERIC NOT NULL DEFAULT 0,
+        TaxPrice NUMERIC NOT NULL DEFAULT 0, TotalTax NUMERIC NOT NULL DEFAULT 0,
+        Currency TEXT NOT NULL DEFAULT 'JPY', Status TEXT NOT NULL DEFAULT 'pending',
+        FinancialStatus TEXT, FulfillmentStatus TEXT, CreatedAt TEXT, UpdatedAt TEXT,
+        ShopifyCreatedAt TEXT, ShopifyUpdatedAt TEXT, ShopifyProcessedAt TEXT, SyncedAt TEXT,
+        IsTest INTEGER NOT NULL DEFAULT 0''',
+    'OrderItems': '''
+        Id INTEGER PRIMARY KEY, OrderId INTEGER NOT NULL, ProductId TEXT, ShopifyLineItemId TEXT,
+        ShopifyProductId TEXT, ShopifyVariantId TEXT, ProductTitle TEXT NOT NULL, Title TEXT,
+        ProductHandle TEXT, ProductVendor TEXT, ProductType TEXT, Sku TEXT, VariantTitle TEXT,
+        Price NUMERIC NOT NULL DEFAULT 0, CompareAtPrice NUMERIC, Quantity INTEGER NOT NULL DEFAULT 1,
+        TotalPrice NUMERIC NOT NULL DEFAULT 0, Option1Name TEXT, Option1Value TEXT, Option2Name TEXT,
+        Option2Value TEXT, Option3Name TEXT, Option3Value TEXT,
+        RequiresShipping INTEGER NOT NULL DEFAULT 1, Taxable INTEGER NOT NULL DEFAULT 1,
+        CreatedAt TEXT, UpdatedAt TEXT''',
+}
+
+# インデックス名 → 定義（投入後にまとめて作成）
+INDEXES = {
+    'IX_Customers_Email': 'Customers (Email)',
+    'IX_Customers_ShopifyCustomerId': 'Customers (ShopifyCustomerId)',
+    'IX_Customers_StoreId_Email': 'Customers (StoreId, Email)',
+    'IX_Customers_StoreId_ShopifyCustomerId': 'Customers (StoreId, ShopifyCustomerId)',
+    'IX_Customers_StoreId_TotalOrders': 'Customers (StoreId, TotalOrders)',
+    'IX_Products_StoreId_Title': 'Products (StoreId, Title)',
+    'IX_Products_Title': 'Products (Title)',
+    'IX_ProductVariants_ProductId': 'ProductVariants (ProductId)',
+    'IX_Orders_StoreId_OrderNumber': 'Orders (StoreId, OrderNumber)',
+    'IX_Orders_CustomerId_ShopifyProcessedAt': 'Orders (CustomerId, ShopifyProcessedAt DESC)',
+    'IX_Orders_StoreId_ShopifyProcessedAt': 'Orders (StoreId, ShopifyProcessedAt DESC)',
+    'IX_OrderItems_OrderId': 'OrderItems (OrderId)',
+}
+UNIQUE_INDEXES = {'IX_Orders_StoreId_OrderNumber'}
+
+# ImportService.GetOrderStatus() と同じ対応
+ORDER_STATUSES = {
+    'paid': 'completed', 'pending': 'pending', 'partially_paid': 'partially_paid', 'refunded': 'refunded',
+    'partially_refunded': 'partially_refunded', 'cancelled': 'cancelled', 'voided': 'voided',
+    'authorized': 'authorized',
+}
+
+
+def customer_segment(total_orders, total_spent):
+    """ImportService.ImportAnonymizedCustomers() と同じ顧客セグメント"""
+    if total_orders >= 10 or total_spent >= 100000:
+        return 'VIP顧客'
+    if total_orders >= 2:
+        return 'リピーター'
+    return '新規顧客'
+
+
+_FLAGS = {'yes': 1, 'true': 1, 'Yes': 1, 'True': 1, 'TRUE': 1}
+
+
+def _flag(value):
+    return _FLAGS.get(value, 0)
+
+
+def _number(value, default=0):
+    return float(value) if value else default
+
+
+def _timestamp(value):
+    return value[:19] or None
+
+
+def sibling_csvs(orders_path):
+    """注文CSVと同じディレクトリの顧客・商品CSV（orders → customers / products、無ければ None）"""
+    directory, name = os.path.split(orders_path)
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    paths = []
+    for kind in ('customers', 'products'):
+        path = os.path.join(directory, name.replace('orders', kind))
+        paths.append(path if path != orders_path and os.path.exists(path) else None)
+    return paths
+
+
+class SQLiteMirror:
+    """分析DBのミラーへの投入（with で開き、load_* の後に close() でインデックスを作る）"""
+
+    def __init__(self, path, store_id, batch_rows=BATCH_ROWS):
+        self.store_id = store_id
+        self.batch_rows = batch_rows
+        self.counts = dict.fromkeys(['customers', 'products', 'variants', 'orders', 'order_items'], 0)
+        self._customers = {}  # ShopifyCustomerId（無ければ Email）→ [Id, 注文数, 購入金額, 最終注文日]
+        self.db = sqlite3.connect(path, isolation_level=None)
+        for pragma in ('journal_mode = MEMORY', 'synchronous = OFF', 'temp_store = MEMORY', 'cache_size = -262144'):
+            self.db.execute(f'PRAGMA {pragma}')
+        for table, columns in TABLES.items():
+            self.db.execute(f'CREATE TABLE IF NOT EXISTS {table} ({columns})')
+        self.db.execute('BEGIN')
+        for name in INDEXES:
+            self.db.execute(f'DROP INDEX IF EXISTS {name}')
+        self._clear_store()
+        self._next_id = {table: self.db.execute(f'SELECT COALESCE(MAX(Id), 0) + 1 FROM {table}').fetchone()[0]
+                         for table in TABLES}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.db.execute('ROLLBACK')
+            self.db.close()
+
+    def _clear_store(self):
+        store = (self.store_id,)
+        self.db.execute('DELETE FROM OrderItems WHERE OrderId IN (SELECT Id FROM Orders WHERE StoreId = ?)', store)
+        self.db.execute('DELETE FROM Orders WHERE StoreId = ?', store)
+        self.db.execute('DELETE FROM ProductVariants WHERE ProductId IN '
+                        '(SELECT Id FROM Products WHERE StoreId = ?)', store)
+        self.db.execute('DELETE FROM Products WHERE StoreId = ?', store)
+        self.db.execute('DELETE FROM Customers WHERE StoreId = ?', store)
+
+    def _take_ids(self, table):
+        first = self._next_id[table]
+        self._next_id[table] += 1
+        return first
+
+    def _insert(self, table, columns, rows):
+        placeholders = ', '.join('?' * len(columns))
+        self.db.executemany(f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({placeholders})', rows)
+
+    def _insert_batches(self, table, columns, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_rows:
+                self._insert(table, columns, batch)
+                batch = []
+        if batch:
+            self._insert(table, columns, batch)
+
+    def load_customers(self, path):
+        """顧客CSV（Shopify の顧客エクスポート形式）を投入"""
+        columns = ('Id', 'StoreId', 'ShopifyCustomerId', 'FirstName', 'LastName', 'Email', 'Phone', 'Company',
+                   'City', 'ProvinceCode', 'CountryCode', 'AcceptsEmailMarketing', 'AcceptsSMSMarketing',
+                   'TotalSpent', 'TotalOrders', 'OrdersCount', 'TaxExempt', 'Tags', 'CompanyStoreName',
+                   'Industry', 'CustomerSegment', 'CreatedAt', 'UpdatedAt')
+
+        def rows():
+            with open_input(path) as f:
+                for record in csv.DictReader(f):
+                    customer_id = self._take_ids('Customers')
+                    key = record['Customer ID'] or record['Email']
+                    self._customers[key] = [customer_id, 0, 0, None]
+                    spent, orders = _number(record['Total Spent']), int(_number(record['Total Orders']))
+                    yield (customer_id, self.store_id, record['Customer ID'] or None,
+                           record['First Name'] or 'Unknown', record['Last Name'] or 'Customer',
+                           record['Email'] or f"unknown{record['Customer ID']}@example.com",
+                           record['Phone'] or None, record['Company'] or None, record['City'] or None,
+                           record['Province Code'] or None, record['Country Code'] or None,
+                           _flag(record['Accepts Email Marketing']), _flag(record['Accepts SMS Marketing']),
+                           spent, orders, orders, _flag(record['Tax Exempt']), record['Tags'] or None,
+                           record['Company / 店舗名'] or None, record['Industry / 業種名'] or None,
+                           customer_segment(orders, spent),
+                           _timestamp(record['Created At']), _timestamp(record['Updated At']))
+                    self.counts['customers'] += 1
+
+        self._insert_batches('Customers', columns, rows())
+
+    def load_products(self, path):
+        """商品CSV（1行＝1バリアント、同じ Handle の行が1商品）を投入"""
+        product_columns = ('Id', 'StoreId', 'Title', 'Handle', 'Description', 'Category', 'Vendor',
+                           'ProductType', 'InventoryQuantity', 'IsActive')
+        variant_columns = ('Id', 'ProductId', 'Title', 'Sku', 'Price', 'CompareAtPrice', 'InventoryQuantity',
+                           'Option1Name', 'Option1Value', 'Option2Name', 'Option2Value', 'Option3Name',
+                           'Option3Value', 'Barcode', 'Weight', 'WeightUnit', 'RequiresShipping', 'Taxable')
+        products, variants = [], []
+        handles = {}
+        with open_input(path) as f:
+            for record in csv.DictReader(f):
+                handle = record['Handle']
+                product_id = handles.get(handle)
+                if product_id is None:
+                    product_id = handles[handle] = self._take_ids('Products')
+                    products.append((product_id, self.store_id, record['Title'], handle,
+                                     record['Body (HTML)'] or None, record['Product Category'] or None,
+                                     record['Vendor'] or None, record['Type'] or None, 100,
+                                     int(record['Status'] in ('', 'active'))))
+                    self.counts['products'] += 1
+                options = [record[f'Option{n} {part}'] or None for n in (1, 2, 3) for part in ('Name', 'Value')]
+                title = ' / '.join(value for value in options[1::2] if value) or None
+                compare_at = record['Variant Compare At Price']
+                grams = record['Variant Grams']
+                variants.append((self._take_ids('ProductVariants'), product_id, title, record['Variant SKU'] or None,
+                                 _number(record['Variant Price']), float(compare_at) if compare_at else None, 100,
+                                 *options, record['Variant Barcode'] or None,
+                                 float(grams) / 1000 if grams else None, 'kg',
+                                 _flag(record['Variant Requires Shipping']), _flag(record['Variant Taxable'])))
+                self.counts['variants'] += 1
+                if len(variants) >= self.batch_rows:
+                    self._insert('Products', product_columns, products)
+                    self._insert('ProductVariants', variant_columns, variants)
+                    products, variants = [], []
+        self._insert('Products', product_columns, products)
+        self._insert('ProductVariants', variant_columns, variants)
+
+    def load_orders(self, path):
+        """注文CSV（Shopify の注文エクスポート形式、追加明細行は Id が空）を投入"""
+        order_columns = ('Id', 'StoreId', 'OrderNumber', 'ShopifyCustomerId', 'Email', 'CustomerId',
+                         'TotalPrice', 'SubtotalPrice', 'TaxPrice', 'TotalTax', 'Currency', 'Status',
+                         'FinancialStatus', 'FulfillmentStatus', 'CreatedAt', 'UpdatedAt',
+                         'ShopifyCreatedAt', 'ShopifyProcessedAt')
+        # 商品側の列は最後に SKU で一括補完する（1行あたりのバインドする値を減らすため）
+        item_columns = ('OrderId', 'ProductTitle', 'Sku', 'Price', 'CompareAtPrice', 'Quantity', 'TotalPrice',
+                        'RequiresShipping', 'Taxable', 'CreatedAt', 'UpdatedAt')
+        first_item_id = self._next_id['OrderItems']
+        customers, flags = self._customers, _FLAGS
+        orders, items = [], []
+        with open_input(path) as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            (order_number, email, financial, fulfillment, currency, subtotal, taxes, total, created_at,
+             quantity, name, price, compare_at, sku, requires_shipping, taxable, shopify_customer_id) = (
+                header.index(column) for column in (
+                    'Id', 'Email', 'Financial Status', 'Fulfillment Status', 'Currency', 'Subtotal', 'Taxes',
+                    'Total', 'Created at', 'Lineitem quantity', 'Lineitem name', 'Lineitem price',
+                    'Lineitem compare at price', 'Lineitem sku', 'Lineitem requires shipping',
+                    'Lineitem taxable', 'Customer ID'))
+            order_id = placed = None
+            next_order_id = self._next_id['Orders']
+            for row in reader:
+                if row[order_number]:
+                    # 注文の先頭行（追加明細行は Id が空で、直前の注文に続く）
+                    if len(items) >= self.batch_rows:
+                        self._flush_orders(order_columns, orders, item_columns, items)
+                        orders, items = [], []
+                    order_id = next_order_id
+                    next_order_id += 1
+                    placed = _timestamp(row[created_at])
+                    amount = _number(row[total])
+                    key = row[shopify_customer_id] or row[email]
+                    customer = customers.get(key)
+                    if customer is None and key:
+                        # 顧客CSVに無い顧客（store2 など）は注文から最小限の行を作る
+                        customer = customers[key] = [self._take_ids('Customers'), 0, 0, None,
+                                                     row[shopify_customer_id] or None, row[email] or None]
+                    if customer is not None:
+                        customer[1] += 1
+                        customer[2] += amount
+                        if customer[3] is None or placed > customer[3]:
+                            customer[3] = placed
+                    orders.append((order_id, self.store_id, row[order_number], row[shopify_customer_id] or None,
+                                   row[email] or None, customer[0] if customer else None, amount,
+                                   _number(row[subtotal]), _number(row[taxes]), _number(row[taxes]),
+                                   row[currency] or 'JPY', ORDER_STATUSES.get(row[financial].lower(), 'pending'),
+                                   row[financial] or None, row[fulfillment] or None,
+                                   placed, placed, placed, placed))
+                elif order_id is None:
+                    raise ValueError(f'先頭の行に注文の Id がありません: {path}')
+                if not row[name]:
+                    continue
+                count = int(row[quantity] or 1)
+                unit = float(row[price] or 0)
+                items.append((order_id, row[name], row[sku] or None, unit,
+                              float(row[compare_at]) if row[compare_at] else None, count, unit * count,
+                              flags.get(row[requires_shipping], 0), flags.get(row[taxable], 0), placed, placed))
+        self._flush_orders(order_columns, orders, item_columns, items)
+        self._next_id['Orders'] = next_order_id
+        self._fill_item_products(first_item_id)
+
+    def _flush_orders(self, order_columns, orders, item_columns, items):
+        self._insert('Orders', order_columns, orders)
+        self._insert('OrderItems', item_columns, items)
+        self.counts['orders'] += len(orders)
+        self.counts['order_items'] += len(items)
+
+    def _fill_item_products(self, first_item_id):
+        """明細の商品ID・Handle・Vendor・Type・バリアント名・オプションを SKU から補完"""
+        columns = ('ProductHandle', 'ProductVendor', 'ProductType', 'VariantTitle', 'Option1Name', 'Option1Value',
+                   'Option2Name', 'Option2Value', 'Option3Name', 'Option3Value')
+        self.db.execute(f'''
+            UPDATE OrderItems SET ProductId = CAST(pv.ProductId AS TEXT),
+                {', '.join(f'{column} = pv.{column}' for column in columns)}
+            FROM (SELECT v.Sku, v.ProductId, p.Handle AS ProductHandle, p.Vendor AS ProductVendor,
+                         p.ProductType, v.Title AS VariantTitle,
+                         {', '.join(f'v.{column}' for column in columns[4:])}
+                  FROM ProductVariants v JOIN Products p ON p.Id = v.ProductId
+                  WHERE p.StoreId = ? AND v.Sku IS NOT NULL GROUP BY v.Sku) AS pv
+            WHERE OrderItems.Id >= ? AND OrderItems.Sku = pv.Sku''', (self.store_id, first_item_id))
+
+    def _apply_customer_totals(self):
+        """注文から集計した購入回数・購入金額・最終注文日を顧客へ反映"""
+        updates, inserts = [], []
+        for customer in self._customers.values():
+            customer_id, orders, spent, last = customer[:4]
+            segment = customer_segment(orders, spent)
+            if len(customer) > 4:
+                inserts.append((customer_id, self.store_id, customer[4], 'Unknown', 'Customer',
+                                customer[5], spent, orders, orders, last, segment))
+            elif orders:
+                updates.append((spent, orders, orders, last, segment, customer_id))
+        self._insert('Customers', ('Id', 'StoreId', 'ShopifyCustomerId', 'FirstName', 'LastName', 'Email',
+                                   'TotalSpent', 'TotalOrders', 'OrdersCount', 'LastOrderDate',
+                                   'CustomerSegment'), inserts)
+        self.counts['customers'] += len(inserts)
+        self.db.executemany('UPDATE Customers SET TotalSpent = ?, TotalOrders = ?, OrdersCount = ?, '
+                            'LastOrderDate = ?, CustomerSegment = ? WHERE Id = ?', updates)
+
+    def close(self):
+        """顧客の集計値を反映してインデックスを作り、コミットする"""
+        self._apply_customer_totals()
+        for name, definition in INDEXES.items():
+            unique = 'UNIQUE ' if name in UNIQUE_INDEXES else ''
+            self.db.execute(f'CREATE {unique}INDEX {name} ON {definition}')
+        self.db.execute('COMMIT')
+        self.db.execute('PRAGMA analysis_limit = 1000')
+        self.db.execute('ANALYZE')
+        self.db.close()
+
+
+def load_store(db_path, store_id, orders_path, customers_path=None, products_path=None, batch_rows=BATCH_ROWS):
+    """顧客・商品・注文CSVを SQLite のミラーへ投入し、テーブル別の件数を返す"""
+    with SQLiteMirror(db_path, store_id, batch_rows) as mirror:
+        if customers_path:
+            mirror.load_customers(customers_path)
+        if products_path:
+            mirror.load_products(products_path)
+        mirror.load_orders(orders_path)
+    return mirror.counts
+
+
+def load_store_output(db_path, store_id, output_dir, files, batch_rows=BATCH_ROWS):
+    """生成スクリプトの run() の結果（出力先と files）から注文CSVを選び、同じ場所の顧客・商品CSVと一緒に投入"""
+    orders_name = next((name for name in files if 'orders' in name), None)
+    if orders_name is None:
+        raise ValueError(f'注文CSVが出力されていません: {output_dir}')
+    orders_path = os.path.join(output_dir, orders_name)
+    customers_path, products_path = sibling_csvs(orders_path)
+    return load_store(db_path, store_id, orders_path, customers_path, products_path, batch_rows)
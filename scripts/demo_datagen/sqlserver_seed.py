@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""
+SQL Server 向けの一括投入ファイル（シード）の出力
+
+生成済みの顧客・商品・注文CSVを、backend の SQL Server スキーマへ一括で入れるための
+ファイルに変換する。1行ずつの INSERT（C# のインポート）では数百万件の注文に
+数時間かかるため、次のどちらかの形式で出力する。
+
+- insert: 1文あたり BATCH_ROWS 行（SQL Server の上限の1000行）の複数行 INSERT を GO で区切った
+  スクリプト。既存の SQL スクリプトと同じく SSMS / sqlcmd でそのまま実行できる
+- bcp: UTF-8 のタブ区切りデータファイル（.dat）とフォーマットファイル（.fmt）。
+  BULK INSERT のスクリプト（SQLCMD モード）か、bcp コマンドで読み込む
+
+どちらもいったん作業用テーブル（Seed*）へ入れ、最後の 99_merge.sql で Customers /
+Products / ProductVariants / Orders / OrderItems へ移す。Id は SQL Server の IDENTITY で
+採番し、注文→顧客・明細→注文・バリアント→商品は自然キー（ShopifyCustomerId /
+OrderNumber / Handle）で結び付ける。同じ StoreId の既存データは入れ替える。
+日時はCSVの日本時間のまま（オフセットは除く）で、顧客の購入回数・購入金額・
+最終注文日・セグメントは投入した注文から集計する（sqlite_mirror と同じ）。
+"""
+
+import csv
+import os
+from decimal import Decimal
+
+from demo_datagen.csvout import open_input
+from demo_datagen.sqlite_mirror import ORDER_STATUSES, sibling_csvs
+
+BATCH_ROWS = 1000  # 複数行 INSERT の1文あたりの行数（SQL Server の上限）
+GO_STATEMENTS = 10  # GO で区切るまでの INSERT 文の数
+FORMATS = ('insert', 'bcp')
+SEED_DIR_NAME = 'sqlserver'
+
+# 作業用テーブル → 列と型（先頭に IDENTITY の SeedId が付く）
+SEED_TABLES = {
+    'SeedCustomers': [
+        ('ShopifyCustomerId', 'nvarchar(50)'), ('FirstName', 'nvarchar(100)'), ('LastName', 'nvarchar(100)'),
+        ('Email', 'nvarchar(255)'), ('Phone', 'nvarchar(20)'), ('Company', 'nvarchar(100)'),
+        ('City', 'nvarchar(50)'), ('ProvinceCode', 'nvarchar(10)'), ('CountryCode', 'nvarchar(10)'),
+        ('AcceptsEmailMarketing', 'bit'), ('AcceptsSMSMarketing', 'bit'), ('TaxExempt', 'bit'),
+        ('Tags', 'nvarchar(1000)'), ('CompanyStoreName', 'nvarchar(100)'), ('Industry', 'nvarchar(100)'),
+        ('CreatedAt', 'datetime2'), ('UpdatedAt', 'datetime2'),
+    ],
+    'SeedProducts': [
+        ('Handle', 'nvarchar(255)'), ('Title', 'nvarchar(255)'), ('Description', 'nvarchar(max)'),
+        ('Category', 'nvarchar(100)'), ('Vendor', 'nvarchar(100)'), ('ProductType', 'nvarchar(100)'),
+        ('IsActive', 'bit'), ('VariantTitle', 'nvarchar(255)'), ('Sku', 'nvarchar(100)'),
+        ('Price', 'decimal(18,2)'), ('CompareAtPrice', 'decimal(18,2)'),
+        ('Option1Name', 'nvarchar(100)'), ('Option1Value', 'nvarchar(100)'),
+        ('Option2Name', 'nvarchar(100)'), ('Option2Value', 'nvarchar(100)'),
+        ('Option3Name', 'nvarchar(100)'), ('Option3Value', 'nvarchar(100)'),
+        ('Barcode', 'nvarchar(100)'), ('Weight', 'decimal(18,2)'),
+        ('RequiresShipping', 'bit'), ('Taxable', 'bit'),
+    ],
+    'SeedOrders': [
+        ('OrderNumber', 'nvarchar(50)'), ('ShopifyCustomerId', 'nvarchar(50)'), ('Email', 'nvarchar(255)'),
+        ('TotalPrice', 'decimal(18,2)'), ('SubtotalPrice', 'decimal(18,2)'), ('TaxPrice', 'decimal(18,2)'),
+        ('Currency', 'nvarchar(50)'), ('Status', 'nvarchar(50)'), ('FinancialStatus', 'nvarchar(50)'),
+        ('FulfillmentStatus', 'nvarchar(50)'), ('CreatedAt', 'datetime2'),
+    ],
+    'SeedOrderItems': [
+        ('OrderNumber', 'nvarchar(50)'), ('ProductTitle', 'nvarchar(255)'), ('Sku', 'nvarchar(100)'),
+        ('Price', 'decimal(18,2)'), ('CompareAtPrice', 'decimal(18,2)'), ('Quantity', 'int'),
+        ('TotalPrice', 'decimal(18,2)'), ('RequiresShipping', 'bit'), ('Taxable', 'bit'),
+    ],
+}
+
+_FLAGS = {'yes': 1, 'true': 1, 'Yes': 1, 'True': 1, 'TRUE': 1}
+
+
+def _flag(value):
+    return _FLAGS.get(value, 0)
+
+
+def _decimal(value):
+    return Decimal(value) if value else None
+
+
+def _timestamp(value):
+    # datetime2 へ曖昧さなく変換できる ISO 8601 形式
+    return value[:10] + 'T' + value[11:19] if value else None
+
+
+def _text(value):
+    return value or None
+
+
+class InsertScriptWriter:
+    """作業用テーブルへの複数行 INSERT スクリプト（BATCH_ROWS 行ごとに1文）"""
+
+    def __init__(self, directory, number, table, batch_rows=BATCH_ROWS):
+        self.path = os.path.join(directory, f'{number:02d}_{table}.sql')
+        self.table = table
+        self.rows = 0
+        self._head = f'INSERT INTO dbo.{table} ({", ".join(name for name, _ in SEED_TABLES[table])}) VALUES\n'
+        self._batch_rows = batch_rows
+        self._batch = []
+        self._statements = 0
+        self._f = open(self.path, 'w', encoding='utf-8-sig', newline='\r\n')
+        self._f.write(f'-- {table} への投入（demo_datagen.sqlserver_seed が生成）\nSET NOCOUNT ON;\nGO\n')
+
+    @staticmethod
+    def _literal(value):
+        if value is None:
+            return 'NULL'
+        if isinstance(value, str):
+            return "N'" + value.replace("'", "''") + "'"
+        return str(value)
+
+    def writerow(self, row):
+        self._batch.append('(' + ', '.join(map(self._literal, row)) + ')')
+        self.rows += 1
+        if len(self._batch) >= self._batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self._batch:
+            return
+        self._f.write(self._head + ',\n'.join(self._batch) + ';\n')
+        self._batch = []
+        self._statements += 1
+        if self._statements % GO_STATEMENTS == 0:
+            self._f.write('GO\n')
+
+    def close(self):
+        self._flush()
+        self._f.write('GO\n')
+        self._f.close()
+        return [self.path]
+
+
+class BcpDataWriter:
+    """bcp / BULK INSERT 用の UTF-8 タブ区切りデータファイルとフォーマットファイル"""
+
+    def __init__(self, directory, number, table, batch_rows=BATCH_ROWS):
+        self.path = os.path.join(directory, f'{table}.dat')
+        self.format_path = os.path.join(directory, f'{table}.fmt')
+        self.table = table
+        self.rows = 0
+        self._f = open(self.path, 'w', encoding='utf-8', newline='')
+
+    @staticmethod
+    def _field(value):
+        if value is None:
+            return ''
+        if isinstance(value, str):
+            # 区切り文字（タブ・改行）はデータに含められないため空白に置き換える
+            return value.replace('\t', ' ').replace('\r', ' ').replace('\n', ' ')
+        return str(value)
+
+    def writerow(self, row):
+        self._f.write('\t'.join(map(self._field, row)) + '\r\n')
+        self.rows += 1
+
+    def close(self):
+        self._f.close()
+        columns = SEED_TABLES[self.table]
+        lines = ['14.0', str(len(columns))]
+        for position, (name, _) in enumerate(columns, 1):
+            terminator = r'\r\n' if position == len(columns) else r'\t'
+            # サーバー側の列番号は SeedId（1列目）の次から
+            lines.append(f'{position}\tSQLCHAR\t0\t0\t"{terminator}"\t{position + 1}\t{name}\t""')
+        with open(self.format_path, 'w', encoding='ascii', newline='\r\n') as f:
+            f.write('\n'.join(lines) + '\n')
+        return [self.path, self.format_path]
+
+
+WRITERS = {'insert': InsertScriptWriter, 'bcp': BcpDataWriter}
+
+
+def iter_customer_rows(path):
+    """顧客CSV → SeedCustomers の行"""
+    with open_input(path) as f:
+        for record in csv.DictReader(f):
+            yield (_text(record['Customer ID']), record['First Name'] or 'Unknown',
+                   record['Last Name'] or 'Customer',
+                   record['Email'] or f"unknown{record['Customer ID']}@example.com",
+                   _text(record['Phone']), _text(record['Company']), _text(record['City']),
+                   _text(record['Province Code']), _text(record['Country Code']),
+                   _flag(record['Accepts Email Marketing']), _flag(record['Accepts SMS Marketing']),
+                   _flag(record['Tax Exempt']), _text(record['Tags']), _text(record['Company / 店舗名']),
+                   _text(record['Industry / 業種名']), _timestamp(record['Created At']),
+                   _timestamp(record['Updated At']))
+
+
+def iter_product_rows(path):
+    """商品CSV（1行＝1バリアント）→ SeedProducts の行"""
+    with open_input(path) as f:
+        for record in csv.DictReader(f):
+            options = [_text(record[f'Option{n} {part}']) for n in (1, 2, 3) for part in ('Name', 'Value')]
+            grams = record['Variant Grams']
+            yield (record['Handle'], record['Title'], _text(record['Body (HTML)']),
+                   _text(record['Product Category']), _text(record['Vendor']), _text(record['Type']),
+                   int(record['Status'] in ('', 'active')),
+                   ' / '.join(value for value in options[1::2] if value) or None,
+                   _text(record['Variant SKU']), _decimal(record['Variant Price']) or 0,
+                   _decimal(record['Variant Compare At Price']), *options, _text(record['Variant Barcode']),
+                   Decimal(grams) / 1000 if grams else None,
+                   _flag(record['Variant Requires Shipping']), _flag(record['Variant Taxable']))
+
+
+def write_order_rows(path, orders, items):
+    """注文CSV → SeedOrders / SeedOrderItems の行を orders / items の writerow() へ渡す"""
+    with open_input(path) as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        (order_number, email, financial, fulfillment, currency, subtotal, taxes, total, created_at,
+         quantity, name, price, compare_at, sku, requires_shipping, taxable, customer_id) = (
+            header.index(column) for column in (
+                'Id', 'Email', 'Financial Status', 'Fulfillment Status', 'Currency', 'Subtotal', 'Taxes',
+                'Total', 'Created at', 'Lineitem quantity', 'Lineitem name', 'Lineitem price',
+                'Lineitem compare at price', 'Lineitem sku', 'Lineitem requires shipping',
+                'Lineitem taxable', 'Customer ID'))
+        current = None
+        for row in reader:
+            if row[order_number]:
+                current = row[order_number]
+                orders.writerow((current, _text(row[customer_id]), _text(row[email]),
+                                 _decimal(row[total]) or 0, _decimal(row[subtotal]) or 0,
+                                 _decimal(row[taxes]) or 0, row[currency] or 'JPY',
+                                 ORDER_STATUSES.get(row[financial].lower(), 'pending'),
+                                 row[financial] or 'pending', _text(row[fulfillment]),
+                                 _timestamp(row[created_at])))
+            elif current is None:
+                raise ValueError(f'先頭の行に注文の Id がありません: {path}')
+            if not row[name]:
+                continue
+            count = int(row[quantity] or 1)
+            unit = _decimal(row[price]) or 0
+            items.writerow((current, row[name], _text(row[sku]), unit, _decimal(row[compare_at]), count,
+                            unit * count, _flag(row[requires_shipping]), _flag(row[taxable])))
+
+
+def seed_tables_sql():
+    """作業用テーブルを作り直す SQL"""
+    parts = ['-- シード投入用の作業用テーブル（demo_datagen.sqlserver_seed が生成）', 'SET NOCOUNT ON;']
+    for table, columns in SEED_TABLES.items():
+        definitions = ',\n    '.join(f'{name} {sql_type} NULL' for name, sql_type in columns)
+        parts.append(f'DROP TABLE IF EXISTS dbo.{table};\n'
+                     f'CREATE TABLE dbo.{table} (\n    SeedId int IDENTITY(1,1) PRIMARY KEY,\n    {definitions}\n);')
+    return '\n'.join(parts) + '\nGO\n'
+
+
+def bulk_insert_sql(directory, tables):
+    """BULK INSERT で .dat を読み込む SQL（SQLCMD モード。SeedDir は SQL Server から見えるパス）"""
+    parts = ['-- シードのデータファイルを作業用テーブルへ一括投入（SQLCMD モードで実行）',
+             '-- SQL Server から SeedDir が見えない場合は、代わりにクライアント側で bcp を実行する:']
+    for table in tables:
+        parts.append(f'--   bcp dbo.{table} in "{table}.dat" -f "{table}.fmt" -C 65001 -k -b 100000 -h TABLOCK '
+                     f'-S <サーバー> -d <データベース> -T')
+    parts += [f':setvar SeedDir "{os.path.abspath(directory)}"', 'SET NOCOUNT ON;']
+    for table in tables:
+        parts.append(f"BULK INSERT dbo.{table} FROM '$(SeedDir)/{table}.dat'\n"
+                     f"WITH (FORMATFILE = '$(SeedDir)/{table}.fmt', CODEPAGE = '65001', "
+                     f"KEEPNULLS, TABLOCK, BATCHSIZE = 100000);")
+    return '\n'.join(parts) + '\nGO\n'
+
+
+def merge_sql(store_id):
+    """作業用テーブルから本番と同じテーブルへ移す SQL（同じ StoreId の既存データは入れ替え）"""
+    return f'''-- シードを Customers / Products / ProductVariants / Orders / OrderItems へ移す
+-- StoreId = {store_id} の既存データは削除してから入れ直す（1トランザクション）
+SET NOCOUNT ON;
+SET XACT_ABORT ON;
+DECLARE @StoreId int = {store_id};
+DECLARE @Now datetime2 = SYSUTCDATETIME();
+
+BEGIN TRANSACTION;
+
+-- 1. 既存データの削除
+DELETE FROM OrderItems WHERE OrderId IN (SELECT Id FROM Orders WHERE StoreId = @StoreId);
+DELETE FROM Orders WHERE StoreId = @StoreId;
+DELETE FROM ProductVariants WHERE ProductId IN (SELECT Id FROM Products WHERE StoreId = @StoreId);
+DELETE FROM Products WHERE StoreId = @StoreId;
+DELETE FROM Customers WHERE StoreId = @StoreId;
+
+-- 2. 顧客（顧客CSVに無い注文の顧客は注文から最小限の行を作る）
+INSERT INTO Customers (
+    StoreId, ShopifyCustomerId, FirstName, LastName, Email, Phone, Company, City, ProvinceCode, CountryCode,
+    AcceptsEmailMarketing, AcceptsSMSMarketing, TotalSpent, TotalOrders, OrdersCount, TaxExempt, Tags,
+    CompanyStoreName, Industry, IsActive, CustomerSegment, CreatedAt, UpdatedAt)
+SELECT @StoreId, ShopifyCustomerId, FirstName, LastName, Email, Phone, Company, City, ProvinceCode, CountryCode,
+    AcceptsEmailMarketing, AcceptsSMSMarketing, 0, 0, 0, TaxExempt, Tags,
+    CompanyStoreName, Industry, 1, N'新規顧客', COALESCE(CreatedAt, @Now), COALESCE(UpdatedAt, CreatedAt, @Now)
+FROM dbo.SeedCustomers
+ORDER BY SeedId;
+
+INSERT INTO Customers (
+    StoreId, ShopifyCustomerId, FirstName, LastName, Email, AcceptsEmailMarketing, AcceptsSMSMarketing,
+    TotalSpent, TotalOrders, OrdersCount, TaxExempt, IsActive, CustomerSegment, CreatedAt, UpdatedAt)
+SELECT @StoreId, o.ShopifyCustomerId, N'Unknown', N'Customer', MIN(o.Email), 0, 0,
+    0, 0, 0, 0, 1, N'新規顧客', MIN(o.CreatedAt), MIN(o.CreatedAt)
+FROM dbo.SeedOrders o
+WHERE o.ShopifyCustomerId IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM Customers c WHERE c.StoreId = @StoreId AND c.ShopifyCustomerId = o.ShopifyCustomerId)
+GROUP BY o.ShopifyCustomerId
+ORDER BY MIN(o.SeedId);
+
+-- 3. 商品（Handle ごとに先頭の行）とバリアント
+INSERT INTO Products (StoreId, Title, Handle, Description, Category, Vendor, ProductType, InventoryQuantity,
+    IsActive, CreatedAt, UpdatedAt)
+SELECT @StoreId, Title, Handle, LEFT(Description, 1000), Category, Vendor, ProductType, 100, IsActive, @Now, @Now
+FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY Handle ORDER BY SeedId) AS Position FROM dbo.SeedProducts) s
+WHERE Position = 1
+ORDER BY SeedId;
+
+INSERT INTO ProductVariants (ProductId, Title, Sku, Price, CompareAtPrice, InventoryQuantity,
+    Option1Name, Option1Value, Option2Name, Option2Value, Option3Name, Option3Value,
+    Barcode, Weight, WeightUnit, RequiresShipping, Taxable, CreatedAt, UpdatedAt)
+SELECT p.Id, s.VariantTitle, s.Sku, s.Price, s.CompareAtPrice, 100,
+    s.Option1Name, s.Option1Value, s.Option2Name, s.Option2Value, s.Option3Name, s.Option3Value,
+    s.Barcode, s.Weight, N'kg', s.RequiresShipping, s.Taxable, @Now, @Now
+FROM dbo.SeedProducts s
+JOIN Products p ON p.StoreId = @StoreId AND p.Handle = s.Handle
+ORDER BY s.SeedId;
+
+-- 4. 注文（顧客は ShopifyCustomerId、無ければ Email で結び付ける）
+INSERT INTO Orders (StoreId, OrderNumber, ShopifyCustomerId, Email, CustomerId, TotalPrice, SubtotalPrice,
+    TaxPrice, TotalTax, Currency, Status, FinancialStatus, FulfillmentStatus, CreatedAt, UpdatedAt,
+    ShopifyCreatedAt, ShopifyProcessedAt, IsTest)
+SELECT @StoreId, s.OrderNumber, s.ShopifyCustomerId, s.Email,
+    COALESCE(
+        (SELECT TOP 1 c.Id FROM Customers c
+         WHERE c.StoreId = @StoreId AND c.ShopifyCustomerId = s.ShopifyCustomerId ORDER BY c.Id),
+        (SELECT TOP 1 c.Id FROM Customers c WHERE c.StoreId = @StoreId AND c.Email = s.Email ORDER BY c.Id)),
+    s.TotalPrice, s.SubtotalPrice, s.TaxPrice, s.TaxPrice, s.Currency, s.Status, s.FinancialStatus,
+    s.FulfillmentStatus, s.CreatedAt, s.CreatedAt, s.CreatedAt, s.CreatedAt, 0
+FROM dbo.SeedOrders s
+ORDER BY s.SeedId;
+
+-- 5. 明細（注文は OrderNumber、商品側の列は SKU で補完）
+SELECT Sku, ProductId, Handle, Vendor, ProductType, VariantTitle,
+    Option1Name, Option1Value, Option2Name, Option2Value, Option3Name, Option3Value
+INTO #SeedSkus
+FROM (SELECT v.Sku, v.ProductId, p.Handle, p.Vendor, p.ProductType, v.Title AS VariantTitle,
+          v.Option1Name, v.Option1Value, v.Option2Name, v.Option2Value, v.Option3Name, v.Option3Value,
+          ROW_NUMBER() OVER (PARTITION BY v.Sku ORDER BY v.Id) AS Position
+      FROM ProductVariants v JOIN Products p ON p.Id = v.ProductId
+      WHERE p.StoreId = @StoreId AND v.Sku IS NOT NULL) s
+WHERE Position = 1;
+CREATE UNIQUE CLUSTERED INDEX IX_SeedSkus_Sku ON #SeedSkus (Sku);
+
+INSERT INTO OrderItems (OrderId, ProductId, ProductTitle, ProductHandle, ProductVendor, ProductType, Sku,
+    VariantTitle, Price, CompareAtPrice, Quantity, TotalPrice, Option1Name, Option1Value, Option2Name,
+    Option2Value, Option3Name, Option3Value, RequiresShipping, Taxable, CreatedAt, UpdatedAt)
+SELECT o.Id, CAST(k.ProductId AS nvarchar(50)), s.ProductTitle, k.Handle, k.Vendor, k.ProductType, s.Sku,
+    k.VariantTitle, s.Price, s.CompareAtPrice, s.Quantity, s.TotalPrice, k.Option1Name, k.Option1Value,
+    k.Option2Name, k.Option2Value, k.Option3Name, k.Option3Value, s.RequiresShipping, s.Taxable,
+    o.CreatedAt, o.CreatedAt
+FROM dbo.SeedOrderItems s
+JOIN Orders o ON o.StoreId = @StoreId AND o.OrderNumber = s.OrderNumber
+LEFT JOIN #SeedSkus k ON k.Sku = s.Sku
+ORDER BY s.SeedId;
+DROP TABLE #SeedSkus;
+
+-- 6. 顧客の購入回数・購入金額・最終注文日・セグメント（ImportService と同じ基準）
+UPDATE c SET
+    TotalOrders = a.Orders, OrdersCount = a.Orders, TotalSpent = a.Spent, LastOrderDate = a.LastOrderDate,
+    CustomerSegment = CASE WHEN a.Orders >= 10 OR a.Spent >= 100000 THEN N'VIP顧客'
+                           WHEN a.Orders >= 2 THEN N'リピーター' ELSE N'新規顧客' END
+FROM Customers c
+JOIN (SELECT CustomerId, COUNT(*) AS Orders, SUM(TotalPrice) AS Spent, MAX(ShopifyProcessedAt) AS LastOrderDate
+      FROM Orders WHERE StoreId = @StoreId GROUP BY CustomerId) a ON a.CustomerId = c.Id;
+
+COMMIT TRANSACTION;
+GO
+
+-- 7. 作業用テーブルの削除と件数の確認
+DROP TABLE IF EXISTS {', '.join(f'dbo.{table}' for table in SEED_TABLES)};
+SELECT
+    (SELECT COUNT(*) FROM Customers WHERE StoreId = {store_id}) AS Customers,
+    (SELECT COUNT(*) FROM Products WHERE StoreId = {store_id}) AS Products,
+    (SELECT COUNT(*) FROM Orders WHERE StoreId = {store_id}) AS Orders,
+    (SELECT COUNT(*) FROM OrderItems WHERE OrderId IN (SELECT Id FROM Orders WHERE StoreId = {store_id})) AS OrderItems;
+GO
+'''
+
+
+def _write_sql(path, text):
+    with open(path, 'w', encoding='utf-8-sig', newline='\r\n') as f:
+        f.write(text)
+    return path
+
+
+def write_seed_files(output_dir, files, store_id, fmt='insert', batch_rows=BATCH_ROWS):
+    """生成スクリプトの run() の結果（出力先と files）からシードを output_dir/sqlserver/ に書き出す
+
+    実行順はファイル名の番号順（00_seed_tables.sql → 投入 → 99_merge.sql）。
+    書き出したファイルのパスと作業用テーブル別の行数を返す。
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f'未対応の形式です: {fmt}（{", ".join(FORMATS)}）')
+    orders_name = next((name for name in files if 'orders' in name), None)
+    if orders_name is None:
+        raise ValueError(f'注文CSVが出力されていません: {output_dir}')
+    orders_path = os.path.join(output_dir, orders_name)
+    customers_path, products_path = sibling_csvs(orders_path)
+
+    directory = os.path.join(output_dir, SEED_DIR_NAME)
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        # 形式を切り替えたときに前回のファイルが残らないようにする
+        if name.endswith(('.sql', '.dat', '.fmt')):
+            os.unlink(os.path.join(directory, name))
+    paths = [_write_sql(os.path.join(directory, '00_seed_tables.sql'), seed_tables_sql())]
+    counts = {}
+    writer_class = WRITERS[fmt]
+
+    writers = {table: writer_class(directory, number, table, batch_rows)
+               for number, table in enumerate(SEED_TABLES, 1)}
+    try:
+        for path, rows, table in ((customers_path, iter_customer_rows, 'SeedCustomers'),
+                                  (products_path, iter_product_rows, 'SeedProducts')):
+            if path:
+                for row in rows(path):
+                    writers[table].writerow(row)
+        write_order_rows(orders_path, writers['SeedOrders'], writers['SeedOrderItems'])
+    finally:
+        for table, writer in writers.items():
+            paths.extend(writer.close())
+            counts[table] = writer.rows
+    if fmt == 'bcp':
+        paths.append(_write_sql(os.path.join(directory, '01_bulk_insert.sql'), bulk_insert_sql(directory, counts)))
+    paths.append(_write_sql(os.path.join(directory, '99_merge.sql'), merge_sql(store_id)))
+    return {'paths': paths, 'rows': counts}
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+行の書き出しと同時に集計する統計コレクタ
+
+注文行を書き出すたびに observe() を呼び、セグメント・期間・カテゴリ・顧客ごとの
+件数を1パスで数える。生成後に行や顧客を走査し直す必要はなく、結果はCSVと同じ
+ディレクトリにJSONで保存する。シャード生成ではシャードごとに集計して merge() する。
+
+顧客ごとの注文数・購入金額は顧客番号→位置の辞書と整数配列（array）で持ち、
+顧客CSVの 'Total Orders' / 'Total Spent' を注文と一致させるために使う。
+
+集計の軸は {名前: (列名, 変換)} で指定する。変換は辞書（値→キー）か
+モジュールレベルの関数（シャード生成でワーカーへ渡すためpickle可能であること）。
+"""
+
+import csv
+import json
+from array import array
+
+from demo_datagen.csvout import open_input, open_output
+from demo_datagen.schema import ORDER_EXPORT_SCHEMA, ORDER_ID_INDEX, ORDER_TOTAL_INDEX
+
+CUSTOMER_ID_INDEX = ORDER_EXPORT_SCHEMA.index['Customer ID']
+QUANTITY_INDEX = ORDER_EXPORT_SCHEMA.index['Lineitem quantity']
+
+# 購入回数分析の区分（下限, ラベル）
+PURCHASE_COUNT_BUCKETS = [(11, '11回以上'), (6, '6-10回'), (3, '3-5回'), (2, '2回'), (1, '1回')]
+
+
+def _compile(keys):
+    specs = []
+    for name, (column, transform) in keys.items():
+        specs.append((name, ORDER_EXPORT_SCHEMA.index[column], transform))
+    return specs
+
+
+def _key(value, transform):
+    if transform is None:
+        return value
+    if isinstance(transform, dict):
+        return transform.get(value, value)
+    return transform(value)
+
+
+class StatsCollector:
+    """注文行を1行ずつ受け取り、軸ごとの件数・売上を集計する
+
+    order_keys: 注文単位で数える軸（注文数・売上）
+    item_keys: 明細単位で数える軸（明細数・数量）
+    customer_ids を渡すと、その顧客を注文がなくても集計対象に含める。
+    """
+
+    def __init__(self, order_keys=None, item_keys=None, customer_ids=()):
+        self.order_keys = dict(order_keys or {})
+        self.item_keys = dict(item_keys or {})
+        self._order_specs = _compile(self.order_keys)
+        self._item_specs = _compile(self.item_keys)
+        self.rows = 0
+        self.orders = 0
+        self.total = 0
+        self.by_order = {name: {} for name in self.order_keys}
+        self.by_item = {name: {} for name in self.item_keys}
+        self._customer_slots = {}
+        self.customer_orders = array('q')
+        self.customer_spent = array('q')
+        for customer_id in customer_ids:
+            self._slot(customer_id)
+
+    def _slot(self, customer_id):
+        slot = self._customer_slots.get(customer_id)
+        if slot is None:
+            slot = self._customer_slots[customer_id] = len(self.customer_orders)
+            self.customer_orders.append(0)
+            self.customer_spent.append(0)
+        return slot
+
+    def spawn(self):
+        """同じ軸を持つ空のコレクタ（シャード用）"""
+        return StatsCollector(self.order_keys, self.item_keys)
+
+    def observe(self, row):
+        """注文行（先頭行・追加明細行）を1行集計"""
+        self.rows += 1
+        for name, index, transform in self._item_specs:
+            bucket = self.by_item[name].setdefault(_key(row[index], transform), [0, 0])
+            bucket[0] += 1
+            bucket[1] += int(row[QUANTITY_INDEX])
+        if not row[ORDER_ID_INDEX]:
+            return
+        total = int(row[ORDER_TOTAL_INDEX])
+        self.orders += 1
+        self.total += total
+        for name, index, transform in self._order_specs:
+            bucket = self.by_order[name].setdefault(_key(row[index], transform), [0, 0])
+            bucket[0] += 1
+            bucket[1] += total
+        slot = self._slot(row[CUSTOMER_ID_INDEX])
+        self.customer_orders[slot] += 1
+        self.customer_spent[slot] += total
+
+    def observe_csv(self, path):
+        """書き出し済みの注文CSV（.gz / .zst も可）を全行集計する（追記後の集計JSONの作り直し用）"""
+        with open_input(path) as f:
+            reader = csv.reader(f)
+            if tuple(next(reader)) != ORDER_EXPORT_SCHEMA.columns:
+                raise ValueError(f'注文CSVの列が想定と異なります: {path}')
+            for row in reader:
+                self.observe(row)
+        return self
+
+    def merge(self, other):
+        """別のコレクタ（シャードの集計結果）を加算"""
+        self.rows += other.rows
+        self.orders += other.orders
+        self.total += other.total
+        for mine, theirs in zip((self.by_order, self.by_item), (other.by_order, other.by_item)):
+            for name, buckets in theirs.items():
+                target = mine[name]
+                for key, (count, amount) in buckets.items():
+                    bucket = target.setdefault(key, [0, 0])
+                    bucket[0] += count
+                    bucket[1] += amount
+        for customer_id, other_slot in other._customer_slots.items():
+            slot = self._slot(customer_id)
+            self.customer_orders[slot] += other.customer_orders[other_slot]
+            self.customer_spent[slot] += other.customer_spent[other_slot]
+        return self
+
+    def count(self, name, key):
+        """注文単位の軸 name のキー key の注文数"""
+        return self.by_order[name].get(key, [0, 0])[0]
+
+    def customer_totals(self, customer_id):
+        """顧客の (注文数, 購入金額)"""
+        slot = self._customer_slots.get(customer_id)
+        if slot is None:
+            return 0, 0
+        return self.customer_orders[slot], self.customer_spent[slot]
+
+    def apply_customer_totals(self, customers, add=False):
+        """顧客（辞書）の 'Total Orders' / 'Total Spent' を集計結果で埋める
+
+        add=True なら既存の値に加算する（既存CSVへの追記用）。
+        """
+        for customer in customers:
+            orders, spent = self.customer_totals(customer['Customer ID'])
+            if add:
+                orders += int(customer['Total Orders'] or 0)
+                spent += int(customer['Total Spent'] or 0)
+            customer['Total Orders'] = orders
+            customer['Total Spent'] = spent
+
+    def purchase_count_distribution(self):
+        """顧客の購入回数分布（1回、2回、3-5回、6-10回、11回以上）"""
+        distribution = {label: 0 for _, label in reversed(PURCHASE_COUNT_BUCKETS)}
+        for count in self.customer_orders:
+            for minimum, label in PURCHASE_COUNT_BUCKETS:
+                if count >= minimum:
+                    distribution[label] += 1
+                    break
+        return distribution
+
+    def summary(self):
+        """JSONに書き出す集計結果"""
+        result = {
+            'rows': self.rows,
+            'orders': self.orders,
+            'total': self.total,
+            'customers': sum(1 for count in self.customer_orders if count),
+            'purchase_count_distribution': self.purchase_count_distribution(),
+        }
+        for name, buckets in self.by_order.items():
+            result[name] = {str(k): {'orders': v[0], 'total': v[1]} for k, v in sorted(buckets.items())}
+        for name, buckets in self.by_item.items():
+            result[name] = {str(k): {'items': v[0], 'quantity': v[1]} for k, v in sorted(buckets.items())}
+        return result
+
+    def write_json(self, path, options=None):
+        """集計結果をJSONで保存（options は生成時の設定で、追記時に読み戻す。append.read_summary_options() を参照）"""
+        summary = self.summary()
+        if options is not None:
+            summary['options'] = options
+        with open_output(path, encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
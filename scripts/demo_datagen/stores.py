@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+デモストア生成スクリプトの登録簿
+
+各ストアのスクリプトは run(output_dir=..., scale=..., seed=..., quiet=...) を持ち、
+ファイル別の行数を返す。ここではスクリプトをパスから読み込んで実行し、所要時間を計測する。
+"""
+
+import importlib.util
+import inspect
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+DEFAULT_OUTPUT_ROOT = os.path.join(REPO_ROOT, 'data', 'staging')
+
+# ストア名 → (スクリプトのパス, 出力先のサブディレクトリ)
+STORES = {
+    'store2': ('data/staging/generate_comprehensive_orders.py', ''),
+    'store3': ('scripts/generate-hokkaido-store-data.py', 'store3_hokkaido'),
+    'store4': ('scripts/generate-maeyao-demo-data.py', 'store4_maeyao'),
+}
+
+_modules = {}
+
+
+def load_store_module(name):
+    """ストアの生成スクリプトをモジュールとして読み込む"""
+    if name not in STORES:
+        raise ValueError(f'未登録のストアです: {name}（{", ".join(STORES)}）')
+    if name not in _modules:
+        path = os.path.join(REPO_ROOT, STORES[name][0])
+        spec = importlib.util.spec_from_file_location(f'demo_store_{name}', path)
+        module = importlib.util.module_from_spec(spec)
+        # シャード生成の関数をpickleで渡せるよう sys.modules に登録
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        _modules[name] = module
+    return _modules[name]
+
+
+def store_output_dir(name, output_root=DEFAULT_OUTPUT_ROOT):
+    """ストアの出力先ディレクトリ"""
+    return os.path.normpath(os.path.join(output_root, STORES[name][1]))
+
+
+def run_store(name, output_root=DEFAULT_OUTPUT_ROOT, **options):
+    """ストア1つ分を生成し、所要時間と行数を返す
+
+    options のうち、そのストアの run() が受け付けないもの（engine など）は無視する。
+    """
+    module = load_store_module(name)
+    accepted = inspect.signature(module.run).parameters
+    kwargs = {k: v for k, v in options.items() if k in accepted and v is not None}
+    started = time.perf_counter()
+    result = module.run(output_dir=store_output_dir(name, output_root), quiet=True, **kwargs)
+    elapsed = time.perf_counter() - started
+    rows = sum(result['files'].values())
+    return {
+        'store': name,
+        'output_dir': result['output_dir'],
+        'files': result['files'],
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed > 0 else 0.0,
+    }
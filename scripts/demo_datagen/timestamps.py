@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Shopify エクスポート形式の日時文字列（'2025-07-28 00:00:00 +0900'）の整形・解析
+
+注文日時は日単位のため異なる値は数千件程度しかない。整形・解析の結果を
+LRU キャッシュで使い回し、行ごとの strftime / strptime を省く。
+日中の時刻を入れて値の種類が増えても、キャッシュの件数は CACHE_SIZE で頭打ちになる。
+"""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S +0900'
+CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def format_timestamp(value):
+    """datetime を 'YYYY-MM-DD HH:MM:SS +0900' に整形"""
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def format_shifted(value, days):
+    """value の days 日後を整形（発送日時など）"""
+    return format_timestamp(value + timedelta(days=days))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_timestamp(text):
+    """'YYYY-MM-DD HH:MM:SS +0900' を datetime に変換（タイムゾーンは付けない）
+
+    datetime.strptime(text[:19], '%Y-%m-%d %H:%M:%S') と同じ結果を返す。
+    """
+    return datetime.fromisoformat(text[:19])
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def epoch_seconds(text):
+    """'YYYY-MM-DD HH:MM:SS +0900' をUNIX時刻（秒、タイムゾーンのオフセットを反映）に変換"""
+    return int(datetime.strptime(text, '%Y-%m-%d %H:%M:%S %z').timestamp())
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+NumPy による一括サンプリング
+
+注文ごとに random.randint / random.choice を呼ぶ代わりに、バッチ単位
+（例: 100万件）で乱数を配列として引き、行の組み立てだけをPythonで行う。
+numpy は任意依存のため、ベクトル化モードを使うときだけ必要になる。
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy未導入環境
+    np = None
+
+DEFAULT_BATCH_SIZE = 100_000
+
+
+def require_numpy():
+    """numpy が無い場合は分かりやすいエラーにする"""
+    if np is None:
+        raise RuntimeError('ベクトル化モードには numpy が必要です（pip install numpy）')
+    return np
+
+
+def make_rng(seed=None):
+    """乱数ジェネレータを作成"""
+    require_numpy()
+    return np.random.default_rng(seed)
+
+
+def iter_batches(total, batch_size=DEFAULT_BATCH_SIZE):
+    """(開始位置, 件数) をバッチ単位で返す"""
+    start = 0
+    while start < total:
+        count = min(batch_size, total - start)
+        yield start, count
+        start += count
+
+
+def randint(rng, low, high, size):
+    """random.randint と同じく両端を含む整数を一括で引く"""
+    return rng.integers(low, high + 1, size=size)
+
+
+def randint_by_group(rng, group, low, high):
+    """グループごとに範囲の異なる randint（low/high はグループ別の配列）"""
+    low = np.asarray(low)[group]
+    span = np.asarray(high)[group] - low + 1
+    return low + (rng.random(len(group)) * span).astype(np.int64)
+
+
+def biased_pick(rng, picked, member_mask, members, keep_prob):
+    """抽選済みの顧客がセグメント所属なら keep_prob の確率でセグメント内から引き直す
+
+    generate_orders() の「VIPは80%の確率で選ばれる」といった偏りを一括で再現する。
+    """
+    if len(members) == 0:
+        return picked
+    redraw = member_mask[picked] & (rng.random(len(picked)) < keep_prob)
+    count = int(redraw.sum())
+    if count:
+        picked = picked.copy()
+        picked[redraw] = np.asarray(members)[rng.integers(0, len(members), size=count)]
+    return picked
+
+
+class RaggedPools:
+    """長さの異なる候補プール群からの一様抽選（季節別商品など）"""
+
+    def __init__(self, pools):
+        require_numpy()
+        self.lengths = np.array([len(p) for p in pools], dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(self.lengths)[:-1])).astype(np.int64)
+        self.flat = np.array([item for pool in pools for item in pool], dtype=np.int64)
+
+    def choice(self, rng, pool_index):
+        """pool_index[i] 番目のプールから1つずつ抽選"""
+        lengths = self.lengths[pool_index]
+        picks = (rng.random(len(pool_index)) * lengths).astype(np.int64)
+        return self.flat[self.offsets[pool_index] + picks]
+
+
+def expand_items(num_items):
+    """注文ごとの明細数から、明細→注文の対応配列と注文ごとの開始位置を返す"""
+    item_order = np.repeat(np.arange(len(num_items)), num_items)
+    item_start = np.concatenate(([0], np.cumsum(num_items)[:-1]))
+    return item_order, item_start
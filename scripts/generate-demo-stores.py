@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+デモストアデータの一括生成スクリプト
+対象: store2（包括的注文データ）、store3（北海道物産品）、store4（早稲田メーヤウ）
+
+ストアごとに別プロセスで顧客・商品・注文の生成を並列実行し、
+ストア別の所要時間と行数/秒を表示する。--sqlite 指定時は生成後にストアを順に
+SQLite の分析DBミラーへ投入する（同じファイルへの同時書き込みを避けるため直列）。
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from demo_datagen.append import parse_date
+from demo_datagen.csvout import COMPRESSION_SUFFIXES
+from demo_datagen.sqlite_mirror import load_store_output
+from demo_datagen.sqlserver_seed import FORMATS as SQLSERVER_FORMATS, write_seed_files
+from demo_datagen.stores import DEFAULT_OUTPUT_ROOT, STORES, load_store_module, run_store
+
+
+def parse_args():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description='デモストアデータを一括生成')
+    parser.add_argument('--stores', nargs='+', choices=list(STORES), default=list(STORES),
+                        help='生成するストア（デフォルト: 全ストア）')
+    parser.add_argument('--scale', type=float, default=1.0, help='データ量の倍率（デフォルト: 1.0）')
+    parser.add_argument('--seed', type=int, default=None, help='乱数シード（全ストア共通）')
+    parser.add_argument('--output-root', default=DEFAULT_OUTPUT_ROOT,
+                        help='出力先のルート（デフォルト: data/staging）')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='同時に生成するストア数（デフォルト: ストア数）')
+    parser.add_argument('--engine', choices=['random', 'numpy'], default=None,
+                        help='注文の乱数生成方式（対応ストアのみ）')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='ストア内のシャード並列数（対応ストアのみ）')
+    parser.add_argument('--sort-by-date', action='store_true',
+                        help='注文を Created at 順に並べて出力（外部マージソート）')
+    parser.add_argument('--compression', choices=list(COMPRESSION_SUFFIXES), default=None,
+                        help='注文CSVを gzip / zstd で圧縮して出力')
+    parser.add_argument('--columnar', action='store_true',
+                        help='注文CSVの主要列を .npy の列ファイルにも書き出す（numpy が必要）')
+    parser.add_argument('--sqlite', default=None, metavar='PATH',
+                        help='生成後に各ストアを SQLite の分析DBミラーへ投入（StoreId はストアの番号）')
+    parser.add_argument('--sqlserver', choices=SQLSERVER_FORMATS, default=None,
+                        help='生成後に各ストアの SQL Server 一括投入ファイルを sqlserver/ に書き出す（insert / bcp）')
+    parser.add_argument('--cache', action='store_true',
+                        help='同じ入力の生成結果をキャッシュから再利用（--seed 指定時のみ）')
+    parser.add_argument('--cache-dir', default=None,
+                        help='キャッシュの保存先（デフォルト: $DEMO_DATAGEN_CACHE または ~/.cache/shopify-demo-datagen）')
+    parser.add_argument('--append-until', type=parse_date, default=None, metavar='YYYY-MM-DD',
+                        help='既存CSVにこの日までの注文を追記（過去分は再生成しない）')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    options = {'scale': args.scale, 'seed': args.seed, 'engine': args.engine, 'workers': args.workers,
+               'sort_by_date': args.sort_by_date, 'compression': args.compression,
+               'columnar': args.columnar, 'cache': args.cache, 'cache_dir': args.cache_dir, 'append_until': args.append_until}
+    jobs = args.jobs or len(args.stores)
+
+    print(f"デモストアデータを生成中...（{', '.join(args.stores)} / scale={args.scale} / 並列数={jobs}）")
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_store, name, args.output_root, **options) for name in args.stores]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{'ストア':<8}{'行数':>12}{'時間(秒)':>10}{'行/秒':>12}")
+    for result in results:
+        print(f"{result['store']:<8}{result['rows']:>12,}{result['seconds']:>10.2f}{result['rows_per_sec']:>12,.0f}")
+    total_rows = sum(r['rows'] for r in results)
+    print(f"{'合計':<8}{total_rows:>12,}{elapsed:>10.2f}{total_rows / elapsed:>12,.0f}")
+
+    if args.sqlite:
+        print(f"\nSQLite（{args.sqlite}）へ投入中...")
+        for result in results:
+            started = time.perf_counter()
+            store_id = load_store_module(result['store']).STORE_ID
+            counts = load_store_output(args.sqlite, store_id, result['output_dir'], result['files'])
+            elapsed = time.perf_counter() - started
+            print(f"- {result['store']}（StoreId={store_id}）: 注文{counts['orders']:,}件"
+                  f"（明細{counts['order_items']:,}件）、{elapsed:.2f}秒")
+
+    if args.sqlserver:
+        print(f"\nSQL Server 用のシード（{args.sqlserver}）を書き出し中...")
+        for result in results:
+            store_id = load_store_module(result['store']).STORE_ID
+            seed = write_seed_files(result['output_dir'], result['files'], store_id, args.sqlserver)
+            print(f"- {result['store']}（StoreId={store_id}）: {os.path.dirname(seed['paths'][0])}/")
+
+    print("\n生成完了！")
+    for result in results:
+        print(f"保存先: {result['output_dir']}/")
+        for name, rows in result['files'].items():
+            print(f"- {name}（{rows:,}行）")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,14 +7,41 @@ Store ID: 3
 期間: 2022年1月〜2025年7月
 """
 
-import csv
+import argparse
 import random
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
 
-# 出力ディレクトリの作成
-output_dir = '../data/staging/store3_hokkaido'
-os.makedirs(output_dir, exist_ok=True)
+from demo_datagen import activity, append, extsort, sharding, vectorized
+from demo_datagen.calendar_table import DayCalendar, default_demand_weight
+from demo_datagen.catalog import write_catalog_csv
+from demo_datagen.columnar import column_files, columns_dir, write_order_columns
+from demo_datagen.cache import GenerationCache, cache_key, manifest_rows
+from demo_datagen.csvout import (
+    COMPRESSION_SUFFIXES, append_orders_csv, compressed_name, write_orders_csv, write_records_csv,
+)
+from demo_datagen.identity import IdentityGenerator
+from demo_datagen.schema import ORDER_EXPORT_DEFAULTS, ORDER_EXPORT_SCHEMA
+from demo_datagen.sampling import GroupedWeightedSampler
+from demo_datagen.segments import SegmentIndex
+from demo_datagen.sqlite_mirror import load_store_output
+from demo_datagen.sqlserver_seed import FORMATS as SQLSERVER_FORMATS, write_seed_files
+from demo_datagen.stats import StatsCollector
+from demo_datagen.timestamps import format_shifted, format_timestamp
+
+# 出力ディレクトリ（data/staging/store3_hokkaido）
+DEFAULT_OUTPUT_DIR = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'staging', 'store3_hokkaido'))
+
+# scale=1.0 のときのデータ数
+BASE_CUSTOMERS = 150
+BASE_ORDERS = 1000
+
+# 集計結果（StatsCollector）のJSON
+SUMMARY_NAME = 'summary_store3_hokkaido.json'
+
+# 分析DBでのストアID（SQLite ミラーへの投入時の既定値）
+STORE_ID = 3
 
 # 北海道の地域
 HOKKAIDO_CITIES = [
@@ -85,41 +112,65 @@ PRODUCTS = [
     {'id': 'HKD-144', 'name': '北海道味噌 1kg×3個', 'category': '加工品', 'vendor': '札幌味噌', 'price': 2400, 'sku': 'PRO-MIS-003'}
 ]
 
-# 顧客名リスト（日本の一般的な姓名）
-LAST_NAMES = ['佐藤', '鈴木', '高橋', '田中', '伊藤', '渡辺', '山本', '中村', '小林', '加藤', 
-              '吉田', '山田', '佐々木', '山口', '松本', '井上', '木村', '斎藤', '林', '清水']
-FIRST_NAMES_MALE = ['太郎', '次郎', '三郎', '健太', '翔太', '大輝', '拓也', '直樹', '健一', '誠']
-FIRST_NAMES_FEMALE = ['花子', '美咲', '愛', '彩', '舞', '優子', '真由美', '恵子', '幸子', '陽子']
-
-def generate_customer_name():
-    """顧客名を生成"""
-    last_name = random.choice(LAST_NAMES)
-    if random.random() < 0.5:
-        first_name = random.choice(FIRST_NAMES_MALE)
-    else:
-        first_name = random.choice(FIRST_NAMES_FEMALE)
-    return f"{last_name}{first_name}"
+PRODUCTS_BY_ID = {p['id']: p for p in PRODUCTS}
+PRODUCT_IDS = [p['id'] for p in PRODUCTS]
+
+# 注文期間（2022年1月〜2025年7月）
+ORDER_START_DATE = datetime(2022, 1, 1)
+ORDER_END_DATE = datetime(2025, 7, 28)
+
+# 季節性を考慮した商品選択
+SEASONAL_PRODUCTS = {
+    'winter': ['HKD-001', 'HKD-002', 'HKD-006', 'HKD-101', 'HKD-102', 'HKD-103'],  # カニ、ラーメン
+    'spring': ['HKD-022', 'HKD-023', 'HKD-024', 'HKD-041', 'HKD-042'],  # アスパラ、メロン、乳製品
+    'summer': ['HKD-022', 'HKD-023', 'HKD-045', 'HKD-122', 'HKD-124'],  # とうもろこし、メロン、飲料
+    'autumn': ['HKD-001', 'HKD-007', 'HKD-021', 'HKD-026'],  # いくら、鮭、じゃがいも、かぼちゃ
+}
+
+# サイズバリアント（海産物・農産物のみ）
+VARIANT_CATEGORIES = ['海産物', '農産物']
+SIZES = ['小', '中', '大']
+SIZE_PRICE_MULTIPLIERS = {'小': 0.7, '中': 1.0, '大': 1.5}
 
-def generate_customers(num_customers=150):
-    """顧客データを生成"""
+# SKU（サイズ別を含む）→カテゴリ（集計用）
+SKU_CATEGORIES = {
+    **{p['sku']: p['category'] for p in PRODUCTS},
+    **{f"{p['sku']}-{size[0]}": p['category'] for p in PRODUCTS for size in SIZES},
+}
+
+# 注文行のテンプレート（注文ごとに変わらない列）
+ORDER_TEMPLATE = ORDER_EXPORT_SCHEMA.template({
+    **ORDER_EXPORT_DEFAULTS,
+    'Payment Method': 'クレジットカード',
+    'Duties': 0,
+})
+
+# 月別の需要倍率（お歳暮・年末のカニ、夏のメロン・とうもろこし）
+MONTH_DEMAND = {12: 1.6, 1: 1.2, 7: 1.3, 8: 1.3}
+
+def seasonal_demand_weight(calendar, index):
+    """季節需要モードの日別の重み（週末・祝日・イベント × 月別の需要倍率）"""
+    return default_demand_weight(calendar, index) * MONTH_DEMAND.get(calendar.months[index], 1.0)
+
+def order_calendar(start_date, end_date, seasonal_demand=False):
+    """注文期間の日付表（seasonal_demand=False なら一様に抽選）"""
+    return DayCalendar(start_date, end_date, seasonal_demand_weight if seasonal_demand else None)
+
+def generate_customers(num_customers=150, seed=None):
+    """顧客データを生成（氏名・電話番号は顧客番号から重複なく決める）"""
+    identities = IdentityGenerator(seed, 'store3')
     customers = []
     for i in range(num_customers):
         customer_id = f"CUST-3{i+1:03d}"
-        name = generate_customer_name()
+        last_name, first_name = identities.name(i)
         email = f"hokkaido-customer-{i+1:03d}@example.com"
         
-        # 購買パターンを決定
+        # 購買パターンを決定（購入回数・購入金額は注文の生成後に集計値で埋める）
         if i < 20:  # VIP顧客（13%）
-            total_orders = random.randint(15, 30)
-            total_spent = random.randint(200000, 500000)
             tags = "VIP,リピーター,北海道愛好家"
         elif i < 60:  # リピーター（27%）
-            total_orders = random.randint(5, 14)
-            total_spent = random.randint(50000, 199999)
             tags = "リピーター"
         else:  # 一般顧客（60%）
-            total_orders = random.randint(1, 4)
-            total_spent = random.randint(5000, 49999)
             tags = "一般顧客"
         
         # 地域を決定（道内60%、道外40%）
@@ -140,8 +191,8 @@ def generate_customers(num_customers=150):
         
         customer = {
             'Customer ID': customer_id,
-            'First Name': name[1:],
-            'Last Name': name[0],
+            'First Name': first_name,
+            'Last Name': last_name,
             'Email': email,
             'Accepts Email Marketing': random.choice(['yes', 'no']),
             'Company': '',
@@ -153,16 +204,15 @@ def generate_customers(num_customers=150):
             'Country': '日本',
             'Country Code': 'JP',
             'Zip': '',
-            'Phone': f"090-{random.randint(1000,9999)}-{random.randint(1000,9999)}",
+            'Phone': identities.phone(i),
             'Accepts SMS Marketing': random.choice(['yes', 'no']),
-            'Total Spent': total_spent,
-            'Total Orders': total_orders,
+            'Total Spent': 0,
+            'Total Orders': 0,
             'Tags': tags,
             'Note': '',
             'Tax Exempt': 'no',
             'Company / 店舗名': '',
             'Industry / 業種名': '',
-            'Phone': f"090-{random.randint(1000,9999)}-{random.randint(1000,9999)}",
             'Created At': '',
             'Updated At': ''
         }
@@ -273,228 +323,505 @@ def generate_products():
     
     return products_csv
 
-def generate_orders(customers, num_orders=1000):
-    """注文データを生成"""
-    orders = []
-    order_id = 3001  # Store 3の注文は3001から開始
-    
-    # 日付範囲（2022年1月〜2025年7月）
-    start_date = datetime(2022, 1, 1)
-    end_date = datetime(2025, 7, 28)
+def pick_customer(customers, segments, rng=random):
+    """注文する顧客を選択（リピーターは確率高め）"""
+    customer = rng.choice(customers)
+    if 'VIP' in customer['Tags']:
+        # VIP顧客は80%の確率で選ばれる
+        if rng.random() > 0.2:
+            customer = segments.choice('VIP', rng=rng)
+    elif 'リピーター' in customer['Tags']:
+        # リピーターは60%の確率で選ばれる
+        if rng.random() > 0.4:
+            customer = segments.choice('リピーター', rng=rng)
+    return customer
+
+def window_calendars(calendar, plan, seasonal_demand=False):
+    """ActivityPlan の期間ごとの日付表と、全期間の日付表での開始位置"""
+    calendars = [order_calendar(s, e, seasonal_demand) for s, e in plan.windows(calendar.start, calendar.dates[-1])]
+    return calendars, [calendar.index_of(c.start) for c in calendars]
+
+def iter_orders(customers, num_orders=1000, start=0, stop=None, rng=random,
+                start_date=ORDER_START_DATE, end_date=ORDER_END_DATE, first_order_id=3001,
+                seasonal_demand=False, plan=None):
+    """注文データを1行ずつ生成（明細行を含む）
+
+    行を保持しないため、注文数に関わらずメモリ使用量は一定。
+    start/stop を指定すると、その範囲の注文番号だけを生成する（シャード分割用）。
+    start_date/end_date/first_order_id は追記モードで期間と注文番号を続けるために使う。
+    seasonal_demand=True なら注文日を季節・イベントの需要の重みで抽選する。
+    plan（activity.ActivityPlan）を指定すると、顧客と注文日の期間を plan の割り当てに従わせる。
+    """
+    stop = num_orders if stop is None else stop
+    seasonal_products = SEASONAL_PRODUCTS
+    calendar = order_calendar(start_date, end_date, seasonal_demand)
+    if plan is not None:
+        calendars, offsets = window_calendars(calendar, plan, seasonal_demand)
+        planned_customers = plan.customer[start:stop].tolist()
+        planned_windows = plan.window[start:stop].tolist()
     
-    # 季節性を考慮した商品選択
-    seasonal_products = {
-        'winter': ['HKD-001', 'HKD-002', 'HKD-006', 'HKD-101', 'HKD-102', 'HKD-103'],  # カニ、ラーメン
-        'spring': ['HKD-022', 'HKD-023', 'HKD-024', 'HKD-041', 'HKD-042'],  # アスパラ、メロン、乳製品
-        'summer': ['HKD-022', 'HKD-023', 'HKD-045', 'HKD-122', 'HKD-124'],  # とうもろこし、メロン、飲料
-        'autumn': ['HKD-001', 'HKD-007', 'HKD-021', 'HKD-026'],  # いくら、鮭、じゃがいも、かぼちゃ
-    }
+    # タグ別の顧客リストを一度だけ構築
+    segments = SegmentIndex(customers)
     
-    for i in range(num_orders):
-        # ランダムな日付を生成
-        days_between = (end_date - start_date).days
-        random_days = random.randint(0, days_between)
-        order_date = start_date + timedelta(days=random_days)
+    for i in range(start, stop):
+        order_id = first_order_id + i  # Store 3の注文は3001から開始
         
-        # 季節を判定
-        month = order_date.month
-        if month in [12, 1, 2]:
-            season = 'winter'
-        elif month in [3, 4, 5]:
-            season = 'spring'
-        elif month in [6, 7, 8]:
-            season = 'summer'
+        # 日付表から注文日と季節を引く（plan 指定時は割り当てられた期間から）
+        if plan is None:
+            day = calendar.draw(rng)
         else:
-            season = 'autumn'
+            window = planned_windows[i - start]
+            day = offsets[window] + calendars[window].draw(rng)
+        order_date = calendar.dates[day]
+        season = calendar.seasons[day]
         
-        # 顧客を選択（リピーターは確率高め）
-        customer = random.choice(customers)
-        if 'VIP' in customer['Tags']:
-            # VIP顧客は80%の確率で選ばれる
-            if random.random() > 0.2:
-                customer = random.choice([c for c in customers if 'VIP' in c['Tags']])
-        elif 'リピーター' in customer['Tags']:
-            # リピーターは60%の確率で選ばれる
-            if random.random() > 0.4:
-                customer = random.choice([c for c in customers if 'リピーター' in c['Tags']])
+        # 顧客を選択（plan 指定時は割り当て済み）
+        if plan is None:
+            customer = pick_customer(customers, segments, rng)
+        else:
+            customer = customers[planned_customers[i - start]]
         
         # 商品を選択（季節商品を優先）
-        num_items = random.randint(1, 4)
+        num_items = rng.randint(1, 4)
         selected_products = []
         
         for _ in range(num_items):
-            if random.random() < 0.7:  # 70%の確率で季節商品
-                product_id = random.choice(seasonal_products[season])
+            if rng.random() < 0.7:  # 70%の確率で季節商品
+                product_id = rng.choice(seasonal_products[season])
             else:
-                product_id = random.choice([p['id'] for p in PRODUCTS])
+                product_id = rng.choice(PRODUCT_IDS)
             
-            product = next(p for p in PRODUCTS if p['id'] == product_id)
-            quantity = random.randint(1, 3)
+            product = PRODUCTS_BY_ID[product_id]
+            quantity = rng.randint(1, 3)
             
             # サイズバリアントがある場合
-            if product['category'] in ['海産物', '農産物']:
-                size = random.choice(['小', '中', '大'])
-                price_multiplier = {'小': 0.7, '中': 1.0, '大': 1.5}[size]
-                price = int(product['price'] * price_multiplier)
-                sku = f"{product['sku']}-{size[0]}"
+            if product['category'] in VARIANT_CATEGORIES:
+                size = rng.choice(SIZES)
             else:
                 size = ''
-                price = product['price']
-                sku = product['sku']
-            
-            selected_products.append({
-                'product': product,
-                'quantity': quantity,
-                'price': price,
-                'sku': sku,
-                'size': size
-            })
+            selected_products.append(select_line_item(product, quantity, size))
         
-        # 注文金額を計算
-        subtotal = sum(p['price'] * p['quantity'] for p in selected_products)
-        shipping = 800 if subtotal < 10000 else 0  # 1万円以上送料無料
-        tax = int(subtotal * 0.1)
-        total = subtotal + shipping + tax
+        yield from build_order_rows(order_id, customer, order_date, season, selected_products)
+
+def select_line_item(product, quantity, size):
+    """明細（商品・数量・サイズ）から価格とSKUを決定"""
+    if size:
+        price = int(product['price'] * SIZE_PRICE_MULTIPLIERS[size])
+        sku = f"{product['sku']}-{size[0]}"
+    else:
+        price = product['price']
+        sku = product['sku']
+    return {
+        'product': product,
+        'quantity': quantity,
+        'price': price,
+        'sku': sku,
+        'size': size
+    }
+
+def build_order_rows(order_id, customer, order_date, season, selected_products):
+    """1注文分の行（先頭行＋追加明細行）を生成"""
+    # 注文金額を計算
+    subtotal = sum(p['price'] * p['quantity'] for p in selected_products)
+    shipping = 800 if subtotal < 10000 else 0  # 1万円以上送料無料
+    tax = int(subtotal * 0.1)
+    total = subtotal + shipping + tax
+    
+    # 最初の商品で注文を作成
+    first_product = selected_products[0]
+    name = customer['First Name'] + customer['Last Name']
+    created_at = format_timestamp(order_date)
+    order = ORDER_EXPORT_SCHEMA.fill(ORDER_TEMPLATE, {
+        'Name': name,
+        'Email': customer['Email'],
+        'Paid at': created_at,
+        'Fulfilled at': format_shifted(order_date, 2),
+        'Subtotal': subtotal,
+        'Shipping': shipping,
+        'Taxes': tax,
+        'Total': total,
+        'Created at': created_at,
+        'Lineitem quantity': first_product['quantity'],
+        'Lineitem name': first_product['product']['name'] + (f" ({first_product['size']})" if first_product['size'] else ''),
+        'Lineitem price': first_product['price'],
+        'Lineitem compare at price': int(first_product['price'] * 1.2),
+        'Lineitem sku': first_product['sku'],
+        'Billing Name': name,
+        'Billing City': customer['City'],
+        'Billing Province': customer['Province'],
+        'Billing Phone': customer['Phone'],
+        'Shipping Name': name,
+        'Shipping City': customer['City'],
+        'Shipping Province': customer['Province'],
+        'Shipping Phone': customer['Phone'],
+        'Notes': f"北海道物産品 {season}の注文",
+        'Payment Reference': f'pay-3-{order_id}',
+        'Vendor': first_product['product']['vendor'],
+        'Id': f'ORD-{order_id}',
+        'Tags': f"北海道,{season},{first_product['product']['category']}",
+        'Tax 1 Value': tax,
+        'Phone': customer['Phone'],
+        'Billing Province Name': customer['Province'],
+        'Shipping Province Name': customer['Province'],
+        'Payment ID': f'pay-id-3-{order_id}',
+        'Payment References': f'pay-3-{order_id}',
+        'Customer ID': customer['Customer ID']
+    })
+    yield order
+    
+    # 追加の商品明細（2個目以降）は明細の列だけを上書き
+    for product_data in selected_products[1:]:
+        yield ORDER_EXPORT_SCHEMA.fill(order, {
+            'Id': '',  # 同じ注文の追加明細はIDを空に
+            'Lineitem quantity': product_data['quantity'],
+            'Lineitem name': product_data['product']['name'] + (f" ({product_data['size']})" if product_data['size'] else ''),
+            'Lineitem price': product_data['price'],
+            'Lineitem compare at price': int(product_data['price'] * 1.2),
+            'Lineitem sku': product_data['sku'],
+            'Vendor': product_data['product']['vendor']
+        })
+
+def iter_orders_vectorized(customers, num_orders=1000, start=0, stop=None, seed=None,
+                           batch_size=vectorized.DEFAULT_BATCH_SIZE, seasonal_demand=False, plan=None):
+    """注文データを生成（NumPyでバッチ単位に乱数を一括抽選）
+
+    分布は iter_orders() と同じ（季節商品70%、VIP80%・リピーター60%の偏り）。
+    plan 指定時の顧客・注文日の期間も iter_orders() と同じ。
+    """
+    np = vectorized.require_numpy()
+    rng = vectorized.make_rng(seed)
+    
+    # 日付表（日付・季節）
+    calendar = order_calendar(ORDER_START_DATE, ORDER_END_DATE, seasonal_demand)
+    dates = calendar.dates
+    season_names = list(SEASONAL_PRODUCTS)
+    season_of_day = np.array([season_names.index(s) for s in calendar.seasons])
+    
+    # 顧客セグメントのマスク
+    segments = SegmentIndex(customers)
+    position = {id(c): i for i, c in enumerate(customers)}
+    vip_members = [position[id(c)] for c in segments.members('VIP')]
+    repeater_members = [position[id(c)] for c in segments.members('リピーター')]
+    vip_mask = np.array(['VIP' in c['Tags'] for c in customers])
+    repeater_mask = np.array(['リピーター' in c['Tags'] for c in customers]) & ~vip_mask
+    
+    # 季節別の商品分布（季節商品70%・全商品30%の混合を1回のエイリアス抽選で引く）
+    product_index = {pid: i for i, pid in enumerate(PRODUCT_IDS)}
+    product_weights = []
+    for s in season_names:
+        weights = [0.3 / len(PRODUCTS)] * len(PRODUCTS)
+        for pid in SEASONAL_PRODUCTS[s]:
+            weights[product_index[pid]] += 0.7 / len(SEASONAL_PRODUCTS[s])
+        product_weights.append(weights)
+    season_products = GroupedWeightedSampler(range(len(PRODUCTS)), product_weights)
+    
+    stop = num_orders if stop is None else stop
+    if plan is not None:
+        calendars, offsets = window_calendars(calendar, plan, seasonal_demand)
+    order_id = 3001 + start
+    for batch_start, count in vectorized.iter_batches(stop - start, batch_size):
+        if plan is None:
+            day = calendar.sample(rng, count)
+        else:
+            # 割り当てられた期間ごとに日付表から抽選し、全期間の位置に直す
+            batch = slice(start + batch_start, start + batch_start + count)
+            window = plan.window[batch]
+            day = np.empty(count, dtype=np.int64)
+            for w, (window_calendar, offset) in enumerate(zip(calendars, offsets)):
+                in_window = window == w
+                day[in_window] = offset + window_calendar.sample(rng, int(in_window.sum()))
+        season = season_of_day[day]
         
-        # 最初の商品で注文を作成
-        first_product = selected_products[0]
-        order = {
-            'Name': customer['First Name'] + customer['Last Name'],
-            'Email': customer['Email'],
-            'Financial Status': 'paid',
-            'Paid at': order_date.strftime('%Y-%m-%d %H:%M:%S +0900'),
-            'Fulfillment Status': 'fulfilled',
-            'Fulfilled at': (order_date + timedelta(days=2)).strftime('%Y-%m-%d %H:%M:%S +0900'),
-            'Currency': 'JPY',
-            'Subtotal': subtotal,
-            'Shipping': shipping,
-            'Taxes': tax,
-            'Total': total,
-            'Discount Code': '',
-            'Discount Amount': 0,
-            'Shipping Method': '宅配便',
-            'Created at': order_date.strftime('%Y-%m-%d %H:%M:%S +0900'),
-            'Lineitem quantity': first_product['quantity'],
-            'Lineitem name': first_product['product']['name'] + (f" ({first_product['size']})" if first_product['size'] else ''),
-            'Lineitem price': first_product['price'],
-            'Lineitem compare at price': int(first_product['price'] * 1.2),
-            'Lineitem sku': first_product['sku'],
-            'Lineitem requires shipping': 'true',
-            'Lineitem taxable': 'true',
-            'Lineitem fulfillment status': 'fulfilled',
-            'Billing Name': customer['First Name'] + customer['Last Name'],
-            'Billing Street': '',
-            'Billing Address1': '',
-            'Billing Address2': '',
-            'Billing Company': '',
-            'Billing City': customer['City'],
-            'Billing Zip': '',
-            'Billing Province': customer['Province'],
-            'Billing Country': '日本',
-            'Billing Phone': customer['Phone'],
-            'Shipping Name': customer['First Name'] + customer['Last Name'],
-            'Shipping Street': '',
-            'Shipping Address1': '',
-            'Shipping Address2': '',
-            'Shipping Company': '',
-            'Shipping City': customer['City'],
-            'Shipping Zip': '',
-            'Shipping Province': customer['Province'],
-            'Shipping Country': '日本',
-            'Shipping Phone': customer['Phone'],
-            'Notes': f"北海道物産品 {season}の注文",
-            'Cancelled at': '',
-            'Payment Method': 'クレジットカード',
-            'Payment Reference': f'pay-3-{order_id}',
-            'Refunded Amount': 0,
-            'Vendor': first_product['product']['vendor'],
-            'Outstanding Balance': 0,
-            'Employee': '',
-            'Location': '',
-            'Device ID': '',
-            'Id': f'ORD-{order_id}',
-            'Tags': f"北海道,{season},{first_product['product']['category']}",
-            'Risk Level': 'Low',
-            'Source': 'web',
-            'Lineitem discount': 0,
-            'Tax 1 Name': '消費税 10%',
-            'Tax 1 Value': tax,
-            'Tax 2 Name': '',
-            'Tax 2 Value': '',
-            'Tax 3 Name': '',
-            'Tax 3 Value': '',
-            'Tax 4 Name': '',
-            'Tax 4 Value': '',
-            'Tax 5 Name': '',
-            'Tax 5 Value': '',
-            'Phone': customer['Phone'],
-            'Receipt Number': '',
-            'Duties': 0,
-            'Billing Province Name': customer['Province'],
-            'Shipping Province Name': customer['Province'],
-            'Payment ID': f'pay-id-3-{order_id}',
-            'Payment Terms Name': '',
-            'Next Payment Due At': '',
-            'Payment References': f'pay-3-{order_id}',
-            'Customer ID': customer['Customer ID']
-        }
-        orders.append(order)
+        if plan is None:
+            picked = rng.integers(0, len(customers), size=count)
+            picked = vectorized.biased_pick(rng, picked, vip_mask, vip_members, 0.8)
+            picked = vectorized.biased_pick(rng, picked, repeater_mask, repeater_members, 0.6)
+        else:
+            picked = plan.customer[batch]
         
-        # 追加の商品明細（2個目以降）
-        for product_data in selected_products[1:]:
-            additional_item = order.copy()
-            additional_item['Id'] = ''  # 同じ注文の追加明細はIDを空に
-            additional_item['Lineitem quantity'] = product_data['quantity']
-            additional_item['Lineitem name'] = product_data['product']['name'] + (f" ({product_data['size']})" if product_data['size'] else '')
-            additional_item['Lineitem price'] = product_data['price']
-            additional_item['Lineitem compare at price'] = int(product_data['price'] * 1.2)
-            additional_item['Lineitem sku'] = product_data['sku']
-            additional_item['Vendor'] = product_data['product']['vendor']
-            orders.append(additional_item)
+        num_items = vectorized.randint(rng, 1, 4, count)
+        item_order, item_start = vectorized.expand_items(num_items)
+        total_items = len(item_order)
+        product = season_products.sample_indices(rng, season[item_order])
+        quantity = vectorized.randint(rng, 1, 3, total_items)
+        size = rng.integers(0, len(SIZES), size=total_items)
         
-        order_id += 1
+        # 配列から行を組み立てる
+        day, season, picked = day.tolist(), season.tolist(), picked.tolist()
+        num_items, item_start = num_items.tolist(), item_start.tolist()
+        product, quantity, size = product.tolist(), quantity.tolist(), size.tolist()
+        for i in range(count):
+            selected_products = []
+            for j in range(item_start[i], item_start[i] + num_items[i]):
+                p = PRODUCTS[product[j]]
+                s = SIZES[size[j]] if p['category'] in VARIANT_CATEGORIES else ''
+                selected_products.append(select_line_item(p, quantity[j], s))
+            yield from build_order_rows(
+                order_id, customers[picked[i]], dates[day[i]], season_names[season[i]], selected_products)
+            order_id += 1
+
+def generate_orders(customers, num_orders=1000):
+    """注文データを生成（全行をリストで返す）"""
+    return list(iter_orders(customers, num_orders))
+
+def make_shard_rows(context, start, stop, seed):
+    """シャード1つ分の注文行を生成（sharding.write_sharded_orders_csv から呼ばれる）"""
+    if context['engine'] == 'numpy':
+        return iter_orders_vectorized(context['customers'], context['num_orders'], start, stop,
+                                      seed=seed, batch_size=context['batch_size'],
+                                      seasonal_demand=context['seasonal_demand'], plan=context['plan'])
+    return iter_orders(context['customers'], context['num_orders'], start, stop, rng=random.Random(seed),
+                       seasonal_demand=context['seasonal_demand'], plan=context['plan'])
+
+def order_season(tags):
+    """注文タグ（北海道,季節,カテゴリ）から季節を取り出す"""
+    return tags.split(',')[1]
+
+def order_stats(customers):
+    """顧客セグメント・季節・カテゴリ別に集計する統計コレクタ"""
+    segments = {c['Customer ID']: c['Tags'].split(',')[0] for c in customers}
+    return StatsCollector(
+        order_keys={'segment': ('Customer ID', segments), 'season': ('Tags', order_season)},
+        item_keys={'category': ('Lineitem sku', SKU_CATEGORIES)},
+        customer_ids=segments)
+
+def append_orders(output_dir, until, since=None, orders=None, seed=None, compression=None, log=print):
+    """既存の注文CSVに until までの注文を追記し、ファイル別の行数（追記分）を返す
+
+    顧客は既存の顧客CSVを使い、注文番号は既存の最大値から続ける。
+    orders 未指定時は既存データの1日あたり注文数から件数を見積もる。
+    顧客CSVの購入回数・購入金額には追記分を加算し、集計JSONは追記後の注文CSV全体から作り直す。
+    compression 指定時は圧縮済みの注文CSV（.gz / .zst）に追記する。
+    """
+    if seed is not None:
+        random.seed(seed)
+    orders_name = compressed_name('orders_store3_hokkaido.csv', compression)
+    orders_path = f'{output_dir}/{orders_name}'
+    customers_path = f'{output_dir}/customers_store3_hokkaido.csv'
+    state = append.read_order_state(orders_path)
+    customers = append.read_customers(customers_path)
+    start_date, end_date = append.append_window(state, until, since)
+    num_orders = orders if orders is not None else append.scaled_order_count(state, start_date, end_date)
     
-    return orders
+    log(f"北海道物産品ストアの注文を追記中...（{start_date:%Y-%m-%d} 〜 {end_date:%Y-%m-%d}）")
+    rollup = StatsCollector()
+    counts = append_orders_csv(orders_path, iter_orders(
+        customers, num_orders, start_date=start_date, end_date=end_date,
+        first_order_id=state['last_order_number'] + 1), stats=rollup)
+    if os.path.isdir(columns_dir(orders_path)):
+        # 列ファイルがあれば追記後の注文CSVから作り直す
+        write_order_columns(orders_path)
+    rollup.apply_customer_totals(customers, add=True)
+    write_records_csv(customers_path, customers)
+    order_stats(customers).observe_csv(orders_path).write_json(f'{output_dir}/{SUMMARY_NAME}')
+    log(f"   {counts['rows']}件の注文データ（明細含む）を追記しました。")
+    log(f"   - 注文数: {counts['orders']}件（ORD-{state['last_order_number'] + 1}〜）")
+    log(f"   - 売上合計: {counts['total']:,}円")
+    return {'output_dir': output_dir, 'files': {orders_name: counts['rows']}}
 
-# メイン処理
-if __name__ == '__main__':
-    print("北海道物産品ストアのデモデータを生成中...")
+def run(output_dir=DEFAULT_OUTPUT_DIR, customers=None, orders=None, scale=1.0, seed=None,
+        engine='random', batch_size=vectorized.DEFAULT_BATCH_SIZE, workers=None,
+        shard_size=sharding.DEFAULT_SHARD_SIZE, seasonal_demand=False, skewed_activity=False,
+        activity_alpha=activity.DEFAULT_ALPHA, one_timer_fraction=activity.DEFAULT_ONE_TIMER_FRACTION,
+        dormant_fraction=activity.DEFAULT_DORMANT_FRACTION, dormant_days=activity.DEFAULT_DORMANT_DAYS,
+        catalog_size=None, sort_by_date=False, sort_buffer_rows=extsort.DEFAULT_BUFFER_ROWS,
+        compression=None, columnar=False, cache=False, cache_dir=None, append_until=None, append_since=None,
+        quiet=False):
+    """顧客・商品・注文のCSVを生成し、ファイル別の行数を返す
+
+    customers/orders 未指定時は基準数（150人・1000件）に scale を掛けた数を生成する。
+    skewed_activity=True なら顧客ごとの注文数を裾の重い分布にする（activity.ActivityModel を参照）。
+    catalog_size 指定時は商品CSVを合成商品で catalog_size 行（バリアント数）まで増やす
+    （ストア固有の商品の行数より少ない場合は ValueError）。
+    sort_by_date=True なら注文を Created at 順に並べて出力する（メモリ上には最大 sort_buffer_rows 行、
+    超えた分は一時ファイルで外部マージソート）。
+    compression（'gzip' / 'zstd'）指定時は注文CSVを圧縮して書き出す（書き込みは別スレッド）。
+    columnar=True なら注文CSVの主要列を .npy の列ファイルにも書き出す（columnar.write_order_columns() を参照）。
+    append_until 指定時は既存CSVへの追記のみを行う（append_orders() を参照）。
+    """
+    log = (lambda *args, **kwargs: None) if quiet else print
+    if append_until is not None:
+        return append_orders(output_dir, append_until, append_since, orders, seed, compression, log)
+    num_customers = customers if customers is not None else max(1, round(BASE_CUSTOMERS * scale))
+    num_orders = orders if orders is not None else max(1, round(BASE_ORDERS * scale))
+    
+    # キャッシュ済みなら生成せずに復元（シード未指定の出力は再現できないため対象外）
+    store_cache = key = None
+    if cache and seed is None:
+        log("乱数シードが未指定のため、キャッシュは使用しません。")
+    elif cache:
+        store_cache = GenerationCache(cache_dir)
+        key = cache_key(__file__, {
+            'constants': {'PRODUCTS': PRODUCTS, 'SEASONAL_PRODUCTS': SEASONAL_PRODUCTS, 'SIZES': SIZES,
+                       'SIZE_PRICE_MULTIPLIERS': SIZE_PRICE_MULTIPLIERS},
+            'seed': seed, 'customers': num_customers, 'orders': num_orders, 'engine': engine,
+            'seasonal_demand': seasonal_demand,
+            'activity': [activity_alpha, one_timer_fraction, dormant_fraction, dormant_days] if skewed_activity else None,
+            'catalog_size': catalog_size, 'sort_by_date': sort_by_date, 'compression': compression,
+            'columnar': columnar,
+            'batch_size': batch_size if engine == 'numpy' else None,
+            'shard_size': shard_size if workers else None,
+        })
+        manifest = store_cache.restore(key, output_dir)
+        if manifest:
+            log(f"キャッシュから復元しました（{key[:12]}）: {output_dir}/")
+            return {'output_dir': output_dir, 'files': manifest_rows(manifest)}
+    
+    if seed is not None:
+        random.seed(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    files = {}
     
-    # 顧客データ生成
-    print("1. 顧客データを生成中...")
-    customers = generate_customers(150)
+    log("北海道物産品ストアのデモデータを生成中...")
     
-    # 顧客データ保存
-    with open(f'{output_dir}/customers_store3_hokkaido.csv', 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=list(customers[0].keys()))
-        writer.writeheader()
-        writer.writerows(customers)
-    print(f"   {len(customers)}件の顧客データを生成しました。")
+    # 顧客データ生成（CSVは注文の集計値を反映してから保存）
+    log("1. 顧客データを生成中...")
+    customers = generate_customers(num_customers, seed)
+    log(f"   {len(customers)}件の顧客データを生成しました。")
     
-    # 商品データ生成
-    print("2. 商品データを生成中...")
+    # 商品データ生成・保存
+    log("2. 商品データを生成中...")
     products_csv = generate_products()
+    products_path = f'{output_dir}/products_store3_hokkaido.csv'
+    if catalog_size:
+        # 注文で使う商品を先頭に置き、残りは合成商品をストリーミングで書き出す
+        files['products_store3_hokkaido.csv'] = write_catalog_csv(
+            products_path, catalog_size, products_csv,
+            seed=sharding.shard_seed(seed, 'catalog') if seed is not None else None,
+            handle_prefix='hkd-cat', sku_prefix='HKC', vendor='北海道物産デモ')
+    else:
+        files['products_store3_hokkaido.csv'] = write_records_csv(products_path, products_csv)
+    log(f"   {files['products_store3_hokkaido.csv']:,}件の商品データを生成しました。")
     
-    # 商品データ保存
-    with open(f'{output_dir}/products_store3_hokkaido.csv', 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=list(products_csv[0].keys()))
-        writer.writeheader()
-        writer.writerows(products_csv)
-    print(f"   {len(products_csv)}件の商品データを生成しました。")
+    # 注文データ生成・保存（1行ずつ書き出し、統計は書き出しと同時に集計）
+    log("3. 注文データを生成中...")
+    orders_name = compressed_name('orders_store3_hokkaido.csv', compression)
+    orders_path = f'{output_dir}/{orders_name}'
+    stats = order_stats(customers)
+    plan = None
+    if skewed_activity:
+        # 注文→顧客の割り当てはエンジン・ワーカー数によらず同じシードから作る
+        model = activity.ActivityModel(activity_alpha, one_timer_fraction, dormant_fraction, dormant_days)
+        plan = model.plan(num_customers, num_orders, sharding.shard_seed(seed, 'activity') if seed is not None else None)
+        summary = plan.summary()
+        log(f"   - 偏りモード: 最多{summary['max_orders']:,}件、1回購入{summary['one_timers']:,}人、"
+            f"休眠{summary['dormant']:,}人（最終注文が{dormant_days}日以上前）")
+    if workers:
+        context = {'customers': customers, 'num_orders': num_orders, 'engine': engine,
+                   'batch_size': batch_size, 'seasonal_demand': seasonal_demand, 'plan': plan}
+        counts = sharding.write_sharded_orders_csv(
+            orders_path, make_shard_rows, context, num_orders,
+            seed=seed, workers=workers, shard_size=shard_size, stats=stats)
+        if sort_by_date:
+            extsort.sort_orders_csv(orders_path, sort_buffer_rows)
+    else:
+        if engine == 'numpy':
+            rows = iter_orders_vectorized(customers, num_orders, seed=seed, batch_size=batch_size,
+                                          seasonal_demand=seasonal_demand, plan=plan)
+        else:
+            rows = iter_orders(customers, num_orders, seasonal_demand=seasonal_demand, plan=plan)
+        if sort_by_date:
+            rows = extsort.iter_sorted_orders(rows, sort_buffer_rows)
+        counts = write_orders_csv(orders_path, rows, stats=stats)
+    files[orders_name] = counts['rows']
+    log(f"   {counts['rows']}件の注文データ（明細含む）を生成しました。")
+    log(f"   - 注文数: {counts['orders']}件")
+    log(f"   - 売上合計: {counts['total']:,}円")
+    for segment in ('VIP', 'リピーター', '一般顧客'):
+        log(f"   - {segment}: {stats.count('segment', segment)}件")
+    stats.write_json(f'{output_dir}/{SUMMARY_NAME}')
+    extra_files = [SUMMARY_NAME]
+    if columnar:
+        write_order_columns(orders_path)
+        extra_files += column_files(orders_path)
+        log(f"   - 列ファイル: {os.path.basename(columns_dir(orders_path))}/")
     
-    # 注文データ生成
-    print("3. 注文データを生成中...")
-    orders = generate_orders(customers, 1000)
+    # 顧客データ保存（購入回数・購入金額は注文の集計値）
+    log("4. 顧客データを保存中...")
+    stats.apply_customer_totals(customers)
+    files['customers_store3_hokkaido.csv'] = write_records_csv(
+        f'{output_dir}/customers_store3_hokkaido.csv', customers)
+    log("   購入回数・購入金額を注文データから集計しました。")
     
-    # 注文データ保存
-    with open(f'{output_dir}/orders_store3_hokkaido.csv', 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=list(orders[0].keys()))
-        writer.writeheader()
-        writer.writerows(orders)
-    print(f"   {len(orders)}件の注文データ（明細含む）を生成しました。")
+    if store_cache:
+        store_cache.save(key, output_dir, files, extra_files=extra_files)
     
-    print("\n生成完了！")
-    print(f"保存先: {output_dir}/")
-    print("- customers_store3_hokkaido.csv")
-    print("- products_store3_hokkaido.csv")
-    print("- orders_store3_hokkaido.csv")
\ No newline at end of file
+    log("\n生成完了！")
+    log(f"保存先: {output_dir}/")
+    for name in [*files, SUMMARY_NAME]:
+        log(f"- {name}")
+    return {'output_dir': output_dir, 'files': files}
+
+def parse_args():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description='北海道物産品ストアのデモデータを生成')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help='出力先ディレクトリ')
+    parser.add_argument('--customers', type=int, default=None, help=f'顧客数（デフォルト: {BASE_CUSTOMERS}×scale）')
+    parser.add_argument('--orders', type=int, default=None, help=f'注文数（デフォルト: {BASE_ORDERS}×scale）')
+    parser.add_argument('--scale', type=float, default=1.0, help='データ量の倍率（デフォルト: 1.0）')
+    parser.add_argument('--seed', type=int, default=None, help='乱数シード（指定時は再現可能な出力）')
+    parser.add_argument('--engine', choices=['random', 'numpy'], default='random',
+                        help='注文の乱数生成方式（numpy: バッチ単位で一括抽選、大規模データ向け）')
+    parser.add_argument('--batch-size', type=int, default=vectorized.DEFAULT_BATCH_SIZE,
+                        help='numpyモードで一度に抽選する注文数')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='シャード分割して並列生成するプロセス数（指定時のみ有効、出力はワーカー数に依存しない）')
+    parser.add_argument('--shard-size', type=int, default=sharding.DEFAULT_SHARD_SIZE,
+                        help='1シャードあたりの注文数')
+    parser.add_argument('--seasonal-demand', action='store_true',
+                        help='注文日を季節・イベントの需要の重みで抽選（年末・夏のピーク、週末・祝日の増加）')
+    parser.add_argument('--skewed-activity', action='store_true',
+                        help='顧客ごとの注文数を裾の重い分布にする（一部の顧客に集中、1回購入・休眠顧客が多数）')
+    parser.add_argument('--activity-alpha', type=float, default=activity.DEFAULT_ALPHA,
+                        help='偏りモードの Pareto 分布の形状（小さいほど一部の顧客に集中）')
+    parser.add_argument('--one-timer-fraction', type=float, default=activity.DEFAULT_ONE_TIMER_FRACTION,
+                        help='偏りモードで1回だけ購入する顧客の割合')
+    parser.add_argument('--dormant-fraction', type=float, default=activity.DEFAULT_DORMANT_FRACTION,
+                        help='偏りモードの休眠顧客の割合')
+    parser.add_argument('--dormant-days', type=int, default=activity.DEFAULT_DORMANT_DAYS,
+                        help='休眠顧客の最終注文が期間末より何日以上前か')
+    parser.add_argument('--catalog-size', type=int, default=None,
+                        help='商品CSVの行数（バリアント数、ストア固有の商品の行数以上）。'
+                             '指定時は合成商品で増やす（最大100万SKU規模）')
+    parser.add_argument('--sort-by-date', action='store_true',
+                        help='注文を Created at 順に並べて出力（明細行は注文ごとにまとめたまま）')
+    parser.add_argument('--sort-buffer-rows', type=int, default=extsort.DEFAULT_BUFFER_ROWS,
+                        help='並べ替えでメモリに保持する最大行数（超えた分は一時ファイルで外部マージソート）')
+    parser.add_argument('--compression', choices=list(COMPRESSION_SUFFIXES), default=None,
+                        help='注文CSVを gzip / zstd で圧縮して出力（.gz / .zst、zstd は zstandard が必要）')
+    parser.add_argument('--columnar', action='store_true',
+                        help='注文CSVの主要列を型付きの .npy（orders_*.columns/）にも書き出す（numpy が必要、mmap で高速に読み込める）')
+    parser.add_argument('--cache', action='store_true',
+                        help='同じ入力（定数・シード・データ量・コード）の生成結果をキャッシュから再利用')
+    parser.add_argument('--cache-dir', default=None,
+                        help='キャッシュの保存先（デフォルト: $DEMO_DATAGEN_CACHE または ~/.cache/shopify-demo-datagen）')
+    parser.add_argument('--append-until', type=append.parse_date, default=None, metavar='YYYY-MM-DD',
+                        help='既存CSVの最終注文日の翌日からこの日までの注文を追記（顧客・商品は既存のまま）')
+    parser.add_argument('--append-since', type=append.parse_date, default=None, metavar='YYYY-MM-DD',
+                        help='追記する期間の開始日（デフォルト: 既存データの最終注文日の翌日）')
+    parser.add_argument('--sqlite', default=None, metavar='PATH',
+                        help='生成後に顧客・商品・注文を SQLite の分析DBミラー（Customers / Orders / OrderItems 等）へ投入')
+    parser.add_argument('--sqlserver', choices=SQLSERVER_FORMATS, default=None,
+                        help='生成後に SQL Server への一括投入ファイルを sqlserver/ に書き出す'
+                             '（insert: 1000行ずつの INSERT スクリプト、bcp: bcp / BULK INSERT 用のデータ・フォーマットファイル）')
+    parser.add_argument('--store-id', type=int, default=STORE_ID,
+                        help=f'SQLite・SQL Server へ投入するときの StoreId（デフォルト: {STORE_ID}、同じ StoreId の既存データは入れ替え）')
+    args = parser.parse_args()
+    base_rows = len(generate_products())
+    if args.catalog_size is not None and args.catalog_size < base_rows:
+        parser.error(f'--catalog-size はストア固有の商品の行数（{base_rows}）以上を指定してください')
+    return args
+
+# メイン処理
+if __name__ == '__main__':
+    args = vars(parse_args())
+    sqlite_path, sqlserver, store_id = args.pop('sqlite'), args.pop('sqlserver'), args.pop('store_id')
+    result = run(**args)
+    if sqlserver:
+        seed = write_seed_files(result['output_dir'], result['files'], store_id, sqlserver)
+        print(f"SQL Server 用のシード（{sqlserver}）を書き出しました: {os.path.dirname(seed['paths'][0])}/"
+              f"（00〜99 の番号順に実行）")
+    if sqlite_path:
+        counts = load_store_output(sqlite_path, store_id, result['output_dir'], result['files'])
+        print(f"SQLite（{sqlite_path}）へ投入しました: StoreId={store_id}、顧客{counts['customers']:,}件、"
+              f"注文{counts['orders']:,}件（明細{counts['order_items']:,}件）")
@@ -7,14 +7,44 @@ Store ID: 4
 期間: 2016年1月〜2017年3月（閉店）、2018年6月〜2025年7月（復活後）
 """
 
-import csv
+import argparse
+from collections import Counter
+import math
 import random
 from datetime import datetime, timedelta
 import os
 
-# 出力ディレクトリの作成
-output_dir = '../data/staging/store4_maeyao'
-os.makedirs(output_dir, exist_ok=True)
+from demo_datagen import append, extsort, sharding, vectorized
+from demo_datagen.calendar_table import DayCalendar
+from demo_datagen.cache import GenerationCache, cache_key, manifest_rows
+from demo_datagen.columnar import column_files, columns_dir, write_order_columns
+from demo_datagen.csvout import (
+    COMPRESSION_SUFFIXES, append_orders_csv, compressed_name, merge_counts, write_orders_csv, write_records_csv,
+)
+from demo_datagen.identity import IdentityGenerator
+from demo_datagen.orders import iter_orders as iter_csv_orders
+from demo_datagen.schema import ORDER_EXPORT_DEFAULTS, ORDER_EXPORT_SCHEMA
+from demo_datagen.sampling import WeightedSampler
+from demo_datagen.segments import SegmentIndex
+from demo_datagen.sqlite_mirror import load_store_output
+from demo_datagen.sqlserver_seed import FORMATS as SQLSERVER_FORMATS, write_seed_files
+from demo_datagen.stats import StatsCollector
+from demo_datagen.subscriptions import SubscriptionScheduler, add_months
+from demo_datagen.timestamps import format_shifted, format_timestamp, parse_timestamp
+
+# 出力ディレクトリ（data/staging/store4_maeyao）
+DEFAULT_OUTPUT_DIR = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'staging', 'store4_maeyao'))
+
+# scale=1.0 のときのデータ数
+BASE_CUSTOMERS = 200
+BASE_ORDERS = 800
+
+# 集計結果（StatsCollector）のJSON
+SUMMARY_NAME = 'summary_store4_maeyao.json'
+
+# 分析DBでのストアID（SQLite ミラーへの投入時の既定値）
+STORE_ID = 4
 
 # カレー商品データ
 CURRY_PRODUCTS = [
@@ -51,42 +81,22 @@ CURRY_PRODUCTS = [
 CUSTOMER_TYPES = {
     'og_fan': {  # 2017年以前からのファン
         'ratio': 0.15,
-        'min_orders': 20,
-        'max_orders': 50,
-        'min_spent': 50000,
-        'max_spent': 200000,
         'tags': 'OGファン,VIP,激辛愛好家'
     },
     'revival_supporter': {  # 復活を支援した顧客
         'ratio': 0.25,
-        'min_orders': 10,
-        'max_orders': 30,
-        'min_spent': 30000,
-        'max_spent': 100000,
         'tags': '復活支援者,リピーター'
     },
     'regular': {  # 定期購入者
         'ratio': 0.20,
-        'min_orders': 8,
-        'max_orders': 24,
-        'min_spent': 25000,
-        'max_spent': 80000,
         'tags': 'サブスク会員,リピーター'
     },
     'spicy_lover': {  # 激辛愛好家
         'ratio': 0.15,
-        'min_orders': 5,
-        'max_orders': 15,
-        'min_spent': 15000,
-        'max_spent': 50000,
         'tags': '激辛愛好家'
     },
     'casual': {  # 一般顧客
         'ratio': 0.25,
-        'min_orders': 1,
-        'max_orders': 5,
-        'min_spent': 3000,
-        'max_spent': 20000,
         'tags': '一般顧客'
     }
 }
@@ -104,33 +114,16 @@ REGIONS = [
     {'name': '千葉県', 'city': '千葉', 'ratio': 0.05, 'is_local': False},
     {'name': 'その他', 'city': '全国', 'ratio': 0.05, 'is_local': False},
 ]
+REGION_SAMPLER = WeightedSampler(REGIONS, [r['ratio'] for r in REGIONS])
+LOCAL_REGIONS = [r for r in REGIONS if r['is_local']]
 
-def generate_customer_name():
-    """顧客名を生成"""
-    last_names = ['佐藤', '鈴木', '高橋', '田中', '伊藤', '渡辺', '山本', '中村', '小林', '加藤']
-    first_names_male = ['太郎', '次郎', '健太', '翔太', '大輝', '拓也', '直樹', '誠', '隆', '浩']
-    first_names_female = ['花子', '美咲', '愛', '彩', '舞', '優子', '真由美', '恵子', '幸子', '陽子']
-    
-    last_name = random.choice(last_names)
-    if random.random() < 0.5:
-        first_name = random.choice(first_names_male)
-    else:
-        first_name = random.choice(first_names_female)
-    
-    return f"{last_name}{first_name}"
-
-def select_region():
+def select_region(rng=random):
     """確率に基づいて地域を選択"""
-    rand = random.random()
-    cumulative = 0
-    for region in REGIONS:
-        cumulative += region['ratio']
-        if rand < cumulative:
-            return region
-    return REGIONS[-1]
-
-def generate_customers(num_customers=200):
-    """顧客データを生成"""
+    return REGION_SAMPLER.draw(rng)
+
+def generate_customers(num_customers=200, seed=None):
+    """顧客データを生成（氏名・電話番号は顧客番号から重複なく決める）"""
+    identities = IdentityGenerator(seed, 'store4')
     customers = []
     customer_id = 4001  # Store 4の顧客は4001から
     
@@ -138,18 +131,18 @@ def generate_customers(num_customers=200):
         num_type_customers = int(num_customers * config['ratio'])
         
         for i in range(num_type_customers):
-            name = generate_customer_name()
+            last_name, first_name = identities.name(customer_id - 4001)
             region = select_region()
             
             # OGファンと復活支援者は早稲田周辺率が高い
             if customer_type in ['og_fan', 'revival_supporter']:
                 if random.random() < 0.6:
-                    region = random.choice([r for r in REGIONS if r['is_local']])
+                    region = random.choice(LOCAL_REGIONS)
             
             customer = {
                 'Customer ID': f'CUST-{customer_id}',
-                'First Name': name[1:],
-                'Last Name': name[0],
+                'First Name': first_name,
+                'Last Name': last_name,
                 'Email': f'maeyao-{customer_type}-{customer_id}@example.com',
                 'Accepts Email Marketing': 'yes' if customer_type != 'casual' else random.choice(['yes', 'no']),
                 'Company': '',
@@ -161,16 +154,15 @@ def generate_customers(num_customers=200):
                 'Country': '日本',
                 'Country Code': 'JP',
                 'Zip': '',
-                'Phone': f'090-{random.randint(1000,9999)}-{random.randint(1000,9999)}',
+                'Phone': identities.phone(customer_id - 4001),
                 'Accepts SMS Marketing': 'yes' if customer_type in ['og_fan', 'revival_supporter'] else 'no',
-                'Total Spent': random.randint(config['min_spent'], config['max_spent']),
-                'Total Orders': random.randint(config['min_orders'], config['max_orders']),
+                'Total Spent': 0,  # 購入金額・購入回数は注文の生成後に集計値で埋める
+                'Total Orders': 0,
                 'Tags': config['tags'],
                 'Note': f'{customer_type}タイプの顧客',
                 'Tax Exempt': 'no',
                 'Company / 店舗名': '',
                 'Industry / 業種名': '',
-                'Phone': f'090-{random.randint(1000,9999)}-{random.randint(1000,9999)}',
                 'Created At': '',
                 'Updated At': ''
             }
@@ -226,108 +218,224 @@ def generate_products():
     
     return products_csv
 
-def generate_orders(customers, num_orders=800):
-    """注文データを生成（閉店期間を考慮）"""
-    orders = []
-    order_id = 4001  # Store 4の注文は4001から
-    
-    # 期間設定
-    # Phase 1: 2016年1月〜2017年3月（閉店前）
-    phase1_start = datetime(2016, 1, 1)
-    phase1_end = datetime(2017, 3, 31)
+# 注文行のテンプレート（注文ごとに変わらない列）
+ORDER_TEMPLATE = ORDER_EXPORT_SCHEMA.template({
+    **ORDER_EXPORT_DEFAULTS,
+    'Payment Method': 'クレジットカード',
+    'Vendor': '早稲田メーヤウ',
+    'Duties': 0,
+})
+
+# 期間設定
+# Phase 1: 2016年1月〜2017年3月（閉店前）
+PHASE1_START = datetime(2016, 1, 1)
+PHASE1_END = datetime(2017, 3, 31)
+
+# Phase 2: 2018年6月〜現在（復活後）
+PHASE2_START = datetime(2018, 6, 1)
+PHASE2_END = datetime(2025, 7, 28)
+
+# 復活初期（復活支援者の注文が多い期間）の終わり
+REVIVAL_PERIOD_END = datetime(2019, 1, 1)
+
+# 定期便（--subscriptions 指定時）の毎月の解約率
+SUBSCRIPTION_MONTHLY_CHURN = 0.04
+
+# SKU→カテゴリ（集計用）
+SKU_CATEGORIES = {p['sku']: p['category'] for p in CURRY_PRODUCTS}
+
+# 顧客タイプ別の商品候補（選択傾向ごとに一度だけ絞り込む）
+SPICY_PRODUCTS = [p for p in CURRY_PRODUCTS if p['spice_level'] >= 4]
+SUBSCRIPTION_PRODUCTS = [p for p in CURRY_PRODUCTS if 'サブスクリプション' in p['category']]
+SAFE_PRODUCTS = [p for p in CURRY_PRODUCTS if p['spice_level'] <= 3 or 'セット' in p['category']]
+
+# 選択傾向ごとの (商品候補, 明細数の範囲, 数量の範囲)（random / numpy 両エンジン共通）
+PREFERENCES = {
+    'spicy': (SPICY_PRODUCTS, (2, 4), (1, 3)),  # 激辛愛好家: 激辛商品を中心に
+    'subscription': (SUBSCRIPTION_PRODUCTS, (1, 1), (1, 1)),  # サブスク会員: 定期便
+    'fan': (CURRY_PRODUCTS, (3, 6), (1, 2)),  # OGファン・復活支援者: バラエティ豊かに
+    'casual': (SAFE_PRODUCTS, (1, 2), (1, 1)),  # 一般顧客: お試しセットや定番商品
+}
+
+# --subscriptions 指定時の通常の注文の選択傾向（定期便はスケジューラだけが作るため、
+# 定期便の商品とサブスク会員の傾向を除く）
+REGULAR_PREFERENCES = {
+    name: ([p for p in products if p not in SUBSCRIPTION_PRODUCTS], items, quantities)
+    for name, (products, items, quantities) in PREFERENCES.items() if name != 'subscription'
+}
+
+def product_preference(customer_tags):
+    """顧客タグから商品の選択傾向を判定"""
+    if '激辛愛好家' in customer_tags:
+        return 'spicy'
+    elif 'サブスク会員' in customer_tags:
+        return 'subscription'
+    elif any(tag in customer_tags for tag in ['OGファン', '復活支援者']):
+        return 'fan'
+    else:
+        return 'casual'
+
+def regular_order_customers(customers, subscriptions=False):
+    """通常の注文の顧客候補（subscriptions=True ならサブスク会員を除く）"""
+    if not subscriptions:
+        return customers
+    regular = [c for c in customers if 'サブスク会員' not in c['Tags']]
+    if not regular:
+        raise ValueError('--subscriptions では、サブスク会員以外の顧客が1人以上必要です')
+    return regular
+
+# 顧客タイプ別の商品選択傾向
+def select_products_for_customer(customer_tags, rng=random, preferences=PREFERENCES):
+    """顧客タグの選択傾向（preferences）に従って (商品, 数量) のリストを選ぶ
+
+    明細数・数量は範囲の上限と下限が同じなら乱数を引かない。
+    """
+    products, (min_items, max_items), (min_quantity, max_quantity) = preferences[product_preference(customer_tags)]
+    num_items = rng.randint(min_items, max_items) if min_items < max_items else min_items
+    selected_products = []
+    for _ in range(num_items):
+        product = rng.choice(products)
+        quantity = rng.randint(min_quantity, max_quantity) if min_quantity < max_quantity else min_quantity
+        selected_products.append((product, quantity))
+    return selected_products
+
+def iter_orders(customers, num_orders=800, start=0, stop=None, rng=random,
+                date_range=None, first_order_id=4001, subscriptions=False):
+    """注文データを1行ずつ生成（閉店期間を考慮）
+
+    start/stop を指定すると、その範囲の注文番号だけを生成する（シャード分割用）。
+    date_range=(開始日, 終了日) を指定すると、全注文を復活後としてその期間で生成する（追記用）。
+    subscriptions=True なら定期便を iter_subscription_orders() に任せ、サブスク会員と定期便の商品を除く。
+    """
+    stop = num_orders if stop is None else stop
+    customers = regular_order_customers(customers, subscriptions)
+    preferences = REGULAR_PREFERENCES if subscriptions else PREFERENCES
+    phase1_calendar = DayCalendar(PHASE1_START, PHASE1_END)
+    phase2_calendar = DayCalendar(*(date_range or (PHASE2_START, PHASE2_END)))
     
-    # Phase 2: 2018年6月〜現在（復活後）
-    phase2_start = datetime(2018, 6, 1)
-    phase2_end = datetime(2025, 7, 28)
+    # 注文の30%を閉店前、70%を復活後に配分（追記時は全て復活後）
+    phase1_orders = 0 if date_range else int(num_orders * 0.3)
     
-    # 注文の30%を閉店前、70%を復活後に配分
-    phase1_orders = int(num_orders * 0.3)
-    phase2_orders = num_orders - phase1_orders
+    # タグ別の顧客リストを一度だけ構築
+    segments = SegmentIndex(customers)
+    og_customers = segments.members('OGファン')
+    revival_customers = segments.members('復活支援者', 'OGファン')
     
-    # 顧客タイプ別の商品選択傾向
-    def select_products_for_customer(customer_tags):
-        selected_products = []
-        
-        # 激辛愛好家
-        if '激辛愛好家' in customer_tags:
-            # 激辛商品を中心に選択
-            spicy_products = [p for p in CURRY_PRODUCTS if p['spice_level'] >= 4]
-            num_items = random.randint(2, 4)
-            for _ in range(num_items):
-                product = random.choice(spicy_products)
-                quantity = random.randint(1, 3)
-                selected_products.append((product, quantity))
+    for i in range(start, stop):
+        order_id = first_order_id + i  # Store 4の注文は4001から
         
-        # サブスク会員
-        elif 'サブスク会員' in customer_tags:
-            # 定期便を選択
-            sub_products = [p for p in CURRY_PRODUCTS if 'サブスクリプション' in p['category']]
-            product = random.choice(sub_products)
-            selected_products.append((product, 1))
-        
-        # OGファン・復活支援者
-        elif any(tag in customer_tags for tag in ['OGファン', '復活支援者']):
-            # バラエティ豊かに選択
-            num_items = random.randint(3, 6)
-            for _ in range(num_items):
-                product = random.choice(CURRY_PRODUCTS)
-                quantity = random.randint(1, 2)
-                selected_products.append((product, quantity))
-        
-        # 一般顧客
+        if i < phase1_orders:
+            # Phase 1の注文生成（閉店前）
+            order_date = phase1_calendar.dates[phase1_calendar.draw(rng)]
+            
+            # OGファンを中心に選択
+            if og_customers and rng.random() < 0.7:
+                customer = rng.choice(og_customers)
+            else:
+                customer = rng.choice(customers)
         else:
-            # お試しセットや定番商品
-            safe_products = [p for p in CURRY_PRODUCTS if p['spice_level'] <= 3 or 'セット' in p['category']]
-            num_items = random.randint(1, 2)
-            for _ in range(num_items):
-                product = random.choice(safe_products)
-                quantity = 1
-                selected_products.append((product, quantity))
+            # Phase 2の注文生成（復活後）
+            order_date = phase2_calendar.dates[phase2_calendar.draw(rng)]
+            
+            # 復活初期は復活支援者が多い
+            if order_date < REVIVAL_PERIOD_END:
+                if revival_customers and rng.random() < 0.8:
+                    customer = rng.choice(revival_customers)
+                else:
+                    customer = rng.choice(customers)
+            else:
+                # 通常の顧客分布
+                customer = rng.choice(customers)
         
-        return selected_products
+        selected_products = select_products_for_customer(customer['Tags'], rng, preferences)
+        yield from build_order_rows(order_id, customer, order_date, selected_products)
+
+def generate_orders(customers, num_orders=800):
+    """注文データを生成（全行をリストで返す）"""
+    return list(iter_orders(customers, num_orders))
+
+def iter_orders_vectorized(customers, num_orders=800, start=0, stop=None, seed=None,
+                           batch_size=vectorized.DEFAULT_BATCH_SIZE, subscriptions=False):
+    """注文データを生成（NumPyでバッチ単位に乱数を一括抽選）
+
+    分布は generate_orders() と同じ（閉店前30%・復活後70%、OGファン70%・復活支援者80%の偏り）。
+    subscriptions の扱いも iter_orders() と同じ。
+    """
+    np = vectorized.require_numpy()
+    rng = vectorized.make_rng(seed)
+    customers = regular_order_customers(customers, subscriptions)
+    preferences = REGULAR_PREFERENCES if subscriptions else PREFERENCES
     
-    # Phase 1の注文生成（閉店前）
-    og_customers = [c for c in customers if 'OGファン' in c['Tags']]
-    for i in range(phase1_orders):
-        days_between = (phase1_end - phase1_start).days
-        random_days = random.randint(0, days_between)
-        order_date = phase1_start + timedelta(days=random_days)
-        
-        # OGファンを中心に選択
-        if og_customers and random.random() < 0.7:
-            customer = random.choice(og_customers)
-        else:
-            customer = random.choice(customers)
-        
-        create_order(orders, order_id, customer, order_date, select_products_for_customer)
-        order_id += 1
+    segments = SegmentIndex(customers)
+    position = {id(c): i for i, c in enumerate(customers)}
+    og_members = np.array([position[id(c)] for c in segments.members('OGファン')], dtype=np.int64)
+    revival_members = np.array([position[id(c)] for c in segments.members('復活支援者', 'OGファン')], dtype=np.int64)
+    
+    # 顧客ごとの選択傾向と、傾向別の商品候補・明細数・数量
+    preference_names = list(preferences)
+    preference = np.array([preference_names.index(product_preference(c['Tags'])) for c in customers])
+    product_index = {id(p): i for i, p in enumerate(CURRY_PRODUCTS)}
+    pools = vectorized.RaggedPools(
+        [[product_index[id(p)] for p in preferences[name][0]] for name in preference_names])
+    item_low = [preferences[name][1][0] for name in preference_names]
+    item_high = [preferences[name][1][1] for name in preference_names]
+    quantity_low = [preferences[name][2][0] for name in preference_names]
+    quantity_high = [preferences[name][2][1] for name in preference_names]
+    
+    def pick_from(members, use_members, count):
+        picked = rng.integers(0, len(customers), size=count)
+        if len(members):
+            picked = np.where(use_members, members[rng.integers(0, len(members), size=count)], picked)
+        return picked
     
-    # Phase 2の注文生成（復活後）
-    for i in range(phase2_orders):
-        days_between = (phase2_end - phase2_start).days
-        random_days = random.randint(0, days_between)
-        order_date = phase2_start + timedelta(days=random_days)
+    # 注文の30%を閉店前、70%を復活後に配分（注文番号の範囲で区切る）
+    stop = num_orders if stop is None else stop
+    phase1_orders = int(num_orders * 0.3)
+    phases = [
+        (PHASE1_START, PHASE1_END, 0, phase1_orders),
+        (PHASE2_START, PHASE2_END, phase1_orders, num_orders),
+    ]
+    
+    for phase_start, phase_end, phase_first, phase_last in phases:
+        first, last = max(start, phase_first), min(stop, phase_last)
+        if first >= last:
+            continue
+        order_id = 4001 + first
+        calendar = DayCalendar(phase_start, phase_end)
+        dates = calendar.dates
+        revival_days = calendar.index_of(REVIVAL_PERIOD_END)
         
-        # 復活初期は復活支援者が多い
-        if order_date < datetime(2019, 1, 1):
-            revival_customers = [c for c in customers if '復活支援者' in c['Tags'] or 'OGファン' in c['Tags']]
-            if revival_customers and random.random() < 0.8:
-                customer = random.choice(revival_customers)
+        for _, count in vectorized.iter_batches(last - first, batch_size):
+            day = calendar.sample(rng, count)
+            if phase_start == PHASE1_START:
+                # OGファンを中心に選択
+                picked = pick_from(og_members, rng.random(count) < 0.7, count)
             else:
-                customer = random.choice(customers)
-        else:
-            # 通常の顧客分布
-            customer = random.choice(customers)
-        
-        create_order(orders, order_id, customer, order_date, select_products_for_customer)
-        order_id += 1
-    
-    return orders
+                # 復活初期は復活支援者が多い
+                in_revival = day < revival_days
+                picked = pick_from(revival_members, in_revival & (rng.random(count) < 0.8), count)
+            
+            group = preference[picked]
+            num_items = vectorized.randint_by_group(rng, group, item_low, item_high)
+            item_order, item_start = vectorized.expand_items(num_items)
+            item_group = group[item_order]
+            product = pools.choice(rng, item_group)
+            quantity = vectorized.randint_by_group(rng, item_group, quantity_low, quantity_high)
+            
+            # 配列から行を組み立てる
+            day, picked = day.tolist(), picked.tolist()
+            num_items, item_start = num_items.tolist(), item_start.tolist()
+            product, quantity = product.tolist(), quantity.tolist()
+            for i in range(count):
+                selected_products = [
+                    (CURRY_PRODUCTS[product[j]], quantity[j])
+                    for j in range(item_start[i], item_start[i] + num_items[i])
+                ]
+                yield from build_order_rows(order_id, customers[picked[i]], dates[day[i]], selected_products)
+                order_id += 1
 
-def create_order(orders, order_id, customer, order_date, product_selector):
-    """個別の注文を作成"""
-    selected_products = product_selector(customer['Tags'])
-    
+def build_order_rows(order_id, customer, order_date, selected_products):
+    """1注文分の行（先頭行＋追加明細行）を生成"""
     # 注文金額を計算
     subtotal = sum(p[0]['price'] * p[1] for p in selected_products)
     shipping = 800 if subtotal < 13000 else 0  # 13,000円以上送料無料
@@ -336,157 +444,380 @@ def create_order(orders, order_id, customer, order_date, product_selector):
     
     # 最初の商品で注文を作成
     first_product, first_quantity = selected_products[0]
+    name = customer['First Name'] + customer['Last Name']
+    created_at = format_timestamp(order_date)
     
-    order = {
-        'Name': customer['First Name'] + customer['Last Name'],
+    order = ORDER_EXPORT_SCHEMA.fill(ORDER_TEMPLATE, {
+        'Name': name,
         'Email': customer['Email'],
-        'Financial Status': 'paid',
-        'Paid at': order_date.strftime('%Y-%m-%d %H:%M:%S +0900'),
-        'Fulfillment Status': 'fulfilled',
-        'Fulfilled at': (order_date + timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S +0900'),
-        'Currency': 'JPY',
+        'Paid at': created_at,
+        'Fulfilled at': format_shifted(order_date, 1),
         'Subtotal': subtotal,
         'Shipping': shipping,
         'Taxes': tax,
         'Total': total,
-        'Discount Code': '',
-        'Discount Amount': 0,
-        'Shipping Method': '宅配便',
-        'Created at': order_date.strftime('%Y-%m-%d %H:%M:%S +0900'),
+        'Created at': created_at,
         'Lineitem quantity': first_quantity,
         'Lineitem name': first_product['name'],
         'Lineitem price': first_product['price'],
         'Lineitem compare at price': int(first_product['price'] * 1.2),
         'Lineitem sku': first_product['sku'],
-        'Lineitem requires shipping': 'true',
-        'Lineitem taxable': 'true',
-        'Lineitem fulfillment status': 'fulfilled',
-        'Billing Name': customer['First Name'] + customer['Last Name'],
-        'Billing Street': '',
-        'Billing Address1': '',
-        'Billing Address2': '',
-        'Billing Company': '',
+        'Billing Name': name,
         'Billing City': customer['City'],
-        'Billing Zip': '',
         'Billing Province': customer['Province'],
-        'Billing Country': '日本',
         'Billing Phone': customer['Phone'],
-        'Shipping Name': customer['First Name'] + customer['Last Name'],
-        'Shipping Street': '',
-        'Shipping Address1': '',
-        'Shipping Address2': '',
-        'Shipping Company': '',
+        'Shipping Name': name,
         'Shipping City': customer['City'],
-        'Shipping Zip': '',
         'Shipping Province': customer['Province'],
-        'Shipping Country': '日本',
         'Shipping Phone': customer['Phone'],
         'Notes': f"辛さレベル{first_product['spice_level']}",
-        'Cancelled at': '',
-        'Payment Method': 'クレジットカード',
         'Payment Reference': f'pay-4-{order_id}',
-        'Refunded Amount': 0,
-        'Vendor': '早稲田メーヤウ',
-        'Outstanding Balance': 0,
-        'Employee': '',
-        'Location': '',
-        'Device ID': '',
         'Id': f'ORD-{order_id}',
         'Tags': f"カレー,{first_product['type']},辛さ{first_product['spice_level']}",
-        'Risk Level': 'Low',
-        'Source': 'web',
-        'Lineitem discount': 0,
-        'Tax 1 Name': '消費税 10%',
         'Tax 1 Value': tax,
-        'Tax 2 Name': '',
-        'Tax 2 Value': '',
-        'Tax 3 Name': '',
-        'Tax 3 Value': '',
-        'Tax 4 Name': '',
-        'Tax 4 Value': '',
-        'Tax 5 Name': '',
-        'Tax 5 Value': '',
         'Phone': customer['Phone'],
-        'Receipt Number': '',
-        'Duties': 0,
         'Billing Province Name': customer['Province'],
         'Shipping Province Name': customer['Province'],
         'Payment ID': f'pay-id-4-{order_id}',
-        'Payment Terms Name': '',
-        'Next Payment Due At': '',
         'Payment References': f'pay-4-{order_id}',
         'Customer ID': customer['Customer ID']
-    }
-    orders.append(order)
+    })
+    yield order
     
-    # 追加の商品明細
+    # 追加の商品明細は明細の列だけを上書き
     for product, quantity in selected_products[1:]:
-        additional_item = order.copy()
-        additional_item['Id'] = ''  # 同じ注文の追加明細はIDを空に
-        additional_item['Lineitem quantity'] = quantity
-        additional_item['Lineitem name'] = product['name']
-        additional_item['Lineitem price'] = product['price']
-        additional_item['Lineitem compare at price'] = int(product['price'] * 1.2)
-        additional_item['Lineitem sku'] = product['sku']
-        additional_item['Notes'] = f"辛さレベル{product['spice_level']}"
-        additional_item['Tags'] = f"カレー,{product['type']},辛さ{product['spice_level']}"
-        orders.append(additional_item)
+        yield ORDER_EXPORT_SCHEMA.fill(order, {
+            'Id': '',  # 同じ注文の追加明細はIDを空に
+            'Lineitem quantity': quantity,
+            'Lineitem name': product['name'],
+            'Lineitem price': product['price'],
+            'Lineitem compare at price': int(product['price'] * 1.2),
+            'Lineitem sku': product['sku'],
+            'Notes': f"辛さレベル{product['spice_level']}",
+            'Tags': f"カレー,{product['type']},辛さ{product['spice_level']}"
+        })
 
-# メイン処理
-if __name__ == '__main__':
-    print("早稲田メーヤウのデモデータを生成中...")
-    print("ストーリー: 2017年3月閉店 → 2018年6月復活")
+def make_shard_rows(context, start, stop, seed):
+    """シャード1つ分の注文行を生成（sharding.write_sharded_orders_csv から呼ばれる）"""
+    if context['engine'] == 'numpy':
+        return iter_orders_vectorized(context['customers'], context['num_orders'], start, stop,
+                                      seed=seed, batch_size=context['batch_size'],
+                                      subscriptions=context['subscriptions'])
+    return iter_orders(context['customers'], context['num_orders'], start, stop, rng=random.Random(seed),
+                       subscriptions=context['subscriptions'])
+
+def iter_subscription_orders(customers, first_order_id, rng=random,
+                             start_date=PHASE2_START, end_date=PHASE2_END):
+    """サブスク会員の定期便の注文を日付順に生成
+
+    会員ごとに申込日・プラン・継続月数（毎月 SUBSCRIPTION_MONTHLY_CHURN の確率で解約）を決め、
+    申込日と同じ日付で毎月届く注文をスケジューラから順に取り出す。
+    """
+    scheduler = SubscriptionScheduler()
+    span_days = (end_date - start_date).days
+    for customer in SegmentIndex(customers).members('サブスク会員'):
+        start = start_date + timedelta(days=rng.randint(0, span_days))
+        months = subscription_months(rng)
+        plan = rng.choice(SUBSCRIPTION_PRODUCTS)
+        scheduler.subscribe((customer, plan), start, min(add_months(start, months, start.day), end_date))
+    yield from iter_scheduled_orders(scheduler, first_order_id, end_date)
+
+def subscription_months(rng=random):
+    """初回の後に続くお届けの月数（毎月 SUBSCRIPTION_MONTHLY_CHURN の確率で解約）"""
+    return int(math.log(1.0 - rng.random()) / math.log(1.0 - SUBSCRIPTION_MONTHLY_CHURN))
+
+def iter_scheduled_orders(scheduler, first_order_id, end_date):
+    """スケジューラの end_date までのお届けを定期便の注文にする"""
+    for order_id, (order_date, (customer, plan)) in enumerate(scheduler.iter_due(end_date), first_order_id):
+        yield from build_order_rows(order_id, customer, order_date, [(plan, 1)])
+
+def read_subscription_history(orders_path, customers):
+    """既存の注文CSVから、サブスク会員ごとの定期便の [初回お届け日, お届け回数, プラン] を読み取る"""
+    plans = {p['sku']: p for p in SUBSCRIPTION_PRODUCTS}
+    subscribers = {c['Customer ID'] for c in SegmentIndex(customers).members('サブスク会員')}
+    history = {}
+    for order in iter_csv_orders(orders_path, columns=['Customer ID', 'Created at', 'Lineitem sku']):
+        plan = plans.get(order.items[0]['Lineitem sku'])
+        if order['Customer ID'] not in subscribers or plan is None:
+            continue
+        delivered = parse_timestamp(order['Created at'])
+        entry = history.setdefault(order['Customer ID'], [delivered, 0, plan])
+        entry[0] = min(entry[0], delivered)
+        entry[1] += 1
+    return history
+
+def iter_resumed_subscription_orders(customers, history, first_order_id, resume_after, start_date, end_date,
+                                     rng=random):
+    """read_subscription_history() の定期便を start_date から end_date まで続ける（追記用）
+
+    次回のお届け日が resume_after（既存データの最終注文日時）までに来ていた会員は解約済みとして除く。
+    残りの継続月数は新規と同じ解約率で引き直す（解約は毎月独立なので途中から引き直しても分布は同じ）。
+    """
+    by_id = {c['Customer ID']: c for c in customers}
+    scheduler = SubscriptionScheduler()
+    for customer_id, (first, deliveries, plan) in history.items():
+        if add_months(first, deliveries, first.day) <= resume_after:
+            continue
+        while add_months(first, deliveries, first.day) < start_date:
+            deliveries += 1  # 既存データの末尾から追記期間の開始までのお届けは飛ばす
+        end = add_months(first, deliveries + subscription_months(rng), first.day)
+        scheduler.subscribe((by_id[customer_id], plan), add_months(first, deliveries, first.day),
+                            min(end, end_date), day=first.day)
+    yield from iter_scheduled_orders(scheduler, first_order_id, end_date)
+
+def order_phase(created_at):
+    """注文日時（'YYYY-MM-DD ...'）から閉店前/復活後を判定"""
+    return '閉店前' if created_at < f'{PHASE2_START:%Y-%m-%d}' else '復活後'
+
+def order_stats(customers):
+    """顧客タイプ・期間・カテゴリ別に集計する統計コレクタ"""
+    segments = {c['Customer ID']: c['Tags'].split(',')[0] for c in customers}
+    return StatsCollector(
+        order_keys={'segment': ('Customer ID', segments), 'phase': ('Created at', order_phase)},
+        item_keys={'category': ('Lineitem sku', SKU_CATEGORIES)},
+        customer_ids=segments)
+
+def append_orders(output_dir, until, since=None, orders=None, seed=None, compression=None, subscriptions=False,
+                  log=print):
+    """既存の注文CSVに until までの注文を追記し、ファイル別の行数（追記分）を返す
+
+    顧客は既存の顧客CSVを使い、注文番号は既存の最大値から続ける。
+    orders 未指定時は復活後の1日あたり注文数（定期便を除く）から件数を見積もる。
+    定期便の有無は集計JSONに記録された生成時の設定に従う（記録がなければ subscriptions）。
+    定期便ありのデータでは通常の注文を run(subscriptions=True) と同じ条件で作り、既存の定期便を
+    追記期間まで続ける（iter_resumed_subscription_orders() を参照）。
+    顧客CSVの購入回数・購入金額には追記分を加算し、集計JSONは追記後の注文CSV全体から作り直す。
+    compression 指定時は圧縮済みの注文CSV（.gz / .zst）に追記する。
+    """
+    if seed is not None:
+        random.seed(seed)
+    orders_name = compressed_name('orders_store4_maeyao.csv', compression)
+    orders_path = f'{output_dir}/{orders_name}'
+    customers_path = f'{output_dir}/customers_store4_maeyao.csv'
+    summary_path = f'{output_dir}/{SUMMARY_NAME}'
+    state = append.read_order_state(orders_path)
+    customers = append.read_customers(customers_path)
+    start_date, end_date = append.append_window(state, until, since)
+    recorded = append.read_summary_options(summary_path).get('subscriptions')
+    if recorded is not None:
+        if subscriptions and not recorded:
+            raise ValueError('定期便なし（--subscriptions なし）で生成されたデータには、定期便ありで追記できません')
+        subscriptions = recorded
+    history = read_subscription_history(orders_path, customers) if subscriptions else {}
+    if orders is None:
+        # 定期便と、閉店前の注文（通常の注文の30%）を除いた復活後の密度で見積もる
+        regular_orders = state['orders'] - sum(deliveries for _, deliveries, _ in history.values())
+        phase2_state = dict(state, orders=regular_orders - int(regular_orders * 0.3),
+                            first_created_at=PHASE2_START)
+        orders = append.scaled_order_count(phase2_state, start_date, end_date)
     
-    # 顧客データ生成
-    print("\n1. 顧客データを生成中...")
-    customers = generate_customers(200)
+    log(f"早稲田メーヤウの注文を追記中...（{start_date:%Y-%m-%d} 〜 {end_date:%Y-%m-%d}）")
+    rollup = StatsCollector()
+    first_order_id = state['last_order_number'] + 1
+    counts = append_orders_csv(orders_path, iter_orders(
+        customers, orders, date_range=(start_date, end_date),
+        first_order_id=first_order_id, subscriptions=subscriptions), stats=rollup)
+    if subscriptions:
+        # 定期便は通常の注文の後ろに、注文番号を続けて日付順に追加
+        subscription_counts = append_orders_csv(orders_path, iter_resumed_subscription_orders(
+            customers, history, first_order_id + counts['orders'], state['last_created_at'],
+            start_date, end_date), stats=rollup)
+        merge_counts(counts, subscription_counts)
+    if os.path.isdir(columns_dir(orders_path)):
+        # 列ファイルがあれば追記後の注文CSVから作り直す
+        write_order_columns(orders_path)
+    rollup.apply_customer_totals(customers, add=True)
+    write_records_csv(customers_path, customers)
+    order_stats(customers).observe_csv(orders_path).write_json(summary_path, options={'subscriptions': subscriptions})
+    log(f"   {counts['rows']}件の注文データ（明細含む）を追記しました。")
+    log(f"   - 注文数: {counts['orders']}件（ORD-{first_order_id}〜）")
+    if subscriptions:
+        log(f"   - うち定期便: {subscription_counts['orders']}件")
+    return {'output_dir': output_dir, 'files': {orders_name: counts['rows']}}
+
+def run(output_dir=DEFAULT_OUTPUT_DIR, customers=None, orders=None, scale=1.0, seed=None,
+        engine='random', batch_size=vectorized.DEFAULT_BATCH_SIZE, workers=None,
+        shard_size=sharding.DEFAULT_SHARD_SIZE, subscriptions=False, sort_by_date=False,
+        sort_buffer_rows=extsort.DEFAULT_BUFFER_ROWS, compression=None, columnar=False, cache=False, cache_dir=None,
+        append_until=None, append_since=None, quiet=False):
+    """顧客・商品・注文のCSVを生成し、ファイル別の行数を返す
+
+    customers/orders 未指定時は基準数（200人・800件）に scale を掛けた数を生成する。
+    subscriptions=True ならサブスク会員の定期便の注文を、通常の注文の後に追加する（定期便はこの
+    スケジュールだけが作り、通常の注文にはサブスク会員と定期便の商品を含めない）。
+    sort_by_date=True なら書き出した注文（定期便を含む）を Created at 順に並べ替える
+    （メモリ上には最大 sort_buffer_rows 行、超えた分は一時ファイルで外部マージソート）。
+    compression（'gzip' / 'zstd'）指定時は注文CSVを圧縮して書き出す（書き込みは別スレッド）。
+    columnar=True なら注文CSVの主要列を .npy の列ファイルにも書き出す（columnar.write_order_columns() を参照）。
+    append_until 指定時は既存CSVへの追記のみを行う（append_orders() を参照）。
+    """
+    log = (lambda *args, **kwargs: None) if quiet else print
+    if append_until is not None:
+        return append_orders(output_dir, append_until, append_since, orders, seed, compression, subscriptions, log)
+    num_customers = customers if customers is not None else max(1, round(BASE_CUSTOMERS * scale))
+    num_orders = orders if orders is not None else max(1, round(BASE_ORDERS * scale))
     
-    # 顧客データ保存
-    with open(f'{output_dir}/customers_store4_maeyao.csv', 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=list(customers[0].keys()))
-        writer.writeheader()
-        writer.writerows(customers)
-    print(f"   {len(customers)}件の顧客データを生成しました。")
-    print(f"   - OGファン: {len([c for c in customers if 'OGファン' in c['Tags']])}名")
-    print(f"   - 復活支援者: {len([c for c in customers if '復活支援者' in c['Tags']])}名")
-    print(f"   - サブスク会員: {len([c for c in customers if 'サブスク会員' in c['Tags']])}名")
+    # キャッシュ済みなら生成せずに復元（シード未指定の出力は再現できないため対象外）
+    store_cache = key = None
+    if cache and seed is None:
+        log("乱数シードが未指定のため、キャッシュは使用しません。")
+    elif cache:
+        store_cache = GenerationCache(cache_dir)
+        key = cache_key(__file__, {
+            'constants': {'CURRY_PRODUCTS': CURRY_PRODUCTS, 'CUSTOMER_TYPES': CUSTOMER_TYPES, 'REGIONS': REGIONS},
+            'seed': seed, 'customers': num_customers, 'orders': num_orders, 'engine': engine,
+            'subscriptions': subscriptions, 'sort_by_date': sort_by_date, 'compression': compression,
+            'columnar': columnar,
+            'batch_size': batch_size if engine == 'numpy' else None,
+            'shard_size': shard_size if workers else None,
+        })
+        manifest = store_cache.restore(key, output_dir)
+        if manifest:
+            log(f"キャッシュから復元しました（{key[:12]}）: {output_dir}/")
+            return {'output_dir': output_dir, 'files': manifest_rows(manifest)}
+    
+    if seed is not None:
+        random.seed(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    files = {}
+    
+    log("早稲田メーヤウのデモデータを生成中...")
+    log("ストーリー: 2017年3月閉店 → 2018年6月復活")
+    
+    # 顧客データ生成（CSVは注文の集計値を反映してから保存）
+    log("\n1. 顧客データを生成中...")
+    customers = generate_customers(num_customers, seed)
+    log(f"   {len(customers)}件の顧客データを生成しました。")
+    segments = SegmentIndex(customers)
+    for tag in ('OGファン', '復活支援者', 'サブスク会員'):
+        log(f"   - {tag}: {len(segments.members(tag))}名")
     
     # 商品データ生成
-    print("\n2. 商品データを生成中...")
+    log("\n2. 商品データを生成中...")
     products_csv = generate_products()
     
     # 商品データ保存
-    with open(f'{output_dir}/products_store4_maeyao.csv', 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=list(products_csv[0].keys()))
-        writer.writeheader()
-        writer.writerows(products_csv)
-    print(f"   {len(products_csv)}件の商品データを生成しました。")
-    print(f"   - 冷凍カレー: {len([p for p in CURRY_PRODUCTS if p['category'] == '冷凍カレー'])}種")
-    print(f"   - レトルトカレー: {len([p for p in CURRY_PRODUCTS if p['category'] == 'レトルトカレー'])}種")
-    print(f"   - セット・サブスク: {len([p for p in CURRY_PRODUCTS if p['category'] in ['セット商品', 'サブスクリプション']])}種")
+    files['products_store4_maeyao.csv'] = write_records_csv(
+        f'{output_dir}/products_store4_maeyao.csv', products_csv)
+    log(f"   {len(products_csv)}件の商品データを生成しました。")
+    categories = Counter(p['category'] for p in CURRY_PRODUCTS)
+    log(f"   - 冷凍カレー: {categories['冷凍カレー']}種")
+    log(f"   - レトルトカレー: {categories['レトルトカレー']}種")
+    log(f"   - セット・サブスク: {categories['セット商品'] + categories['サブスクリプション']}種")
     
     # 注文データ生成
-    print("\n3. 注文データを生成中...")
-    orders = generate_orders(customers, 800)
+    log("\n3. 注文データを生成中...")
+    orders_name = compressed_name('orders_store4_maeyao.csv', compression)
+    orders_path = f'{output_dir}/{orders_name}'
+    stats = order_stats(customers)
+    if workers:
+        context = {'customers': customers, 'num_orders': num_orders,
+                   'engine': engine, 'batch_size': batch_size, 'subscriptions': subscriptions}
+        counts = sharding.write_sharded_orders_csv(
+            orders_path, make_shard_rows, context, num_orders,
+            seed=seed, workers=workers, shard_size=shard_size, stats=stats)
+    elif engine == 'numpy':
+        counts = write_orders_csv(orders_path, iter_orders_vectorized(
+            customers, num_orders, seed=seed, batch_size=batch_size, subscriptions=subscriptions), stats=stats)
+    else:
+        counts = write_orders_csv(orders_path, iter_orders(customers, num_orders, subscriptions=subscriptions),
+                                  stats=stats)
+    if subscriptions:
+        # 定期便は通常の注文の後ろに、注文番号を続けて日付順に追加
+        subscription_rng = random.Random(sharding.shard_seed(seed, 'subscriptions')) if seed is not None else random
+        subscription_counts = append_orders_csv(orders_path, iter_subscription_orders(
+            customers, 4001 + counts['orders'], rng=subscription_rng), stats=stats)
+        merge_counts(counts, subscription_counts)
+    if sort_by_date:
+        # 定期便は後から追記するため、書き出し後のCSVをまとめて並べ替える
+        extsort.sort_orders_csv(orders_path, sort_buffer_rows)
+    files[orders_name] = counts['rows']
     
-    # 注文データ保存
-    with open(f'{output_dir}/orders_store4_maeyao.csv', 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=list(orders[0].keys()))
-        writer.writeheader()
-        writer.writerows(orders)
+    # 統計情報（閉店前/復活後の件数は書き出しと同時に集計）
+    log(f"   {counts['rows']}件の注文データ（明細含む）を生成しました。")
+    log(f"   - 注文数: {counts['orders']}件")
+    log(f"   - 閉店前（2016-2017）: {stats.count('phase', '閉店前')}件")
+    log(f"   - 復活後（2018-2025）: {stats.count('phase', '復活後')}件")
+    if subscriptions:
+        log(f"   - うち定期便: {subscription_counts['orders']}件")
+    stats.write_json(f'{output_dir}/{SUMMARY_NAME}', options={'subscriptions': subscriptions})
+    extra_files = [SUMMARY_NAME]
+    if columnar:
+        write_order_columns(orders_path)
+        extra_files += column_files(orders_path)
+        log(f"   - 列ファイル: {os.path.basename(columns_dir(orders_path))}/")
     
-    # 統計情報
-    unique_orders = len(set(o['Id'] for o in orders if o['Id']))
-    phase1_orders = len([o for o in orders if o['Id'] and datetime.strptime(o['Created at'], '%Y-%m-%d %H:%M:%S +0900') < datetime(2017, 4, 1)])
-    phase2_orders = unique_orders - phase1_orders
+    # 顧客データ保存（購入回数・購入金額は注文の集計値）
+    log("\n4. 顧客データを保存中...")
+    stats.apply_customer_totals(customers)
+    files['customers_store4_maeyao.csv'] = write_records_csv(
+        f'{output_dir}/customers_store4_maeyao.csv', customers)
+    log("   購入回数・購入金額を注文データから集計しました。")
     
-    print(f"   {len(orders)}件の注文データ（明細含む）を生成しました。")
-    print(f"   - 注文数: {unique_orders}件")
-    print(f"   - 閉店前（2016-2017）: {phase1_orders}件")
-    print(f"   - 復活後（2018-2025）: {phase2_orders}件")
+    if store_cache:
+        store_cache.save(key, output_dir, files, extra_files=extra_files)
     
-    print("\n生成完了！")
-    print(f"保存先: {output_dir}/")
-    print("- customers_store4_maeyao.csv")
-    print("- products_store4_maeyao.csv")
-    print("- orders_store4_maeyao.csv")
\ No newline at end of file
+    log("\n生成完了！")
+    log(f"保存先: {output_dir}/")
+    for name in [*files, SUMMARY_NAME]:
+        log(f"- {name}")
+    return {'output_dir': output_dir, 'files': files}
+
+def parse_args():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description='早稲田メーヤウのデモデータを生成')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help='出力先ディレクトリ')
+    parser.add_argument('--customers', type=int, default=None, help=f'顧客数（デフォルト: {BASE_CUSTOMERS}×scale）')
+    parser.add_argument('--orders', type=int, default=None, help=f'注文数（デフォルト: {BASE_ORDERS}×scale）')
+    parser.add_argument('--scale', type=float, default=1.0, help='データ量の倍率（デフォルト: 1.0）')
+    parser.add_argument('--seed', type=int, default=None, help='乱数シード（指定時は再現可能な出力）')
+    parser.add_argument('--engine', choices=['random', 'numpy'], default='random',
+                        help='注文の乱数生成方式（numpy: バッチ単位で一括抽選、大規模データ向け）')
+    parser.add_argument('--batch-size', type=int, default=vectorized.DEFAULT_BATCH_SIZE,
+                        help='numpyモードで一度に抽選する注文数')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='シャード分割して並列生成するプロセス数（指定時のみ有効、出力はワーカー数に依存しない）')
+    parser.add_argument('--shard-size', type=int, default=sharding.DEFAULT_SHARD_SIZE,
+                        help='1シャードあたりの注文数')
+    parser.add_argument('--subscriptions', action='store_true',
+                        help='サブスク会員の定期便（申込日から毎月、解約まで）の注文を追加'
+                             '（サブスク会員は通常の注文から外れ、定期便の商品は定期便の注文だけになる。'
+                             '追記時は生成時の設定を集計JSONから読み、定期便を追記期間まで続ける）')
+    parser.add_argument('--sort-by-date', action='store_true',
+                        help='注文を Created at 順に並べて出力（明細行は注文ごとにまとめたまま）')
+    parser.add_argument('--sort-buffer-rows', type=int, default=extsort.DEFAULT_BUFFER_ROWS,
+                        help='並べ替えでメモリに保持する最大行数（超えた分は一時ファイルで外部マージソート）')
+    parser.add_argument('--compression', choices=list(COMPRESSION_SUFFIXES), default=None,
+                        help='注文CSVを gzip / zstd で圧縮して出力（.gz / .zst、zstd は zstandard が必要）')
+    parser.add_argument('--columnar', action='store_true',
+                        help='注文CSVの主要列を型付きの .npy（orders_*.columns/）にも書き出す（numpy が必要、mmap で高速に読み込める）')
+    parser.add_argument('--cache', action='store_true',
+                        help='同じ入力（定数・シード・データ量・コード）の生成結果をキャッシュから再利用')
+    parser.add_argument('--cache-dir', default=None,
+                        help='キャッシュの保存先（デフォルト: $DEMO_DATAGEN_CACHE または ~/.cache/shopify-demo-datagen）')
+    parser.add_argument('--append-until', type=append.parse_date, default=None, metavar='YYYY-MM-DD',
+                        help='既存CSVの最終注文日の翌日からこの日までの注文を追記（顧客・商品は既存のまま）')
+    parser.add_argument('--append-since', type=append.parse_date, default=None, metavar='YYYY-MM-DD',
+                        help='追記する期間の開始日（デフォルト: 既存データの最終注文日の翌日）')
+    parser.add_argument('--sqlite', default=None, metavar='PATH',
+                        help='生成後に顧客・商品・注文を SQLite の分析DBミラー（Customers / Orders / OrderItems 等）へ投入')
+    parser.add_argument('--sqlserver', choices=SQLSERVER_FORMATS, default=None,
+                        help='生成後に SQL Server への一括投入ファイルを sqlserver/ に書き出す'
+                             '（insert: 1000行ずつの INSERT スクリプト、bcp: bcp / BULK INSERT 用のデータ・フォーマットファイル）')
+    parser.add_argument('--store-id', type=int, default=STORE_ID,
+                        help=f'SQLite・SQL Server へ投入するときの StoreId（デフォルト: {STORE_ID}、同じ StoreId の既存データは入れ替え）')
+    return parser.parse_args()
+
+# メイン処理
+if __name__ == '__main__':
+    args = vars(parse_args())
+    sqlite_path, sqlserver, store_id = args.pop('sqlite'), args.pop('sqlserver'), args.pop('store_id')
+    result = run(**args)
+    if sqlserver:
+        seed = write_seed_files(result['output_dir'], result['files'], store_id, sqlserver)
+        print(f"SQL Server 用のシード（{sqlserver}）を書き出しました: {os.path.dirname(seed['paths'][0])}/"
+              f"（00〜99 の番号順に実行）")
+    if sqlite_path:
+        counts = load_store_output(sqlite_path, store_id, result['output_dir'], result['files'])
+        print(f"SQLite（{sqlite_path}）へ投入しました: StoreId={store_id}、顧客{counts['customers']:,}件、"
+              f"注文{counts['orders']:,}件（明細{counts['order_items']:,}件）")
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""demo_datagen のテスト共通設定（scripts/ を import パスに追加）"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
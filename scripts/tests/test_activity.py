@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""activity: 注文数の合計・1回購入・休眠顧客の割り当てが計画どおりになること"""
+
+import csv
+from datetime import datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from demo_datagen import sharding
+from demo_datagen.activity import ANY_WINDOW, DORMANT_WINDOW, RECENT_WINDOW, ActivityModel
+from demo_datagen.stores import load_store_module
+
+
+@pytest.mark.parametrize('num_customers, num_orders', [(1000, 20_000), (1000, 700), (50, 50)])
+def test_plan_assigns_every_order(num_customers, num_orders):
+    model = ActivityModel(one_timer_fraction=0.4, dormant_fraction=0.3)
+    plan = model.plan(num_customers, num_orders, seed=1)
+    assert len(plan) == num_orders
+    assert int(plan.counts.sum()) == num_orders
+    assert np.array_equal(np.bincount(plan.customer, minlength=num_customers), plan.counts)
+
+
+def test_dormant_and_recent_windows():
+    plan = ActivityModel(dormant_fraction=0.3).plan(2000, 30_000, seed=2)
+    active = plan.counts > 0
+    dormant_orders = plan.dormant[plan.customer]
+    # 休眠顧客の注文はすべて基準日より前、それ以外の顧客は必ず1件以上が基準日以降
+    assert (plan.window[dormant_orders] == DORMANT_WINDOW).all()
+    assert set(plan.window[~dormant_orders].tolist()) <= {ANY_WINDOW, RECENT_WINDOW}
+    recent = np.zeros(len(plan.counts), dtype=bool)
+    recent[plan.customer[plan.window == RECENT_WINDOW]] = True
+    assert np.array_equal(recent, active & ~plan.dormant)
+    assert plan.summary()['dormant'] == int((plan.dormant & active).sum())
+
+
+def test_windows_split_at_cutoff():
+    plan = ActivityModel(dormant_days=30).plan(10, 10, seed=0)
+    start, end = datetime(2024, 1, 1), datetime(2024, 12, 31)
+    (any_start, any_end), (dormant_start, dormant_end), (recent_start, recent_end) = plan.windows(start, end)
+    assert (any_start, any_end) == (start, end)
+    assert dormant_start == start and recent_end == end
+    assert recent_start == end - timedelta(days=30) and dormant_end == recent_start - timedelta(days=1)
+    with pytest.raises(ValueError):
+        plan.windows(datetime(2024, 12, 15), end)
+
+
+@pytest.mark.parametrize('engine', ['random', 'numpy'])
+def test_generated_dormant_customers_match_plan(tmp_path, engine):
+    """生成したCSVで最終注文日が基準日より前の顧客が、計画の休眠顧客と一致する"""
+    store = load_store_module('store3')
+    store.run(output_dir=str(tmp_path), customers=300, orders=3000, seed=1, engine=engine,
+              skewed_activity=True, dormant_days=180, quiet=True)
+    plan = ActivityModel(dormant_days=180).plan(300, 3000, sharding.shard_seed(1, 'activity'))
+
+    with open(tmp_path / 'customers_store3_hokkaido.csv', newline='', encoding='utf-8-sig') as f:
+        customer_ids = [row['Customer ID'] for row in csv.DictReader(f)]
+    last_order = {}
+    with open(tmp_path / 'orders_store3_hokkaido.csv', newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            if row['Id']:
+                last_order[row['Customer ID']] = max(last_order.get(row['Customer ID'], ''), row['Created at'])
+    cutoff = f'{store.ORDER_END_DATE - timedelta(days=180):%Y-%m-%d}'
+    dormant = {customer for customer, created_at in last_order.items() if created_at < cutoff}
+    planned = {customer_ids[i] for i in np.flatnonzero(plan.dormant & (plan.counts > 0)).tolist()}
+    assert dormant == planned
+    assert len(last_order) == int((plan.counts > 0).sum())
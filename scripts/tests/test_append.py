@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""append: 定期便ありのデータへの追記で、定期便がスケジュールどおりに続くこと"""
+
+import csv
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+
+from demo_datagen.orders import iter_orders
+from demo_datagen.stores import load_store_module
+from demo_datagen.subscriptions import add_months
+from demo_datagen.timestamps import parse_timestamp
+
+ORDERS = 'orders_store4_maeyao.csv'
+CUSTOMERS = 'customers_store4_maeyao.csv'
+
+
+def read_deliveries(output_dir):
+    """定期便の商品を含む注文を {顧客番号: [(お届け日時, 明細数)]} にまとめる"""
+    deliveries = defaultdict(list)
+    for order in iter_orders(str(output_dir / ORDERS), columns=['Customer ID', 'Created at', 'Lineitem sku']):
+        if any(item['Lineitem sku'].startswith('SUB-') for item in order.items):
+            deliveries[order['Customer ID']].append((parse_timestamp(order['Created at']), len(order.items)))
+    return deliveries
+
+
+def test_append_continues_subscriptions(tmp_path):
+    store = load_store_module('store4')
+    store.run(output_dir=str(tmp_path), orders=2000, seed=5, subscriptions=True, quiet=True)
+    until = datetime(2026, 6, 30)
+    store.run(output_dir=str(tmp_path), append_until=until, seed=5, quiet=True)
+
+    with open(tmp_path / CUSTOMERS, newline='', encoding='utf-8-sig') as f:
+        subscribers = {row['Customer ID'] for row in csv.DictReader(f) if 'サブスク会員' in row['Tags']}
+    deliveries = read_deliveries(tmp_path)
+    # 定期便の商品は定期便の注文（サブスク会員の1明細の注文）にしか出てこない
+    assert set(deliveries) <= subscribers
+    assert all(items == 1 for dates in deliveries.values() for _, items in dates)
+    continued = 0
+    for dates in deliveries.values():
+        first = dates[0][0]
+        # 追記の前後で途切れず、初回と同じ日に毎月届く
+        assert [date for date, _ in dates] == [add_months(first, n, first.day) for n in range(len(dates))]
+        continued += dates[-1][0] > datetime(2025, 7, 26)
+    assert continued > 0
+    assert all(date <= until for dates in deliveries.values() for date, _ in dates)
+
+
+def test_append_rejects_subscriptions_on_regular_fixture(tmp_path):
+    store = load_store_module('store4')
+    store.run(output_dir=str(tmp_path), orders=500, seed=5, quiet=True)
+    with pytest.raises(ValueError, match='定期便'):
+        store.run(output_dir=str(tmp_path), append_until=datetime(2026, 6, 30), subscriptions=True,
+                  quiet=True)
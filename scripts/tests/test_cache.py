@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""cache: ヒット時に保存時と同じファイルを返し、壊れたエントリは使わないこと"""
+
+import os
+
+from demo_datagen.cache import GenerationCache, cache_key, manifest_rows
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def _save(tmp_path):
+    output = tmp_path / 'output'
+    _write(str(output / 'orders.csv'), b'Name,Total\r\n#1,100\r\n')
+    _write(str(output / 'orders.columns' / 'meta.json'), b'{"rows": 1}')
+    cache = GenerationCache(str(tmp_path / 'cache'))
+    cache.save('ab' * 32, str(output), {'orders.csv': 1}, extra_files=['orders.columns/meta.json'])
+    return cache
+
+
+def test_hit_restores_identical_files(tmp_path):
+    cache = _save(tmp_path)
+    restored = tmp_path / 'restored'
+    manifest = cache.restore('ab' * 32, str(restored))
+    assert manifest_rows(manifest) == {'orders.csv': 1}
+    for name in ['orders.csv', 'orders.columns/meta.json']:
+        with open(tmp_path / 'output' / name, 'rb') as original, open(restored / name, 'rb') as copy:
+            assert copy.read() == original.read()
+
+
+def test_same_size_corruption_is_a_miss(tmp_path):
+    cache = _save(tmp_path)
+    entry = tmp_path / 'cache' / 'ab' / ('ab' * 32)
+    _write(str(entry / 'orders.csv'), b'Name,Total\r\n#1,999\r\n')  # 同じサイズで内容だけ違う
+    assert cache.lookup('ab' * 32) is None
+    assert cache.restore('ab' * 32, str(tmp_path / 'restored')) is None
+
+
+def test_missing_file_is_a_miss(tmp_path):
+    cache = _save(tmp_path)
+    os.unlink(tmp_path / 'cache' / 'ab' / ('ab' * 32) / 'orders.columns' / 'meta.json')
+    assert cache.lookup('ab' * 32) is None
+
+
+def test_key_depends_on_inputs(tmp_path):
+    script = tmp_path / 'generate.py'
+    _write(str(script), b'print(1)\n')
+    key = cache_key(str(script), {'seed': 1, 'orders': 100})
+    assert key == cache_key(str(script), {'orders': 100, 'seed': 1})
+    assert key != cache_key(str(script), {'seed': 2, 'orders': 100})
+    _write(str(script), b'print(2)\n')
+    assert key != cache_key(str(script), {'seed': 1, 'orders': 100})
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""calendar_table: 祝日（ハッピーマンデー）・イベント・季節の表と抽選"""
+
+import random
+from datetime import datetime
+
+from demo_datagen import vectorized
+from demo_datagen.calendar_table import DayCalendar, default_demand_weight
+
+
+def _dates(calendar, column):
+    return {f'{date:%m-%d}' for date, value in zip(calendar.dates, column) if value}
+
+
+def test_holidays_2024():
+    calendar = DayCalendar(datetime(2024, 1, 1), datetime(2024, 12, 31))
+    holidays = _dates(calendar, calendar.holidays)
+    # 成人の日・海の日・敬老の日・スポーツの日（第2/第3月曜）
+    assert {'01-08', '07-15', '09-16', '10-14'} <= holidays
+    # 同じ月の別の月曜日は祝日ではない
+    assert not {'01-15', '07-08', '09-09', '10-07'} & holidays
+    assert {'01-01', '02-11', '02-23', '04-29', '05-03', '05-04', '05-05', '08-11', '11-03', '11-23'} <= holidays
+    assert len(holidays) == 16
+
+
+def test_happy_monday_moves_with_the_year():
+    calendar = DayCalendar(datetime(2025, 1, 1), datetime(2025, 12, 31))
+    holidays = _dates(calendar, calendar.holidays)
+    assert {'01-13', '07-21', '09-15', '10-13'} <= holidays
+    assert not {'01-08', '07-15', '09-16', '10-14'} & holidays
+
+
+def test_events_and_seasons():
+    calendar = DayCalendar(datetime(2024, 1, 1), datetime(2024, 12, 31))
+    events = dict(zip((f'{d:%m-%d}' for d in calendar.dates), calendar.events))
+    assert events['05-12'] == '母の日' and events['06-16'] == '父の日'
+    assert events['05-05'] == '' and events['06-09'] == ''
+    assert events['02-14'] == 'バレンタイン' and events['12-20'] == 'お歳暮' and events['12-21'] == ''
+    seasons = dict(zip((f'{d:%m-%d}' for d in calendar.dates), calendar.seasons))
+    assert (seasons['02-29'], seasons['03-01'], seasons['06-01'], seasons['09-01'], seasons['12-01']) == (
+        'winter', 'spring', 'summer', 'autumn', 'winter')
+    assert calendar.index_of(datetime(2024, 3, 1)) == 60
+
+
+def test_uniform_draw_matches_randint():
+    calendar = DayCalendar(datetime(2024, 1, 1), datetime(2024, 1, 31))
+    a, b = random.Random(3), random.Random(3)
+    assert [calendar.draw(a) for _ in range(1000)] == [b.randint(0, 30) for _ in range(1000)]
+
+
+def test_weighted_draw_follows_weights():
+    only_christmas = DayCalendar(datetime(2024, 12, 1), datetime(2024, 12, 31),
+                                 lambda calendar, i: 1.0 if calendar.dates[i].day == 25 else 0.0)
+    rng = random.Random(0)
+    assert {only_christmas.draw(rng) for _ in range(500)} == {24}
+    if vectorized.np is not None:
+        assert set(only_christmas.sample(vectorized.make_rng(0), 500).tolist()) == {24}
+
+    calendar = DayCalendar(datetime(2024, 1, 1), datetime(2024, 12, 31), default_demand_weight)
+    saturday, tuesday = calendar.index_of(datetime(2024, 3, 9)), calendar.index_of(datetime(2024, 3, 12))
+    assert calendar.weights[saturday] == calendar.weights[tuesday] * 1.2
+    assert calendar.weights[calendar.index_of(datetime(2024, 12, 24))] == 1.5  # 平日のイベント
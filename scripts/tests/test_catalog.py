@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""catalog: 合計行数・先頭のストア固有商品・Handle と SKU の重複なし"""
+
+import csv
+import random
+
+import pytest
+
+from demo_datagen.catalog import iter_catalog_rows, write_catalog_csv
+from demo_datagen.schema import PRODUCT_EXPORT_SCHEMA
+
+BASE_PRODUCTS = [
+    {'Handle': 'base-1', 'Title': 'ストア商品1', 'Variant SKU': 'BASE-1'},
+    {'Handle': 'base-2', 'Title': 'ストア商品2', 'Variant SKU': 'BASE-2-S'},
+    {'Handle': 'base-2', 'Title': 'ストア商品2', 'Variant SKU': 'BASE-2-L'},
+]
+
+
+def _read(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize('num_rows', [3, 4, 5, 1000])
+def test_catalog_has_exactly_num_rows(tmp_path, num_rows):
+    path = tmp_path / 'products.csv'
+    assert write_catalog_csv(str(path), num_rows, BASE_PRODUCTS, seed=1) == num_rows
+    rows = _read(path)
+    assert len(rows) == num_rows
+    assert [row['Variant SKU'] for row in rows[:3]] == ['BASE-1', 'BASE-2-S', 'BASE-2-L']
+    skus = [row['Variant SKU'] for row in rows]
+    assert len(set(skus)) == len(skus)
+
+
+def test_catalog_smaller_than_base_products_is_rejected(tmp_path):
+    path = tmp_path / 'products.csv'
+    with pytest.raises(ValueError):
+        write_catalog_csv(str(path), 2, BASE_PRODUCTS)
+    assert not path.exists()
+
+
+def test_synthetic_rows_are_unique_and_deterministic():
+    rows = list(iter_catalog_rows(5000, random.Random(7)))
+    again = list(iter_catalog_rows(5000, random.Random(7)))
+    assert rows == again and len(rows) == 5000
+    index = PRODUCT_EXPORT_SCHEMA.index
+    skus = [row[index['Variant SKU']] for row in rows]
+    assert len(set(skus)) == len(skus)
+    # 同じ Handle の行（バリアント）は連続し、Handle ごとにタイトルが1つ
+    titles = {}
+    previous = None
+    for row in rows:
+        handle = row[index['Handle']]
+        assert handle == previous or handle not in titles
+        assert titles.setdefault(handle, row[index['Title']]) == row[index['Title']]
+        previous = handle
+    assert len(set(titles.values())) == len(titles)
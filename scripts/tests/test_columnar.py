@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""columnar: 一時ファイルへの書き出しを挟んでも .npy の列が CSV と一致すること"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from demo_datagen.columnar import COLUMNS, META_NAME, OrderColumns, columns_dir, write_order_columns
+from demo_datagen.csvout import write_orders_csv
+from demo_datagen.schema import ORDER_EXPORT_SCHEMA
+
+JST = timezone(timedelta(hours=9))
+
+
+def _orders(count, seed=0):
+    """注文行と、期待する列の値（1行＝1明細）"""
+    rng = random.Random(seed)
+    rows, expected = [], []
+    for number in range(count):
+        created_at = datetime(2024, 1, 1, tzinfo=JST) + timedelta(seconds=rng.randrange(86400 * 365))
+        customer = rng.randint(1, 50)
+        items = [(f'SKU-{rng.randint(1, 20)}', rng.randint(1, 3), rng.randrange(500, 5000, 10))
+                 for _ in range(rng.randint(1, 3))]
+        total = sum(quantity * price for _, quantity, price in items)
+        for line, (sku, quantity, price) in enumerate(items):
+            rows.append(ORDER_EXPORT_SCHEMA.fill(ORDER_EXPORT_SCHEMA.template(), {
+                'Name': f'#{3001 + number}',
+                'Id': f'ORD-{3001 + number}' if line == 0 else '',
+                'Customer ID': f'CUST-{3000 + customer}',
+                'Created at': f'{created_at:%Y-%m-%d %H:%M:%S %z}',
+                'Lineitem sku': sku,
+                'Lineitem quantity': quantity,
+                'Lineitem price': price,
+                'Total': total,
+            }))
+            expected.append((3001 + number, line, 3000 + customer, int(created_at.timestamp()),
+                             sku, quantity, price, total))
+    return rows, expected
+
+
+@pytest.mark.parametrize('name, spill_rows', [('orders.csv', 1_000_000), ('orders.csv', 7), ('orders.csv.gz', 5)])
+def test_columns_match_csv(tmp_path, name, spill_rows):
+    rows, expected = _orders(200)
+    path = str(tmp_path / name)
+    write_orders_csv(path, iter(rows))
+    assert write_order_columns(path, spill_rows=spill_rows) == len(expected)
+
+    directory = columns_dir(path)
+    assert directory == str(tmp_path / 'orders.columns')
+    assert sorted(p.name for p in (tmp_path / 'orders.columns').iterdir()) == sorted(
+        [f'{column}.npy' for column in COLUMNS] + ['sku.dict.npy', META_NAME])  # 一時ファイルは残らない
+
+    columns = OrderColumns(path)
+    assert len(columns) == len(expected)
+    for position, column in enumerate(['order_id', 'line', 'customer_id', 'created_at']):
+        array = columns[column]
+        assert array.dtype == np.dtype(COLUMNS[column])
+        assert array.tolist() == [values[position] for values in expected]
+    assert columns.sku_table[columns['sku']].tolist() == [values[4] for values in expected]
+    assert columns['quantity'].tolist() == [values[5] for values in expected]
+    assert columns['price'].tolist() == [values[6] for values in expected]
+    assert columns['total'].tolist() == [values[7] for values in expected]
+    # ヘッダーの shape が行数と一致し、mmap なしでも同じ値を読める
+    assert np.load(f'{directory}/order_id.npy').shape == (len(expected),)
+    with open(f'{directory}/{META_NAME}', encoding='utf-8') as f:
+        assert json.load(f)['prefixes'] == {'order_id': 'ORD-', 'customer_id': 'CUST-'}
+
+
+def test_mixed_prefixes_are_rejected(tmp_path):
+    rows, _ = _orders(3)
+    rows[-1][ORDER_EXPORT_SCHEMA.index['Customer ID']] = 'GUEST-1'
+    path = str(tmp_path / 'orders.csv')
+    write_orders_csv(path, iter(rows))
+    with pytest.raises(ValueError):
+        write_order_columns(path)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""csvout: 辞書のリストのCSV書き出し"""
+
+import csv
+
+import pytest
+
+from demo_datagen.csvout import write_records_csv
+
+
+def _read(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.reader(f))
+
+
+def test_records_keep_key_order(tmp_path):
+    path = tmp_path / 'customers.csv'
+    records = [{'Customer ID': 'CUST-1', 'Total Orders': 2}, {'Customer ID': 'CUST-2', 'Total Orders': 0}]
+    assert write_records_csv(str(path), records) == 2
+    assert _read(path) == [['Customer ID', 'Total Orders'], ['CUST-1', '2'], ['CUST-2', '0']]
+
+
+def test_empty_records_write_header_only(tmp_path):
+    path = tmp_path / 'customers.csv'
+    assert write_records_csv(str(path), [], fieldnames=['Customer ID', 'Total Orders']) == 0
+    assert _read(path) == [['Customer ID', 'Total Orders']]
+
+
+def test_empty_records_without_fieldnames_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_records_csv(str(tmp_path / 'customers.csv'), [])
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""extsort: 段階的なマージを含めて Created at 順・安定・明細行が連続したままであること"""
+
+import random
+
+import pytest
+
+from demo_datagen import extsort
+from demo_datagen.orders import iter_order_groups
+from demo_datagen.schema import CREATED_AT_INDEX, ORDER_EXPORT_SCHEMA, ORDER_ID_INDEX
+
+
+def _orders(count, seed=0):
+    """Created at に重複のある注文（先頭行＋追加明細行）を生成順に並べた行"""
+    rng = random.Random(seed)
+    rows = []
+    for number in range(count):
+        created_at = f'2024-01-{rng.randint(1, 9):02d} 10:00:00 +0900'
+        for line in range(rng.randint(1, 3)):
+            rows.append(ORDER_EXPORT_SCHEMA.fill(ORDER_EXPORT_SCHEMA.template(), {
+                'Id': f'ORD-{number}' if line == 0 else '',
+                'Name': f'#{number}',
+                'Created at': created_at,
+                'Lineitem sku': f'SKU-{number}-{line}',
+            }))
+    return rows
+
+
+@pytest.mark.parametrize('buffer_rows, fanin', [(10_000, 64), (7, 64), (7, 3)])
+def test_sorted_orders_are_stable_and_grouped(monkeypatch, tmp_path, buffer_rows, fanin):
+    monkeypatch.setattr(extsort, 'MAX_MERGE_FANIN', fanin)
+    rows = _orders(300)
+    result = list(extsort.iter_sorted_orders(iter(rows), buffer_rows=buffer_rows, tmpdir=tmp_path))
+
+    expected = sorted(iter_order_groups(rows), key=lambda order: order[0][CREATED_AT_INDEX])
+    assert [order for order in iter_order_groups(result)] == expected
+    assert all(order[0][ORDER_ID_INDEX] for order in iter_order_groups(result))
+    assert list(tmp_path.iterdir()) == []  # 一時ファイルは残らない
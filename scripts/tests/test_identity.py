@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""identity: Feistel 全単射と IdentityGenerator の重複なし・再現性"""
+
+import re
+
+import pytest
+
+from demo_datagen.identity import FIRST_NAMES, LAST_NAMES, FeistelPermutation, IdentityGenerator
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 100, 1000, 4097])
+def test_permutation_is_bijection(size):
+    permutation = FeistelPermutation(size, key=12345)
+    assert sorted(permutation(i) for i in range(size)) == list(range(size))
+
+
+def test_permutation_depends_on_key():
+    first = [FeistelPermutation(1000, key=1)(i) for i in range(1000)]
+    second = [FeistelPermutation(1000, key=2)(i) for i in range(1000)]
+    assert first != second
+
+
+def test_permutation_rejects_out_of_range():
+    permutation = FeistelPermutation(10, key=0)
+    with pytest.raises(ValueError):
+        permutation(10)
+    with pytest.raises(ValueError):
+        permutation(-1)
+
+
+def test_generator_is_deterministic_per_seed_and_namespace():
+    a, b = IdentityGenerator(42, 'store3'), IdentityGenerator(42, 'store3')
+    assert [a.phone(i) for i in range(200)] == [b.phone(i) for i in range(200)]
+    assert [a.name(i) for i in range(200)] == [b.name(i) for i in range(200)]
+    other_namespace, other_seed = IdentityGenerator(42, 'store4'), IdentityGenerator(43, 'store3')
+    phones = [a.phone(i) for i in range(200)]
+    assert phones != [other_namespace.phone(i) for i in range(200)]
+    assert phones != [other_seed.phone(i) for i in range(200)]
+
+
+def test_phones_and_names_are_unique():
+    identities = IdentityGenerator(7, 'test')
+    phones = [identities.phone(i) for i in range(20_000)]
+    assert len(set(phones)) == len(phones)
+    assert all(re.fullmatch(r'0[789]0-\d{4}-\d{4}', phone) for phone in phones)
+    combinations = len(LAST_NAMES) * len(FIRST_NAMES)
+    names = [identities.name(i) for i in range(combinations)]
+    assert len(set(names)) == combinations
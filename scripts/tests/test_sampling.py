@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""sampling: エイリアス表の確率と、二分探索が従来の線形走査と一致すること"""
+
+import random
+
+import pytest
+
+from demo_datagen.sampling import WeightedSampler, _build_alias, _linear_scan
+
+
+def _alias_mass(prob, alias):
+    """エイリアス表が各候補に割り当てる確率"""
+    n = len(prob)
+    mass = [p / n for p in prob]
+    for i, p in enumerate(prob):
+        mass[alias[i]] += (1.0 - p) / n
+    return mass
+
+
+@pytest.mark.parametrize('weights', [
+    [1],
+    [0.5, 0.5],
+    [0.6, 0.3, 0.1],
+    [5, 0, 1, 2, 0, 10],
+    [random.Random(n).random() for n in range(50)],
+])
+def test_alias_table_reproduces_weights(weights):
+    total = sum(weights)
+    mass = _alias_mass(*_build_alias(weights))
+    assert mass == pytest.approx([w / total for w in weights], abs=1e-12)
+
+
+def test_draw_matches_linear_scan():
+    items = ['北海道', '東京都', '大阪府', '福岡県', '沖縄県']
+    weights = [0.35, 0.3, 0.2, 0.1, 0.05]
+    sampler = WeightedSampler(items, weights)
+    binary, linear = random.Random(0), random.Random(0)
+    assert [sampler.draw(binary) for _ in range(10_000)] == [_linear_scan(items, weights, linear) for _ in range(10_000)]
+
+
+def test_zero_weight_is_never_drawn():
+    sampler = WeightedSampler('abc', [1, 0, 1])
+    rng = random.Random(1)
+    assert 'b' not in {sampler.draw_alias(rng) for _ in range(5_000)}
+    assert 'b' not in {sampler.draw(rng) for _ in range(5_000)}
+
+
+@pytest.mark.parametrize('items, weights', [([], []), (['a'], [1, 2]), (['a', 'b'], [0, 0]), (['a'], [-1])])
+def test_invalid_weights_are_rejected(items, weights):
+    with pytest.raises(ValueError):
+        WeightedSampler(items, weights)
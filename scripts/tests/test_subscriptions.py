@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""subscriptions: お届けが日付順・毎月同じ日（月末は丸め）・解約日までであること"""
+
+from datetime import datetime
+
+from demo_datagen.subscriptions import SubscriptionScheduler, add_months
+
+
+def test_add_months_clamps_to_month_end():
+    start = datetime(2024, 1, 31)
+    assert add_months(start, 1, 31) == datetime(2024, 2, 29)
+    assert add_months(start, 2, 31) == datetime(2024, 3, 31)
+    assert add_months(start, 13, 31) == datetime(2025, 2, 28)
+    assert add_months(datetime(2024, 11, 15), 3, 15) == datetime(2025, 2, 15)
+
+
+def test_iter_due_matches_per_subscriber_schedule():
+    subscriptions = {
+        'a': (datetime(2024, 1, 31), datetime(2024, 6, 30)),
+        'b': (datetime(2024, 1, 15), None),
+        'c': (datetime(2024, 3, 1), datetime(2024, 3, 1)),
+        'd': (datetime(2024, 5, 10), datetime(2024, 4, 1)),  # 解約日が申込日より前なら登録しない
+    }
+    until = datetime(2024, 12, 31)
+    scheduler = SubscriptionScheduler()
+    for name, (start, end) in subscriptions.items():
+        scheduler.subscribe(name, start, end)
+    due = list(scheduler.iter_due(until))
+
+    assert [date for date, _ in due] == sorted(date for date, _ in due)
+    expected = {}
+    for name, (start, end) in subscriptions.items():
+        dates, months = [], 0
+        while True:
+            date = add_months(start, months, start.day)
+            if date > until or (end is not None and date > end):
+                break
+            dates.append(date)
+            months += 1
+        expected[name] = dates
+    for name, dates in expected.items():
+        assert [date for date, subscriber in due if subscriber == name] == dates
+    assert expected['a'][1] == datetime(2024, 2, 29) and expected['a'][2] == datetime(2024, 3, 31)
+    assert len(scheduler) == 1  # 解約日のない 'b' だけが残る
+
+
+def test_same_day_deliveries_keep_registration_order():
+    scheduler = SubscriptionScheduler()
+    for name in ['first', 'second', 'third']:
+        scheduler.subscribe(name, datetime(2024, 1, 1), datetime(2024, 3, 1))
+    due = list(scheduler.iter_due(datetime(2024, 3, 1)))
+    assert [subscriber for _, subscriber in due] == ['first', 'second', 'third'] * 3
+
+
+def test_resume_keeps_original_day():
+    # 1/31 申込の3回目（3/31）から再開するとき、2/29 からではなく元の日（31日）で続ける
+    scheduler = SubscriptionScheduler()
+    scheduler.subscribe('a', add_months(datetime(2024, 1, 31), 1, 31), datetime(2024, 5, 31), day=31)
+    due = [date for date, _ in scheduler.iter_due(datetime(2024, 12, 31))]
+    assert due == [datetime(2024, 2, 29), datetime(2024, 3, 31), datetime(2024, 4, 30), datetime(2024, 5, 31)]